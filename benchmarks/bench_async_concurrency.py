@@ -0,0 +1,119 @@
+"""
+Benchmark: 200 concurrent conversations on the sync graph (thread pool) vs the
+async graph (one event loop). The LLM and the joke API are stubbed with fixed
+latency, so it runs fully offline.
+Run: python benchmarks/bench_async_concurrency.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage
+
+import async_backend
+import http_client
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel
+from storage import ConnectionPool, PooledSqliteSaver
+from tool_executor import ToolExecutor
+
+CONVERSATIONS = 200
+SYNC_WORKERS = (32, CONVERSATIONS)
+LLM_LATENCY = 0.3
+TOOL_LATENCY = 0.2
+
+
+class StubResponse:
+    text = '{"joke": "stub joke"}'
+
+
+def stub_get(url, params=None, **kwargs):
+    time.sleep(TOOL_LATENCY)
+    return StubResponse()
+
+
+async def stub_aget(url, params=None, **kwargs):
+    await asyncio.sleep(TOOL_LATENCY)
+    return StubResponse()
+
+
+def script(messages):
+    """First call asks for a joke, the second answers with the tool result."""
+    last = messages[-1]
+    if getattr(last, "tool_call_id", None):
+        return f"Here you go: {last.content}"
+    return AIMessage(content="", tool_calls=[{"name": "get_joke", "args": {"category": "Pun"}, "id": "joke_1"}])
+
+
+class PeakThreads:
+    """Samples threading.active_count() in the background."""
+
+    def __enter__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_sync(db_path, workers):
+    backend.chatbot = backend.graph.compile(checkpointer=PooledSqliteSaver(ConnectionPool(db_path)))
+    start = time.perf_counter()
+    with PeakThreads() as threads, ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda i: backend.run_turn(f"sync-{workers}-{i}", "tell me a pun"), range(CONVERSATIONS)))
+    return time.perf_counter() - start, threads.peak
+
+
+def run_async(db_path):
+    async_backend.DB_PATH = db_path
+
+    async def main():
+        try:
+            await async_backend.get_chatbot()
+            start = time.perf_counter()
+            await asyncio.gather(*(async_backend.arun_turn(f"async-{i}", "tell me a pun") for i in range(CONVERSATIONS)))
+            return time.perf_counter() - start
+        finally:
+            await async_backend.aclose()
+
+    with PeakThreads() as threads:
+        elapsed = asyncio.run(main())
+    return elapsed, threads.peak
+
+
+def main():
+    backend.llm_with_tools = FakeStreamingChatModel(script=script, first_token_delay=LLM_LATENCY)
+    # Lift the per-tool caps so the comparison measures the serving model, not the quota
+    backend.tool_executor = ToolExecutor(max_workers=CONVERSATIONS, per_tool_limits={"get_joke": CONVERSATIONS})
+    http_client.get = stub_get
+    http_client.aget = stub_aget
+
+    ideal = 2 * LLM_LATENCY + TOOL_LATENCY
+    print(f"{CONVERSATIONS} conversations, one tool round trip each (ideal turn {ideal * 1000:.0f}ms)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in SYNC_WORKERS:
+            elapsed, peak = run_sync(os.path.join(tmp, f"sync-{workers}.db"), workers)
+            print(f"sync  {workers:3d} workers  {elapsed:6.2f}s  {CONVERSATIONS / elapsed:6.1f} turns/s  "
+                  f"peak threads {peak}")
+        elapsed, peak = run_async(os.path.join(tmp, "async.db"))
+        print(f"async event loop  {elapsed:6.2f}s  {CONVERSATIONS / elapsed:6.1f} turns/s  peak threads {peak}")
+
+
+if __name__ == "__main__":
+    main()
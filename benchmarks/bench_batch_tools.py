@@ -0,0 +1,84 @@
+"""
+Benchmark: per-item tool calls vs the batch tool variants for one turn, run
+through the same ToolExecutor the graph uses. Upstream APIs are stubbed with
+a fixed latency and every request is counted, so it runs fully offline.
+Run: python benchmarks/bench_batch_tools.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+os.environ.setdefault("ALPHA_VANTAGE_API_KEY", "offline-benchmark")
+os.environ.setdefault("EXCHANGE_API_KEY", "offline-benchmark")
+
+import langgraph_tool_backend as backend
+from resilience import Resilience
+from tool_cache import tool_cache
+
+UPSTREAM_LATENCY = 0.3
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN"]
+TARGETS = ["EUR", "GBP", "JPY", "INR", "CAD"]
+JOKES = 5
+
+hits = Counter()
+hits_lock = threading.Lock()
+
+
+def stub_get(url, params=None, **kwargs):
+    with hits_lock:
+        hits["requests"] += 1
+    time.sleep(UPSTREAM_LATENCY)
+    if "alphavantage" in url:
+        body = {"Global Quote": {"05. price": "100.0", "09. change": "0.5"}}
+    elif "openexchangerates" in url:
+        body = {"rates": {"USD": 1.0, "EUR": 0.9, "GBP": 0.8, "JPY": 150.0, "INR": 83.0, "CAD": 1.35}}
+    else:
+        body = {"jokes": [{"joke": f"Joke {i}"} for i in range(JOKES)]}
+    return type("Response", (), {"text": json.dumps(body)})()
+
+
+def calls(name, args_list):
+    return [{"name": name, "args": args, "id": f"{name}_{i}"} for i, args in enumerate(args_list)]
+
+
+SCENARIOS = [
+    (f"{len(SYMBOLS)} stock quotes",
+     calls("get_stock_price", [{"symbol": s} for s in SYMBOLS]),
+     calls("get_stock_prices", [{"symbols": SYMBOLS}])),
+    (f"USD to {len(TARGETS)} currencies",
+     calls("convert_currency", [{"amount": 100, "from_currency": "USD", "to_currency": t} for t in TARGETS]),
+     calls("convert_currencies", [{"amount": 100, "from_currencies": ["USD"], "to_currencies": TARGETS}])),
+    (f"{JOKES} jokes",
+     calls("get_joke", [{"category": "Any"}] * JOKES),
+     calls("get_jokes", [{"count": JOKES, "category": "Any"}])),
+]
+
+
+def run(tool_calls):
+    tool_cache.clear()
+    hits.clear()
+    start = time.perf_counter()
+    backend.tool_executor.run(tool_calls, backend._invoke_tool_call)
+    return hits["requests"], time.perf_counter() - start
+
+
+def main():
+    backend.http_client.get = stub_get
+    # Default limits everywhere so the stub is not held to the real free-tier quotas
+    backend.resilience = Resilience(providers={})
+    print(f"upstream latency {UPSTREAM_LATENCY * 1000:.0f}ms, cold caches\n")
+    for name, per_item, batched in SCENARIOS:
+        for label, tool_calls in (("per-item", per_item), ("batched", batched)):
+            requests, elapsed = run(tool_calls)
+            print(f"{name:24s} {label:9s} tool calls {len(tool_calls):2d}  "
+                  f"upstream requests {requests:2d}  latency {elapsed * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: LLM prompt size across long synthetic threads, with and without
+the bounded context window.
+Run: python benchmarks/bench_context_window.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+
+from context_manager import CONTEXT_MAX_TOKENS, build_prompt, compact_context, estimate_tokens
+
+TURNS = 500
+CHECKPOINTS = (10, 50, 100, 250, 500)
+
+
+def synthetic_turn(turn):
+    return [
+        HumanMessage(content=f"Question {turn}: what is the latest technology news today?"),
+        AIMessage(content="", tool_calls=[{"name": "fetch_news", "args": {"topic": "technology"}, "id": f"news_{turn}"}]),
+        ToolMessage(content="📰 Latest Technology News:\n" + "• Headline text " * 150, tool_call_id=f"news_{turn}"),
+        AIMessage(content=f"Here is a summary of today's technology headlines for question {turn}."),
+    ]
+
+
+def main():
+    messages, summary, summarized_count = [], "", 0
+    compaction_time = 0.0
+    print(f"budget {CONTEXT_MAX_TOKENS} tokens")
+    print(f"{'turn':>6} {'unbounded':>12} {'bounded':>10}")
+    for turn in range(1, TURNS + 1):
+        messages.extend(synthetic_turn(turn))
+        start = time.perf_counter()
+        summary, summarized_count = compact_context(messages, summary, summarized_count)
+        prompt = build_prompt(messages, summary, summarized_count)
+        compaction_time += time.perf_counter() - start
+        if turn in CHECKPOINTS:
+            unbounded = sum(estimate_tokens(m) for m in messages)
+            bounded = sum(estimate_tokens(m) for m in prompt)
+            print(f"{turn:>6} {unbounded:>12,} {bounded:>10,}")
+    print(f"mean context-management overhead per call: {compaction_time / TURNS * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: opening a long conversation in the chat UI.
+
+Compares the old load path (get_state deserializes the whole checkpoint, then
+the UI filters out tool traffic) with one page of the message index, for
+threads of growing length. Every turn is a calculator tool call, so half of
+the stored messages are tool calls and results the UI never shows.
+
+Run: python benchmarks/bench_history_page.py
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel
+from storage import connect
+from thread_store import IndexedSqliteSaver
+
+TURN_COUNTS = (10, 100, 500)
+REPEATS = 50
+CALL = {"name": "calculator_tool", "args": {"first_num": 2, "second_num": 3, "operation": "add"}, "id": "calc"}
+
+
+def full_load(thread_id):
+    """What the frontend did before: the whole state, filtered to what it shows."""
+    state = backend.get_chatbot().get_state(backend.make_config(thread_id))
+    return [
+        m for m in state.values["messages"]
+        if isinstance(m, HumanMessage)
+        or (isinstance(m, AIMessage) and m.content and getattr(m, "tool_call_id", None) is None)
+    ]
+
+
+def p50_ms(func, *args):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    backend.llm_with_tools = FakeStreamingChatModel(script=lambda messages: AIMessage(content="", tool_calls=[CALL]))
+    with tempfile.TemporaryDirectory() as directory:
+        saver = IndexedSqliteSaver(connect(os.path.join(directory, "history.db")))
+        backend.checkpointer = saver
+        backend.chatbot = backend.get_graph().compile(checkpointer=saver)
+        print(f"{'turns':>6s} {'messages':>9s} {'get_state':>11s} {'page':>9s}")
+        for turns in TURN_COUNTS:
+            thread_id = f"history-{turns}"
+            for turn in range(turns):
+                backend.run_turn(thread_id, f"add two and three, take {turn}")
+            stored = len(backend.chatbot.get_state(backend.make_config(thread_id)).values["messages"])
+            page = backend.get_message_page(thread_id)["messages"]
+            assert [m.content for m in full_load(thread_id)[-len(page):]] == [m.content for m in page]
+            state_ms = p50_ms(full_load, thread_id)
+            page_ms = p50_ms(backend.get_message_page, thread_id)
+            print(f"{turns:6d} {stored:9d} {state_ms:9.2f}ms {page_ms:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: per-call latency of bare requests.get vs the shared pooled session.
+Runs against a local stub server, so it only measures TCP setup; against the
+real HTTPS upstreams the TLS handshake makes the saving larger.
+Run: python benchmarks/bench_http_pool.py
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import http_client
+
+CALLS = 300
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"current": {"temp_c": 20}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(fetch, url):
+    latencies = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        fetch(url).json()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/current.json"
+
+    bare = measure(lambda u: requests.get(u, timeout=8), url)
+    pooled = measure(http_client.get, url)
+
+    for name, latencies in (("bare requests.get", bare), ("pooled session", pooled)):
+        print(f"{name:<18} mean {statistics.mean(latencies):6.3f}ms   "
+              f"p50 {statistics.median(latencies):6.3f}ms")
+    print(f"saved per call     {statistics.mean(bare) - statistics.mean(pooled):6.3f}ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
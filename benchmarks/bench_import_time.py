@@ -0,0 +1,54 @@
+"""
+Benchmark: how long `import langgraph_tool_backend` takes (python -X importtime),
+which packages dominate it, and what the first get_chatbot() call adds.
+Run: python benchmarks/bench_import_time.py
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+RUNS = 5
+TOP = 10
+
+
+def importtime(code):
+    """Parsed -X importtime rows as (name, depth, cumulative_ms) in import order."""
+    env = {**os.environ, "GROQ_API_KEY": os.getenv("GROQ_API_KEY", "offline-benchmark"),
+           "CHATBOT_DB_PATH": os.path.join(tempfile.gettempdir(), "bench_import_time.db")}
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=SRC_DIR, env=env, capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(parts[1]) / 1000))
+    return rows
+
+
+def total_ms(rows):
+    """Time spent in all top-level imports of the process."""
+    return sum(ms for _, depth, ms in rows if depth == 0)
+
+
+def main():
+    imports = [importtime("import langgraph_tool_backend") for _ in range(RUNS)]
+    first_use = [importtime("import langgraph_tool_backend as b; b.get_chatbot()") for _ in range(RUNS)]
+    print(f"import langgraph_tool_backend        median {statistics.median(map(total_ms, imports)):7.1f}ms")
+    print(f"import + first get_chatbot()         median {statistics.median(map(total_ms, first_use)):7.1f}ms")
+
+    print("\nslowest packages imported by the backend (last run, cumulative):")
+    children = [(name, ms) for name, depth, ms in imports[-1] if depth == 1]
+    for name, ms in sorted(children, key=lambda row: -row[1])[:TOP]:
+        print(f"  {name:40s} {ms:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: LLM round trips avoided per 1,000 requests by the pre-LLM intent
+router, on a synthetic traffic mix with known labels. Also reports misroutes
+and the cost of routing a message.
+Run: python benchmarks/bench_intent_router.py
+"""
+
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import intent_router
+
+REQUESTS = 1000
+SEED = 7
+
+CITIES = ["London", "new york", "Paris", "tokyo", "San Francisco", "Mumbai"]
+TICKERS = ["AAPL", "MSFT", "TSLA", "NVDA", "GOOG"]
+CURRENCIES = ["USD", "EUR", "GBP", "INR", "JPY"]
+
+# (weight, expected intent, generator) — None means the LLM has to answer
+TRAFFIC = [
+    (8, "greeting", lambda r: r.choice(["hey", "hi there!", "hello", "good morning", "hey, how are you?"])),
+    (6, "joke", lambda r: r.choice(["tell me a joke", "another joke", f"tell me {r.randint(2, 5)} jokes"])),
+    (8, "arithmetic", lambda r: f"what is {r.randint(1, 999)} {r.choice(['plus', 'minus', 'times', 'divided by'])} {r.randint(1, 99)}"),
+    (8, "weather", lambda r: r.choice(["weather in {}", "what's the weather in {}?"]).format(r.choice(CITIES))),
+    (5, "stock", lambda r: r.choice(["{} stock price", "price of {}"]).format(r.choice(TICKERS))),
+    (5, "currency", lambda r: "convert {} {} to {}".format(r.randint(1, 500), *r.sample(CURRENCIES, 2))),
+    (60, None, lambda r: r.choice([
+        "what is langgraph and how does it differ from langchain?",
+        "summarize the latest news about electric vehicles",
+        "they told me python is slow, is that true?",
+        "hey can you explain recursion with an example",
+        "will it rain in paris tomorrow",
+        "what is the stock price of apple",
+        "write a short poem about {}".format(r.choice(CITIES)),
+        "compare the weather in london and paris",
+        "tell me about the 2024 joke festival",
+    ])),
+]
+
+
+def traffic(n, seed=SEED):
+    rng = random.Random(seed)
+    weights = [weight for weight, _, _ in TRAFFIC]
+    for _ in range(n):
+        _, expected, generate = rng.choices(TRAFFIC, weights=weights)[0]
+        yield generate(rng), expected
+
+
+def main():
+    requests = list(traffic(REQUESTS))
+    outcomes = Counter()
+    start = time.perf_counter()
+    for text, expected in requests:
+        predicted, _ = intent_router.classify(text)
+        if predicted is None:
+            outcomes["llm" if expected is None else "missed"] += 1
+        elif predicted == expected:
+            outcomes["routed"] += 1
+        else:
+            outcomes["misrouted"] += 1
+    elapsed = time.perf_counter() - start
+
+    routable = sum(1 for _, expected in requests if expected is not None)
+    print(f"{REQUESTS} requests ({routable} with a fast-path intent)")
+    print(f"LLM calls avoided   {outcomes['routed'] + outcomes['misrouted']:5d} per {REQUESTS}")
+    print(f"missed fast paths   {outcomes['missed']:5d}")
+    print(f"misrouted           {outcomes['misrouted']:5d}")
+    print(f"routing cost        {elapsed / REQUESTS * 1e6:7.1f}us per request")
+
+
+if __name__ == "__main__":
+    main()
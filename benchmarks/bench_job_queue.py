@@ -0,0 +1,89 @@
+"""
+Benchmark: running chat turns from the background job queue.
+
+Submits a backlog of queued jobs spread over many threads, then starts the
+workers and measures, for growing worker counts:
+1. queue overhead alone (a no-op job): claims and completions per second;
+2. whole turns through the real graph with a fake LLM of fixed latency:
+   jobs/sec, time spent queued (p50/p95) and submit-to-answer latency (p95).
+
+Jobs of one thread always run one at a time, so throughput is bounded by
+workers and by the number of threads with queued work.
+
+Run: python benchmarks/bench_job_queue.py [--jobs 400] [--threads 50] [--llm-latency 0.05]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage
+
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel
+from job_queue import DONE, JobQueue, run_turn_job
+from storage import connect
+from thread_store import IndexedSqliteSaver
+
+WORKER_COUNTS = (1, 4, 8, 16)
+
+
+def noop(job, emit):
+    return {"answer": "", "tools": []}
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[max(int(len(values) * pct / 100) - 1, 0)]
+
+
+def run_backlog(db_path, jobs, threads, workers, run):
+    """Queue every job first, then let the workers drain the backlog."""
+    queue = JobQueue(db_path, workers=workers, run=run, poll_interval=0.05)
+    job_ids = [queue.submit(f"thread-{i % threads}", f"question {i}: what is new today?") for i in range(jobs)]
+    start = time.perf_counter()
+    queue.start()
+    finished = [queue.wait(job_id) for job_id in job_ids]
+    elapsed = time.perf_counter() - start
+    queue.stop()
+    assert all(job["status"] == DONE for job in finished)
+    return elapsed, finished
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the background turn job queue")
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"queue overhead, {args.jobs * 5} no-op jobs over {args.threads} threads")
+        for workers in WORKER_COUNTS:
+            db_path = os.path.join(directory, f"noop-{workers}.db")
+            elapsed, _ = run_backlog(db_path, args.jobs * 5, args.threads, workers, noop)
+            print(f"  {workers:3d} workers: {args.jobs * 5 / elapsed:8.0f} jobs/s")
+
+        print(f"\nwhole turns, {args.jobs} jobs over {args.threads} threads, LLM latency {args.llm_latency * 1000:.0f}ms")
+        print(f"  {'workers':>7s} {'jobs/s':>8s} {'queued p50/p95':>18s} {'answer p95':>11s}")
+        backend.llm_with_tools = FakeStreamingChatModel(script=lambda messages: AIMessage(content="All quiet today."),
+                                                        first_token_delay=args.llm_latency)
+        for workers in WORKER_COUNTS:
+            db_path = os.path.join(directory, f"turns-{workers}.db")
+            saver = IndexedSqliteSaver(connect(db_path))
+            backend.checkpointer = saver
+            backend.chatbot = backend.get_graph().compile(checkpointer=saver)
+            elapsed, finished = run_backlog(db_path, args.jobs, args.threads, workers, run_turn_job)
+            waits = [job["started_at"] - job["created_at"] for job in finished]
+            answers = [job["finished_at"] - job["created_at"] for job in finished]
+            print(f"  {workers:7d} {args.jobs / elapsed:8.1f} "
+                  f"{percentile(waits, 50):8.2f}/{percentile(waits, 95):6.2f}s {percentile(answers, 95):9.2f}s")
+
+
+if __name__ == "__main__":
+    main()
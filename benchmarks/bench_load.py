@@ -0,0 +1,236 @@
+"""
+Load test: many concurrent simulated chat users against one backend process.
+
+Each virtual user does what the Streamlit frontend does per rerun: lists
+threads for the sidebar (get_threads(limit=15)), sometimes starts a new chat
+or switches thread (get_message_page loads its latest history page), sends a
+message through stream_turn (or run_turn with --api invoke) and occasionally
+deletes a thread. Users think between actions (exponential think time).
+
+Concurrency is ramped in stages (e.g. 1, 2, 4 ... users). Each stage reports:
+- throughput and p50/p95/p99 turn latency;
+- latency of the other operations;
+- errors by kind: database locked/busy, failed deletes, tool errors and LLM errors;
+- RSS.
+
+The knee is the last stage before throughput stops scaling.
+
+Fully offline: the scripted LLM and the upstream stubs come from bench_suite
+and stub_upstreams. --shared-connection runs the old single-connection
+checkpointer instead of the per-thread pool.
+
+Run: python benchmarks/bench_load.py [--stages 1,2,4,8,16,32] [--stage-seconds 10] [--quick] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from bench_suite import make_prompt, percentile, rss_bytes, scripted_llm, span_counts
+from stub_upstreams import EndpointProfile, StubUpstreams
+
+import langgraph_tool_backend as backend
+from resilience import Resilience
+from storage import ConnectionPool, PooledSqliteSaver, connect
+from thread_store import IndexedSqliteSaver
+from tool_cache import tool_cache
+
+# Intent mix of user messages: small talk, the calculator flows from
+# docs/TEST_PALN.md (calculator via chat, sequential operations) and the tools
+LOAD_MIX = {"chat": 3, "calculator": 2, "weather": 1, "stock": 1, "news": 1, "currency": 1, "search": 1,
+            "multi_tool": 1}
+# What a user does on each interaction besides sending a message
+NEW_CHAT_PROBABILITY = 0.15
+SWITCH_THREAD_PROBABILITY = 0.15
+DELETE_PROBABILITY = 0.05
+# A stage whose throughput grows less than this over the previous one is past the knee
+KNEE_MIN_GAIN = 0.10
+
+
+class Recorder:
+    """Thread-safe per-stage latencies and error counts."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def timed(self, operation, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.error(classify(e))
+            return None
+        with self._lock:
+            self.latencies.setdefault(operation, []).append(time.perf_counter() - start)
+        return result
+
+    def error(self, kind):
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+def classify(error):
+    message = str(error).lower()
+    if isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message):
+        return "db_locked"
+    return type(error).__name__
+
+
+def send_message(api, thread_id, text):
+    if api == "invoke":
+        return backend.run_turn(thread_id, text)
+    events = list(backend.stream_turn(thread_id, text))
+    return events[-1]["state"]
+
+
+def virtual_user(index, deadline, recorder, args, rng):
+    """One simulated browser session until the stage deadline."""
+    intents = [intent for intent, weight in LOAD_MIX.items() for _ in range(weight)]
+    thread_id = f"user{index}-{uuid.uuid4().hex[:8]}"
+    own_threads = [thread_id]
+    while True:
+        think = rng.expovariate(1 / args.think) if args.think else 0.0
+        if time.monotonic() + think >= deadline:
+            return
+        time.sleep(think)
+        # Every Streamlit rerun renders the sidebar
+        threads = recorder.timed("list_threads", backend.get_threads, limit=15) or []
+        action = rng.random()
+        if action < NEW_CHAT_PROBABILITY:
+            thread_id = f"user{index}-{uuid.uuid4().hex[:8]}"
+            own_threads.append(thread_id)
+        elif action < NEW_CHAT_PROBABILITY + SWITCH_THREAD_PROBABILITY and threads:
+            thread_id = rng.choice(threads)
+            recorder.timed("message_page", backend.get_message_page, thread_id)
+        elif action < NEW_CHAT_PROBABILITY + SWITCH_THREAD_PROBABILITY + DELETE_PROBABILITY and len(own_threads) > 1:
+            victim = own_threads.pop(rng.randrange(len(own_threads) - 1))
+            if recorder.timed("delete_thread", backend.delete_thread, victim) is False:
+                recorder.error("delete_failed")
+            continue
+        state = recorder.timed("turn", send_message, args.api, thread_id, make_prompt(rng.choice(intents), rng))
+        if state is not None and isinstance(state["messages"][-1].content, str) \
+                and state["messages"][-1].content.startswith("Sorry, I hit an error"):
+            recorder.error("llm_error")
+
+
+def run_stage(users, args, seed):
+    recorder = Recorder()
+    tools_before = span_counts("tool")
+    deadline = time.monotonic() + args.stage_seconds
+    started = time.perf_counter()
+    workers = [
+        threading.Thread(target=virtual_user, args=(i, deadline, recorder, args, random.Random(seed * 10_000 + i)))
+        for i in range(users)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    tool_errors = span_counts("tool").get("error", 0) - tools_before.get("error", 0)
+    if tool_errors:
+        recorder.errors["tool_error"] = tool_errors
+    turns = recorder.latencies.get("turn", [])
+    return {
+        "users": users,
+        "turns": len(turns),
+        "turns_per_sec": round(len(turns) / elapsed, 2),
+        "turn_ms": {f"p{p}": round(percentile(turns, p) * 1000, 1) for p in (50, 95, 99)} if turns else {},
+        "operations_p95_ms": {
+            operation: round(percentile(values, 95) * 1000, 1)
+            for operation, values in recorder.latencies.items() if operation != "turn"
+        },
+        "errors": recorder.errors,
+        "rss_mb": round(rss_bytes() / 2**20, 1),
+    }
+
+
+def find_knee(stages):
+    """The last stage whose throughput still grew by KNEE_MIN_GAIN over the previous one."""
+    knee = stages[0]
+    for previous, stage in zip(stages, stages[1:]):
+        if stage["turns_per_sec"] < previous["turns_per_sec"] * (1 + KNEE_MIN_GAIN):
+            break
+        knee = stage
+    return knee
+
+
+def build_checkpointer(db_path, shared_connection):
+    if shared_connection:
+        return IndexedSqliteSaver(connect(db_path)), None
+    pool = ConnectionPool(db_path)
+    return PooledSqliteSaver(pool), pool
+
+
+def print_stage(stage):
+    latency = stage["turn_ms"]
+    errors = " ".join(f"{kind}={count}" for kind, count in sorted(stage["errors"].items())) or "-"
+    print(f"{stage['users']:5d} users  {stage['turns']:5d} turns  {stage['turns_per_sec']:7.2f} turns/s  "
+          f"p50 {latency.get('p50', 0):7.1f}ms  p95 {latency.get('p95', 0):7.1f}ms  p99 {latency.get('p99', 0):7.1f}ms  "
+          f"rss {stage['rss_mb']:6.1f}MB  errors {errors}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ramp simulated chat users against the backend")
+    parser.add_argument("--stages", default="1,2,4,8,16,32", help="comma-separated user counts")
+    parser.add_argument("--stage-seconds", type=float, default=10.0)
+    parser.add_argument("--think", type=float, default=1.0, help="mean think time between actions (seconds)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="scripted LLM latency (seconds)")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="stub upstream latency (seconds)")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--api", choices=("stream", "invoke"), default="stream")
+    parser.add_argument("--shared-connection", action="store_true",
+                        help="one SQLite connection for all users instead of the per-thread pool")
+    parser.add_argument("--quick", action="store_true", help="stages 1,4,16 of 3 seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.stages, args.stage_seconds = "1,4,16", 3.0
+    stages = [int(users) for users in args.stages.split(",") if users.strip()]
+
+    tool_cache.clear()
+    backend.resilience = Resilience(providers={})
+    backend.llm_with_tools = scripted_llm(args.llm_latency)
+    upstream = EndpointProfile(latency=args.upstream_latency, jitter=args.upstream_latency / 2,
+                               error_rate=args.upstream_error_rate)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        checkpointer, pool = build_checkpointer(os.path.join(directory, "load.db"), args.shared_connection)
+        # The sidebar listing and history pages read through backend.checkpointer
+        backend.checkpointer = checkpointer
+        backend.chatbot = backend.get_graph().compile(checkpointer=checkpointer)
+        rss_start = rss_bytes()
+        print(f"checkpointer: {'shared connection' if args.shared_connection else 'connection pool'}  api: {args.api}  "
+              f"think {args.think}s  llm {args.llm_latency}s  upstream {args.upstream_latency}s")
+        with StubUpstreams(default=upstream, seed=args.seed) as stubs, stubs.installed():
+            for index, users in enumerate(stages):
+                results.append(run_stage(users, args, args.seed + index))
+                print_stage(results[-1])
+        if pool is not None:
+            pool.close_all()
+
+    knee = find_knee(results)
+    print(f"\nknee: ~{knee['users']} users at {knee['turns_per_sec']} turns/s "
+          f"(p95 {knee['turn_ms'].get('p95', 0)}ms); RSS grew {(rss_bytes() - rss_start) / 2**20:.1f}MB over the run")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump({"config": vars(args), "stages": results, "knee_users": knee["users"]}, output, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
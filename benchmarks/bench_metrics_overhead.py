@@ -0,0 +1,82 @@
+"""
+Benchmark: cost of the always-on instrumentation.
+
+1. One span (histogram + trace event) and one counter increment, with
+   metrics disabled, enabled, and enabled with a JSONL trace file.
+2. Offline tool turns (fake LLM, calculator tool, in-memory checkpoints)
+   with metrics off vs on, p50 per turn.
+Run: python benchmarks/bench_metrics_overhead.py
+"""
+
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage
+
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel
+from metrics import Metrics, TraceWriter, metrics
+from thread_store import IndexedSqliteSaver
+
+OPERATIONS = 100_000
+TURNS = 200
+CALL = {"name": "calculator_tool", "args": {"first_num": 2, "second_num": 3, "operation": "add"}, "id": "calc"}
+
+
+def per_operation(registry):
+    def span():
+        with registry.span("tool", tool="calculator_tool"):
+            pass
+
+    span_ns = timeit.timeit(span, number=OPERATIONS) / OPERATIONS * 1e9
+    inc_ns = timeit.timeit(lambda: registry.inc("requests", tool="calculator_tool"), number=OPERATIONS) / OPERATIONS * 1e9
+    return span_ns, inc_ns
+
+
+def turn_latency(enabled):
+    metrics.enabled = enabled
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    backend.chatbot = backend.get_graph().compile(checkpointer=IndexedSqliteSaver(conn=conn))
+    backend.llm_with_tools = FakeStreamingChatModel(script=lambda messages: AIMessage(content="", tool_calls=[CALL]))
+    timings = []
+    for turn in range(TURNS):
+        start = time.perf_counter()
+        backend.run_turn(f"bench-{turn}", "add two and three for me please")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        traced = Metrics(enabled=True, trace_path="")
+        traced.trace = TraceWriter(os.path.join(directory, "trace.jsonl"))
+        print("per operation")
+        for label, registry in (("disabled", Metrics(enabled=False, trace_path="")),
+                                ("enabled", Metrics(enabled=True, trace_path="")),
+                                ("enabled+trace", traced)):
+            span_ns, inc_ns = per_operation(registry)
+            print(f"  {label:14s} span {span_ns:7.0f}ns   counter {inc_ns:6.0f}ns")
+        traced.trace.close()
+
+        print(f"\noffline tool turn (p50 of {TURNS})")
+        off = turn_latency(False)
+        on = turn_latency(True)
+        metrics.trace = TraceWriter(os.path.join(directory, "turns.jsonl"))
+        traced_turn = turn_latency(True)
+        metrics.trace.close()
+        metrics.trace = None
+        print(f"  metrics off     {off:6.2f}ms")
+        print(f"  metrics on      {on:6.2f}ms   ({(on - off) / off * 100:+.1f}%)")
+        print(f"  on + trace      {traced_turn:6.2f}ms   ({(traced_turn - off) / off * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
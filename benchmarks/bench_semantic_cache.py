@@ -0,0 +1,76 @@
+"""
+Benchmark: turn latency with and without the semantic response cache, on a
+traffic mix where many users ask reworded versions of popular questions.
+The LLM is the fake model with fixed latency, so it runs fully offline.
+Run: python benchmarks/bench_semantic_cache.py
+"""
+
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel
+from semantic_cache import SemanticCache
+from thread_store import IndexedSqliteSaver
+
+REQUESTS = 300
+LLM_LATENCY = 0.05
+SEED = 11
+
+# Popular questions and the ways users reword them
+POPULAR = [
+    ["what is python?", "whats python", "What is Python", "python?"],
+    ["explain recursion", "explain recursion please", "Explain recursion!"],
+    ["write a haiku about programming", "write a programming haiku", "haiku about programming please"],
+    ["difference between list and tuple", "list vs tuple difference", "what is the difference between a list and a tuple"],
+    ["how do I reverse a string in python", "reverse a string in python", "how to reverse a python string"],
+]
+TOPICS = ["sorting", "closures", "decorators", "generators", "asyncio", "sqlite", "http", "regex", "typing", "git"]
+
+
+def traffic(n, seed=SEED):
+    rng = random.Random(seed)
+    for i in range(n):
+        if rng.random() < 0.6:
+            yield rng.choice(rng.choice(POPULAR))
+        else:
+            yield f"explain {rng.choice(TOPICS)} with example {i}"
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(prompts, cache):
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    backend.chatbot = backend.graph.compile(checkpointer=IndexedSqliteSaver(conn=conn))
+    backend.llm_with_tools = FakeStreamingChatModel(responses=["A cached-or-not answer."], first_token_delay=LLM_LATENCY)
+    backend.semantic_cache = cache
+    latencies = []
+    for i, prompt in enumerate(prompts):
+        start = time.perf_counter()
+        backend.run_turn(f"user-{i}", prompt)
+        latencies.append(time.perf_counter() - start)
+    return latencies, backend.llm_with_tools.call_count
+
+
+def main():
+    prompts = list(traffic(REQUESTS))
+    for label, cache in (("no cache", None), ("semantic", SemanticCache())):
+        latencies, llm_calls = run(prompts, cache)
+        hit_rate = f"hit rate {cache.stats()['hit_rate']:.0%}" if cache else "hit rate   -"
+        print(f"{label:9s} {hit_rate}  LLM calls {llm_calls:4d}  "
+              f"p50 {percentile(latencies, 0.5) * 1000:6.1f}ms  p95 {percentile(latencies, 0.95) * 1000:6.1f}ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:6.1f}ms  mean {statistics.mean(latencies) * 1000:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
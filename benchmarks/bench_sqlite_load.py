@@ -0,0 +1,83 @@
+"""
+Load test: concurrent checkpoint writes through one shared connection
+(the previous setup) vs the per-thread connection pool.
+Reports checkpoints/second, p99 write latency and lock errors.
+Run: python benchmarks/bench_sqlite_load.py
+"""
+
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langchain_core.messages import HumanMessage
+
+from storage import ConnectionPool, PooledSqliteSaver
+from thread_store import IndexedSqliteSaver
+
+WRITERS = 16
+WRITES_PER_WRITER = 200
+READ_EVERY = 5
+
+
+def run_load(saver):
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def writer(index):
+        config = {"configurable": {"thread_id": f"load-{index}", "checkpoint_ns": ""}}
+        messages = []
+        for step in range(WRITES_PER_WRITER):
+            messages.append(HumanMessage(content=f"message {step} " + "x" * 200))
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": list(messages[-20:])}
+            start = time.perf_counter()
+            try:
+                config = saver.put(config, checkpoint, {"step": step}, {})
+                if step % READ_EVERY == 0:
+                    saver.get_tuple(config)
+                    saver.list_threads(limit=15)
+            except sqlite3.OperationalError as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(WRITERS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "checkpoints_per_sec": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "lock_errors": len(errors),
+    }
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        shared = IndexedSqliteSaver(conn=sqlite3.connect(os.path.join(directory, "shared.db"), check_same_thread=False))
+        pool = ConnectionPool(os.path.join(directory, "pooled.db"))
+        pooled = PooledSqliteSaver(pool)
+        for name, saver in (("shared connection", shared), ("connection pool", pooled)):
+            result = run_load(saver)
+            print(f"{name:<18} {result['checkpoints_per_sec']:8.0f} checkpoints/s   "
+                  f"p50 {result['p50_ms']:6.2f}ms   p99 {result['p99_ms']:7.2f}ms   "
+                  f"lock errors {result['lock_errors']}")
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
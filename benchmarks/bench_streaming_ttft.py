@@ -0,0 +1,51 @@
+"""
+Benchmark: time-to-first-token of stream_turn vs blocking run_turn.
+Uses the fake streaming model, so it runs fully offline.
+Run: python benchmarks/bench_streaming_ttft.py
+"""
+
+import os
+import sqlite3
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel
+from thread_store import IndexedSqliteSaver
+
+TURNS = 10
+ANSWER = " ".join(["token"] * 80)
+
+
+def main():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    backend.chatbot = backend.graph.compile(checkpointer=IndexedSqliteSaver(conn=conn))
+    backend.llm_with_tools = FakeStreamingChatModel(responses=[ANSWER], first_token_delay=0.3, token_delay=0.01)
+
+    blocking = []
+    for turn in range(TURNS):
+        start = time.perf_counter()
+        backend.run_turn("bench-blocking", f"question {turn}")
+        blocking.append(time.perf_counter() - start)
+
+    ttft, total = [], []
+    for turn in range(TURNS):
+        start = time.perf_counter()
+        first = None
+        for event in backend.stream_turn("bench-stream", f"question {turn}"):
+            if event["type"] == "token" and first is None:
+                first = time.perf_counter() - start
+        ttft.append(first)
+        total.append(time.perf_counter() - start)
+
+    print(f"blocking  first visible text {statistics.median(blocking) * 1000:7.1f}ms (p50)")
+    print(f"streaming first token        {statistics.median(ttft) * 1000:7.1f}ms (p50)   "
+          f"full answer {statistics.median(total) * 1000:7.1f}ms (p50)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Benchmark suite: scenario runs of whole chat turns, fully offline.
+
+The LLM is FakeStreamingChatModel driven by a ToolCallingScript (it emits tool
+calls for tool-shaped requests and answers from the tool results), and every
+upstream API is a local stub server with per-host latency and error rates
+(benchmarks/stub_upstreams.py). Turns go through the real graph, tool
+executor, resilience layer, caches and a pooled SQLite checkpointer on disk.
+
+Per scenario it reports turns/sec, p50/p95/p99 turn latency, LLM and tool
+calls per turn, checkpoint bytes per turn and RSS growth per session. --json
+writes the results for diffing between releases; --compare prints the change
+against an earlier file.
+
+Run: python benchmarks/bench_suite.py [--quick] [--scenarios a,b] [--json out.json] [--compare base.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+for key in ("ALPHA_VANTAGE_API_KEY", "WEATHER_API_KEY", "NEWS_API_KEY", "NASA_API_KEY", "EXCHANGE_API_KEY"):
+    os.environ.setdefault(key, "offline-benchmark")
+
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel, ToolCallingScript
+from metrics import metrics
+from resilience import Resilience
+from storage import ConnectionPool, PooledSqliteSaver
+from tool_cache import tool_cache
+from stub_upstreams import EndpointProfile, StubUpstreams
+
+# =========================Conversation Model======================
+CITIES = ["London", "Paris", "Tokyo", "Berlin", "Madrid", "Toronto", "Sydney", "Mumbai"]
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "TSLA", "AMZN"]
+TOPICS = ["jazz", "volcanoes", "solar power", "chess", "coffee", "robotics"]
+CURRENCIES = ["EUR", "GBP", "JPY", "INR", "CAD"]
+
+# User requests by intent; placeholders are filled per turn from a seeded RNG
+PROMPTS = {
+    "chat": ["Tell me something interesting about the history of {topic}.",
+             "Can you explain how {topic} works, in simple terms?"],
+    "calculator": ["What is {a} times {b}?"],
+    "weather": ["What's the weather in {city} today?"],
+    "stock": ["How is {symbol} stock doing right now?"],
+    "news": ["Any recent news on {topic}?"],
+    "currency": ["Convert {a} USD to {currency}"],
+    "search": ["Search the web for {topic} conferences"],
+    "multi_tool": ["Check the weather in {city} and the {symbol} stock price"],
+    "batch": ["Compare {symbol}, {symbol2} and {symbol3} stocks"],
+}
+
+# How the scripted LLM maps requests to tool calls
+TOOL_RULES = [
+    (r"what is (\d+) times (\d+)", "calculator_tool",
+     lambda m: {"first_num": float(m[1]), "second_num": float(m[2]), "operation": "multiply"}),
+    (r"weather in ([A-Za-z ]+?)(?: today| and|\?|$)", "fetch_weather", lambda m: {"city": m[1]}),
+    (r"how is ([A-Z]{2,5}) stock|the ([A-Z]{2,5}) stock price", "get_stock_price",
+     lambda m: {"symbol": m[1] or m[2]}),
+    (r"compare ([A-Z, ]+?(?: and [A-Z]+)) stocks", "get_stock_prices",
+     lambda m: {"symbols": [s for s in m[1].replace(" and ", ",").replace(" ", "").split(",") if s]}),
+    (r"news on ([a-z ]+)\?", "fetch_news", lambda m: {"topic": m[1]}),
+    (r"convert (\d+) ([A-Z]{3}) to ([A-Z]{3})", "convert_currency",
+     lambda m: {"amount": float(m[1]), "from_currency": m[2], "to_currency": m[3]}),
+    (r"search the web for (.+)", "search_tool", lambda m: {"query": m[1]}),
+]
+
+
+def make_prompt(intent, rng):
+    symbols = rng.sample(SYMBOLS, 3)
+    return rng.choice(PROMPTS[intent]).format(
+        topic=rng.choice(TOPICS), city=rng.choice(CITIES), currency=rng.choice(CURRENCIES),
+        a=rng.randint(2, 500), b=rng.randint(2, 500),
+        symbol=symbols[0], symbol2=symbols[1], symbol3=symbols[2],
+    )
+
+
+def scripted_llm(latency=0.0):
+    return FakeStreamingChatModel(script=ToolCallingScript(TOOL_RULES), first_token_delay=latency)
+
+
+# =========================Scenarios======================
+class Scenario:
+    """A workload: intent mix, session shape, LLM latency and upstream behaviour."""
+
+    def __init__(self, name, mix, sessions=16, turns=5, concurrency=4, llm_latency=0.02,
+                 upstream=None, profiles=None):
+        self.name = name
+        self.mix = mix
+        self.sessions = sessions
+        self.turns = turns
+        self.concurrency = concurrency
+        self.llm_latency = llm_latency
+        self.upstream = upstream or EndpointProfile(latency=0.01, jitter=0.01)
+        self.profiles = profiles or {}
+
+    def describe(self):
+        return {"mix": self.mix, "sessions": self.sessions, "turns": self.turns, "concurrency": self.concurrency,
+                "llm_latency": self.llm_latency, "upstream": self.upstream.describe()}
+
+
+SINGLE_TOOL_MIX = {"calculator": 1, "weather": 1, "stock": 1, "news": 1, "currency": 1}
+MIXED_MIX = {"chat": 4, "calculator": 1, "weather": 1, "stock": 1, "news": 1, "search": 1, "multi_tool": 1}
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in [
+        Scenario("chat", {"chat": 1}),
+        Scenario("single_tool", SINGLE_TOOL_MIX),
+        Scenario("multi_tool", {"multi_tool": 1, "batch": 1}),
+        Scenario("mixed", MIXED_MIX, sessions=32, concurrency=8),
+        Scenario("long_thread", MIXED_MIX, sessions=4, turns=40),
+        Scenario("flaky_upstreams", SINGLE_TOOL_MIX,
+                 upstream=EndpointProfile(latency=0.05, jitter=0.05, error_rate=0.2)),
+    ]
+}
+
+
+# =========================Measurements======================
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def checkpoint_bytes(db_path):
+    """Serialized checkpoint, metadata and pending-write bytes stored in the database."""
+    conn = sqlite3.connect(db_path)
+    try:
+        checkpoints = conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints"
+        ).fetchone()[0]
+        writes = conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes").fetchone()[0]
+        return checkpoints + writes
+    finally:
+        conn.close()
+
+
+def span_counts(name):
+    """{status: count} of a metrics span histogram."""
+    counts = {}
+    for histogram in metrics.snapshot()["histograms"]:
+        if histogram["name"] == f"{name}_seconds":
+            status = histogram["labels"].get("status", "ok")
+            counts[status] = counts.get(status, 0) + histogram["count"]
+    return counts
+
+
+def _delta(after, before):
+    return {status: count - before.get(status, 0) for status, count in after.items() if count - before.get(status, 0)}
+
+
+# =========================Runner======================
+def run_scenario(scenario, directory, seed=0):
+    tool_cache.clear()
+    # Stub upstreams have no quota; default limits keep the breaker and retries in play
+    backend.resilience = Resilience(providers={})
+    db_path = os.path.join(directory, f"{scenario.name}.db")
+    pool = ConnectionPool(db_path)
+    backend.chatbot = backend.get_graph().compile(checkpointer=PooledSqliteSaver(pool))
+    backend.llm_with_tools = scripted_llm(scenario.llm_latency)
+    intents = [intent for intent, weight in scenario.mix.items() for _ in range(weight)]
+
+    latencies, failures = [], []
+    lock = threading.Lock()
+
+    def session(index):
+        rng = random.Random(seed * 1000 + index)
+        thread_id = f"{scenario.name}-{index}"
+        for _ in range(scenario.turns):
+            prompt = make_prompt(rng.choice(intents), rng)
+            start = time.perf_counter()
+            try:
+                backend.run_turn(thread_id, prompt)
+            except Exception as e:
+                with lock:
+                    failures.append(f"{type(e).__name__}: {e}")
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    with StubUpstreams(scenario.profiles, default=scenario.upstream, seed=seed) as stubs, stubs.installed():
+        gc.collect()
+        llm_before, tools_before, rss_before = span_counts("llm_call"), span_counts("tool"), rss_bytes()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=scenario.concurrency) as pool_executor:
+            list(pool_executor.map(session, range(scenario.sessions)))
+        duration = time.perf_counter() - started
+        gc.collect()
+        rss_after = rss_bytes()
+        llm_calls = sum(_delta(span_counts("llm_call"), llm_before).values())
+        tool_calls = _delta(span_counts("tool"), tools_before)
+        upstream = stubs.stats()
+
+    pool.close_all()
+    turns = len(latencies)
+    stored = checkpoint_bytes(db_path)
+    return {
+        "config": scenario.describe(),
+        "turns": turns,
+        "failed_turns": len(failures),
+        "duration_s": round(duration, 3),
+        "turns_per_sec": round(turns / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            f"p{pct}": round(percentile(latencies, pct) * 1000, 2) for pct in (50, 95, 99)
+        } if latencies else {},
+        "llm_calls_per_turn": round(llm_calls / turns, 3) if turns else 0.0,
+        "tool_calls_per_turn": round(sum(tool_calls.values()) / turns, 3) if turns else 0.0,
+        "tool_results": tool_calls,
+        "checkpoint_bytes_per_turn": round(stored / turns) if turns else 0,
+        "db_file_bytes": sum(os.path.getsize(db_path + suffix) for suffix in ("", "-wal") if os.path.exists(db_path + suffix)),
+        "rss_per_session_kb": round((rss_after - rss_before) / scenario.sessions / 1024, 1),
+        "upstream_requests": upstream["requests"],
+        "upstream_errors": upstream["errors"],
+        "errors": failures[:5],
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(names, quick=False, seed=0):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in names:
+            scenario = SCENARIOS[name]
+            if quick:
+                scenario = Scenario(scenario.name, scenario.mix, sessions=max(2, scenario.sessions // 4),
+                                    turns=max(2, scenario.turns // 2), concurrency=scenario.concurrency,
+                                    llm_latency=scenario.llm_latency, upstream=scenario.upstream,
+                                    profiles=scenario.profiles)
+            results[name] = run_scenario(scenario, directory, seed)
+            print_result(name, results[name])
+    return {
+        "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": git_revision(),
+                 "python": platform.python_version(), "platform": platform.platform(), "quick": quick, "seed": seed},
+        "scenarios": results,
+    }
+
+
+# =========================Reporting======================
+def print_result(name, result):
+    latency = result["latency_ms"]
+    print(f"{name:16s} {result['turns']:4d} turns  {result['turns_per_sec']:7.2f} turns/s  "
+          f"p50 {latency.get('p50', 0):7.1f}ms  p95 {latency.get('p95', 0):7.1f}ms  p99 {latency.get('p99', 0):7.1f}ms  "
+          f"llm/turn {result['llm_calls_per_turn']:.2f}  tools/turn {result['tool_calls_per_turn']:.2f}  "
+          f"ckpt {result['checkpoint_bytes_per_turn']:7d}B/turn  rss {result['rss_per_session_kb']:7.1f}KB/session"
+          + (f"  failed {result['failed_turns']}" if result["failed_turns"] else ""))
+
+
+def flatten(result, prefix=""):
+    """Numeric fields of a scenario result as {"latency_ms.p95": value, ...}."""
+    values = {}
+    for key, value in result.items():
+        if key in ("config", "errors"):
+            continue
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[prefix + key] = value
+    return values
+
+
+def compare(baseline, current):
+    """Print every numeric metric that changed between two suite results."""
+    print(f"\ncompared with {baseline['meta'].get('revision') or 'baseline'} ({baseline['meta'].get('timestamp')})")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"  {name}: not in baseline")
+            continue
+        old, new = flatten(before), flatten(result)
+        for metric in sorted(set(old) | set(new)):
+            a, b = old.get(metric), new.get(metric)
+            if a == b:
+                continue
+            change = f"{(b - a) / a * 100:+.1f}%" if a and b is not None else "n/a"
+            print(f"  {name:16s} {metric:32s} {a!s:>10} -> {b!s:>10}  {change}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenario names")
+    parser.add_argument("--quick", action="store_true", help="fewer sessions and turns (smoke run)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="earlier --json output to diff against")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+
+    results = run_suite(names, quick=args.quick, seed=args.seed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline:
+            compare(json.load(baseline), results)
+    return results
+
+
+if __name__ == "__main__":
+    main()
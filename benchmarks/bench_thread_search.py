@@ -0,0 +1,126 @@
+"""
+Benchmark: searching conversation history.
+
+Fills a checkpoint database with THREADS threads of synthetic chat messages
+(100k messages by default) through the same message index the checkpointer
+maintains, then measures:
+1. search_threads p50/p95 for rare, common, multi-word and prefix queries,
+   against a LIKE scan over the same messages;
+2. the cost the index adds to a turn: indexing one user message and one
+   answer into the full database;
+3. database size with the search index.
+
+Run: python benchmarks/bench_thread_search.py [--messages 100000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from storage import connect
+from thread_store import IndexedSqliteSaver
+
+MESSAGES_PER_THREAD = 50
+REPEATS = 50
+COMMON_WORDS = ("the", "weather", "price", "today", "please", "what", "how", "news", "convert", "stock")
+TOPICS = ("london", "tokyo", "python", "bitcoin", "volcano", "recipe", "marathon", "telescope", "jazz", "tariff")
+QUERIES = {
+    "rare word": "xylophone",
+    "common word": "weather",
+    "two words": "tokyo weather",
+    "prefix": "telesc",
+}
+
+
+def synthetic_messages(rng, turns):
+    messages = []
+    for _ in range(turns):
+        topic = rng.choice(TOPICS)
+        words = rng.choices(COMMON_WORDS, k=8) + [topic]
+        rng.shuffle(words)
+        messages.append(HumanMessage(content=" ".join(words)))
+        messages.append(AIMessage(content=f"Here is what I found about {topic}: " + " ".join(rng.choices(COMMON_WORDS, k=20))))
+    return messages
+
+
+def fill(saver, total, rng):
+    threads = total // MESSAGES_PER_THREAD
+    with saver.cursor() as cur:
+        for index in range(threads):
+            thread_id = f"thread-{index}"
+            messages = synthetic_messages(rng, MESSAGES_PER_THREAD // 2)
+            if index == threads // 2:
+                messages[-2] = HumanMessage(content="play me something on the xylophone")
+            cur.execute(
+                "INSERT INTO thread_metadata (thread_id, created_at, updated_at, title, message_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (thread_id, time.time(), time.time(), f"Thread {index}", len(messages)),
+            )
+            saver._index_messages(cur, thread_id, messages)
+    return threads
+
+
+def like_scan(saver, query):
+    with saver.cursor(transaction=False) as cur:
+        cur.execute(
+            "SELECT DISTINCT thread_id FROM thread_messages WHERE content LIKE ? LIMIT 10", (f"%{query}%",)
+        )
+        return cur.fetchall()
+
+
+def timings_ms(func, *args):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.median(timings) * 1000, timings[int(len(timings) * 0.95) - 1] * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search latency over indexed conversation history")
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "search.db")
+        saver = IndexedSqliteSaver(connect(db_path))
+        saver.setup()
+        start = time.perf_counter()
+        threads = fill(saver, args.messages, rng)
+        print(f"indexed {args.messages} messages in {threads} threads in {time.perf_counter() - start:.1f}s")
+
+        print(f"\n{'query':14s} {'hits':>5s} {'search p50/p95':>20s} {'LIKE scan p50/p95':>22s}")
+        for label, query in QUERIES.items():
+            hits = len(saver.search_threads(query, limit=10))
+            search_p50, search_p95 = timings_ms(saver.search_threads, query, 10)
+            like_p50, like_p95 = timings_ms(like_scan, saver, query)
+            print(f"{label:14s} {hits:5d} {search_p50:9.2f}/{search_p95:7.2f}ms {like_p50:11.2f}/{like_p95:7.2f}ms")
+
+        turn = [HumanMessage(content="what is the weather in tokyo"), AIMessage(content="Sunny, 21°C in Tokyo.")]
+        timings = []
+        for index in range(REPEATS):
+            thread_id = f"thread-{index}"
+            # Earlier messages are already indexed and are not looked at again
+            messages = [HumanMessage(content="x")] * MESSAGES_PER_THREAD + turn
+            start = time.perf_counter()
+            with saver.cursor() as cur:
+                saver._index_messages(cur, thread_id, messages)
+            timings.append(time.perf_counter() - start)
+        print(f"\nindexing one turn (2 messages): p50 {statistics.median(timings) * 1000:.2f}ms")
+        print(f"database size: {os.path.getsize(db_path) / 2**20:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
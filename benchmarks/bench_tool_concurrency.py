@@ -0,0 +1,55 @@
+"""
+Benchmark: sequential vs concurrent tool execution for one turn.
+Run: python benchmarks/bench_tool_concurrency.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from tool_executor import ToolExecutor
+
+# Stubbed tools with latencies in the range we see from the real upstreams
+STUB_LATENCIES = {
+    "get_joke": 0.4,
+    "fetch_weather": 0.6,
+    "get_stock_price": 0.8,
+    "fetch_news": 1.0,
+}
+
+SCENARIOS = {
+    "5 jokes": [{"name": "get_joke", "args": {}, "id": f"joke_{i}"} for i in range(5)],
+    "weather + stock + news": [
+        {"name": "fetch_weather", "args": {}, "id": "w"},
+        {"name": "get_stock_price", "args": {}, "id": "s"},
+        {"name": "fetch_news", "args": {}, "id": "n"},
+    ],
+}
+
+
+def stub_invoke(tool_call):
+    time.sleep(STUB_LATENCIES[tool_call["name"]])
+    return tool_call["id"]
+
+
+def main():
+    executor = ToolExecutor()
+    for name, calls in SCENARIOS.items():
+        start = time.perf_counter()
+        sequential = [stub_invoke(call) for call in calls]
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = executor.run(calls, stub_invoke)
+        concurrent_time = time.perf_counter() - start
+
+        assert sequential == concurrent
+        print(f"{name:<24} sequential {sequential_time:6.2f}s   concurrent {concurrent_time:6.2f}s   "
+              f"speedup {sequential_time / concurrent_time:4.1f}x")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
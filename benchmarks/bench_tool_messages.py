@@ -0,0 +1,165 @@
+"""
+Benchmark: tool results as ToolMessages with a compact LLM rendering vs the
+old AIMessage(tool_call_id) form carrying the UI text.
+
+1. Size of each tool result as the LLM reads it (UI text vs compact payload).
+2. One tool turn through the graph, with the request bodies built by
+   langchain_groq's own message conversion: graph steps, LLM calls, prompt
+   tokens summed over the turn and tool calls left without a "tool" reply.
+   The scripted model answers once its calls have replies and re-issues
+   calls that have none, as a function-calling model does when it cannot
+   see a result; the old form loops until recursion_limit.
+Runs fully offline; upstream APIs are stubbed.
+Run: python benchmarks/bench_tool_messages.py
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+for key in ("ALPHA_VANTAGE_API_KEY", "WEATHER_API_KEY", "NEWS_API_KEY", "NASA_API_KEY", "EXCHANGE_API_KEY"):
+    os.environ.setdefault(key, "offline-benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_groq.chat_models import _convert_message_to_dict
+from langgraph.errors import GraphRecursionError
+
+import context_manager
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel
+from resilience import Resilience
+from thread_store import IndexedSqliteSaver
+from tool_cache import tool_cache
+from tool_results import for_llm
+
+CHARS_PER_TOKEN = 4
+
+UPSTREAM = {
+    "alphavantage": {"Global Quote": {"05. price": "195.50", "09. change": "1.25"}},
+    "weatherapi": {"current": {"temp_c": 14, "condition": {"text": "Partly cloudy"}, "humidity": 71}},
+    "newsapi": {"articles": [{"title": f"Technology headline number {i} about chips and AI"} for i in range(5)]},
+    "openexchangerates": {"rates": {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 151.2}},
+    "nasa": {"title": "The Horsehead Nebula", "explanation": "A dark cloud of dust and gas " * 12,
+             "url": "https://apod.nasa.gov/apod/image/horsehead.jpg"},
+    "ipapi": {"city": "Mountain View", "region": "California", "country_name": "United States",
+              "latitude": 37.42, "longitude": -122.08},
+}
+
+TOOL_CALLS = [
+    ("get_stock_price", {"symbol": "AAPL"}),
+    ("get_stock_prices", {"symbols": ["AAPL", "MSFT", "GOOGL"]}),
+    ("fetch_weather", {"city": "London"}),
+    ("fetch_news", {"topic": "technology"}),
+    ("convert_currencies", {"amount": 100, "from_currencies": ["USD"], "to_currencies": ["EUR", "GBP", "JPY"]}),
+    ("get_nasa_apod", {}),
+    ("get_ip_location", {"ip": "8.8.8.8"}),
+]
+TURN_CALL = {"name": "get_stock_prices", "args": {"symbols": ["AAPL", "MSFT", "GOOGL"]}, "id": "quotes"}
+
+
+def stub_get(url, params=None, **kwargs):
+    body = next(body for host, body in UPSTREAM.items() if host in url)
+    return type("Response", (), {"text": json.dumps(body)})()
+
+
+def legacy_messages(tool_calls, results):
+    """The old tools node output: the UI text in an AIMessage tagged with the call id."""
+    return {"messages": [
+        AIMessage(content=str(result), tool_call_id=tool_call["id"]) for tool_call, result in zip(tool_calls, results)
+    ]}
+
+
+def legacy_route_after_tools(state):
+    """The old router: only an AIMessage without a tool_call_id ended the turn."""
+    last_message = state["messages"][-1]
+    if (isinstance(last_message, AIMessage) and not last_message.tool_calls
+            and getattr(last_message, "tool_call_id", None) is None):
+        return "__end__"
+    return "context_node"
+
+
+def wire(messages):
+    """The request body messages langchain_groq sends for a prompt."""
+    return [_convert_message_to_dict(message) for message in messages]
+
+
+def unanswered(payload):
+    answered = {message.get("tool_call_id") for message in payload if message["role"] == "tool"}
+    calls = [call["id"] for message in payload for call in message.get("tool_calls") or []]
+    return sum(call_id not in answered for call_id in calls)
+
+
+def result_sizes():
+    print("tool result as read by the LLM (chars)")
+    total_ui = total_llm = 0
+    for name, args in TOOL_CALLS:
+        result = backend._invoke_tool_call({"name": name, "args": args, "id": name})
+        ui, llm = len(str(result)), len(for_llm(result, args))
+        total_ui += ui
+        total_llm += llm
+        print(f"  {name:20s} UI text {ui:4d}   compact {llm:4d}")
+    print(f"  {'total':20s} UI text {total_ui:4d}   compact {total_llm:4d}   ({100 * (1 - total_llm / total_ui):.0f}% smaller)")
+
+
+class Recorder:
+    """Scripted model that records the request body of every LLM call."""
+
+    def __init__(self):
+        self.prompt_chars = 0
+        self.unanswered = 0
+
+    def __call__(self, prompt):
+        payload = wire(prompt)
+        self.prompt_chars += len(json.dumps(payload, ensure_ascii=False))
+        self.unanswered = unanswered(payload)
+        if any(message["role"] == "tool" for message in payload) and not self.unanswered:
+            return "AAPL, MSFT and GOOGL are all trading around $195."
+        return AIMessage(content="", tool_calls=[TURN_CALL])
+
+
+def tool_turn(label, patches):
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    for module, name, value in patches:
+        setattr(module, name, value)
+    recorder = Recorder()
+    model = FakeStreamingChatModel(script=recorder)
+    backend.llm_with_tools = model
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    graph = backend.build_graph(backend.chat_node, backend.custom_tools_node)
+    chatbot = graph.compile(checkpointer=IndexedSqliteSaver(conn=conn))
+    steps, outcome = 0, "answered"
+    try:
+        for _ in chatbot.stream({"messages": [HumanMessage(content="How are AAPL, MSFT and GOOGL doing?")]},
+                                config=backend.make_config(label), stream_mode="updates"):
+            steps += 1
+    except GraphRecursionError:
+        outcome = "hit recursion_limit"
+    finally:
+        for module, name, value in originals:
+            setattr(module, name, value)
+    tokens = recorder.prompt_chars // CHARS_PER_TOKEN
+    print(f"  {label:12s} graph steps {steps:3d}  LLM calls {model.call_count:3d}  prompt ~{tokens:6d} tokens  "
+          f"unanswered calls in last prompt {recorder.unanswered}  ({outcome})")
+
+
+def main():
+    backend.http_client.get = stub_get
+    # Default limits everywhere so the stub is not held to the real free-tier quotas
+    backend.resilience = Resilience(providers={})
+    tool_cache.clear()
+    result_sizes()
+
+    print("\none tool turn (get_stock_prices), prompt tokens summed over the turn's LLM calls")
+    tool_turn("AIMessage", [
+        (backend, "tool_messages", legacy_messages),
+        (backend, "route_after_tools", legacy_route_after_tools),
+        (context_manager, "as_tool_message", lambda message: message),
+    ])
+    tool_turn("ToolMessage", [])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: size of the tool schema bound to the LLM (sent with every prompt)
+for all registered tools vs an ENABLED_TOOLS subset, plus name lookup cost.
+Run: python benchmarks/bench_tool_schema.py
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+import langgraph_tool_backend as backend
+from tool_registry import ToolRegistry
+
+SUBSET = ["calculator_tool", "fetch_weather", "get_stock_price", "search_tool"]
+# Rough OpenAI-style estimate; good enough to compare configurations
+CHARS_PER_TOKEN = 4
+LOOKUPS = 100_000
+
+
+def schema_chars(tools):
+    return len(json.dumps([convert_to_openai_tool(t) for t in tools]))
+
+
+def main():
+    subset = ToolRegistry(enabled=SUBSET)
+    for spec in backend.tool_registry.specs():
+        subset.register(spec.tool)
+
+    for label, registry in (("all tools", backend.tool_registry), (f"{len(SUBSET)} enabled", subset)):
+        chars = schema_chars(registry.tools())
+        print(f"{label:12s} tools {len(registry.tools()):2d}  schema {chars:6d} chars  ~{chars // CHARS_PER_TOKEN:5d} tokens")
+
+    names = backend.tool_registry.names()
+    tools = backend.tool_registry.tools()
+    linear = timeit.timeit(lambda: next(t for t in tools if t.name == names[-1]), number=LOOKUPS)
+    indexed = timeit.timeit(lambda: backend.tool_registry.tool(names[-1]), number=LOOKUPS)
+    print(f"\nlookup of last tool  linear scan {linear / LOOKUPS * 1e9:6.0f}ns  registry {indexed / LOOKUPS * 1e9:6.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Local HTTP stand-ins for every upstream API the tools call (Alpha Vantage,
+WeatherAPI, NewsAPI, Open Exchange Rates, JokeAPI, NASA APOD, ipapi and the
+DuckDuckGo search tool), with per-host latency, jitter and error rates.
+
+Tools keep their real URLs: while `installed()` is active, http_client
+requests are rewritten to http://127.0.0.1:<port>/<original host>/<path>, so
+the pooled session, resilience layer and response parsing all run for real.
+
+Usage:
+    with StubUpstreams({"www.alphavantage.co": EndpointProfile(latency=0.2, error_rate=0.1)}) as stubs:
+        with stubs.installed():
+            backend.run_turn(...)
+"""
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SEARCH_HOST = "duckduckgo"
+STOCK_PRICES = {"AAPL": 195.50, "GOOGL": 142.80, "TSLA": 238.45, "MSFT": 380.25, "AMZN": 180.50}
+
+
+class EndpointProfile:
+    """How one upstream host behaves: fixed latency plus uniform jitter (seconds), and an error rate."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+    def describe(self):
+        return {"latency": self.latency, "jitter": self.jitter, "error_rate": self.error_rate,
+                "error_status": self.error_status}
+
+
+# =========================Upstream Payloads======================
+def _query(query, name, default=""):
+    return query.get(name, [default])[0]
+
+
+def _stock(path, query):
+    symbol = _query(query, "symbol", "AAPL").upper()
+    return {"Global Quote": {"05. price": f"{STOCK_PRICES.get(symbol, 150.0):.2f}", "09. change": "1.25"}}
+
+
+def _weather(path, query):
+    city = _query(query, "q", "London")
+    return {"location": {"name": city},
+            "current": {"temp_c": 10 + len(city) % 15, "condition": {"text": "Partly cloudy"}, "humidity": 71}}
+
+
+def _news(path, query):
+    topic = _query(query, "q", "technology")
+    return {"articles": [{"title": f"{topic.title()} headline number {i}"} for i in range(5)]}
+
+
+def _rates(path, query):
+    return {"rates": {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 151.2, "INR": 83.1, "CAD": 1.36}}
+
+
+def _jokes(path, query):
+    amount = int(_query(query, "amount", "1"))
+    jokes = [{"joke": f"Stub joke number {i}: the server was too tired to be funny."} for i in range(amount)]
+    return jokes[0] if amount == 1 else {"jokes": jokes}
+
+
+def _apod(path, query):
+    return {"title": "The Horsehead Nebula", "explanation": "A dark cloud of dust and gas. " * 12,
+            "url": "https://apod.nasa.gov/apod/image/horsehead.jpg"}
+
+
+def _ip(path, query):
+    return {"city": "Mountain View", "region": "California", "country_name": "United States",
+            "latitude": 37.42, "longitude": -122.08}
+
+
+def _search(path, query):
+    text = _query(query, "q")
+    return {"text": f"Search results for {text}: three short snippets about {text} from stub pages."}
+
+
+PAYLOADS = {
+    "www.alphavantage.co": _stock,
+    "api.weatherapi.com": _weather,
+    "newsapi.org": _news,
+    "openexchangerates.org": _rates,
+    "v2.jokeapi.dev": _jokes,
+    "api.nasa.gov": _apod,
+    "ipapi.co": _ip,
+    SEARCH_HOST: _search,
+}
+
+
+# =========================Stub Server======================
+class StubUpstreams:
+    """One local server answering for every upstream host, with configurable behaviour per host."""
+
+    def __init__(self, profiles=None, default=None, seed=0):
+        self.profiles = dict(profiles or {})
+        self.default = default or EndpointProfile()
+        self.requests = {}
+        self.errors = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def profile(self, host):
+        return self.profiles.get(host, self.default)
+
+    def _should_fail(self, profile):
+        with self._lock:
+            return self._random.random() < profile.error_rate, self._random.uniform(0, profile.jitter)
+
+    def respond(self, host, path, query):
+        """(status, body) for a request to host; sleeps for the host's latency first."""
+        profile = self.profile(host)
+        fail, jitter = self._should_fail(profile)
+        time.sleep(profile.latency + jitter)
+        with self._lock:
+            self.requests[host] = self.requests.get(host, 0) + 1
+            if fail:
+                self.errors[host] = self.errors.get(host, 0) + 1
+        if fail:
+            return profile.error_status, {"error": "stub upstream failure"}
+        handler = PAYLOADS.get(host)
+        if handler is None:
+            return 404, {"error": f"no stub for {host}"}
+        return 200, handler(path, query)
+
+    def start(self):
+        stubs = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like the real upstreams, so the pooled session is exercised
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                host, _, path = parts.path.lstrip("/").partition("/")
+                status, body = stubs.respond(host, "/" + path, parse_qs(parts.query))
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="stub-upstreams", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def url_for(self, url):
+        """The stub URL standing in for an upstream URL."""
+        parts = urlsplit(url)
+        return f"{self.base_url}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+    def stats(self):
+        with self._lock:
+            return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+    @contextmanager
+    def installed(self):
+        """Route http_client (sync and async) and the search tool's client to the stubs."""
+        import http_client
+        import langgraph_tool_backend as backend
+
+        original_get, original_aget = http_client.get, http_client.aget
+        previous_search = backend.__dict__.get("search_client")
+
+        def get(url, params=None, **kwargs):
+            return original_get(self.url_for(url), params=params, **kwargs)
+
+        async def aget(url, params=None, **kwargs):
+            return await original_aget(self.url_for(url), params=params, **kwargs)
+
+        http_client.get, http_client.aget = get, aget
+        backend.search_client = StubSearch(self, original_get)
+        try:
+            yield self
+        finally:
+            http_client.get, http_client.aget = original_get, original_aget
+            if previous_search is None:
+                backend.__dict__.pop("search_client", None)
+            else:
+                backend.search_client = previous_search
+
+
+class StubSearch:
+    """Stands in for DuckDuckGoSearchRun: invoke(query) -> text, raising on upstream errors."""
+
+    def __init__(self, stubs, get):
+        self.stubs = stubs
+        self._get = get
+
+    def invoke(self, query):
+        response = self._get(f"{self.stubs.base_url}/{SEARCH_HOST}/search", params={"q": query})
+        response.raise_for_status()
+        return response.json()["text"]
@@ -0,0 +1,152 @@
+import asyncio
+import weakref
+
+from langchain_core.messages import SystemMessage
+
+import langgraph_tool_backend as backend
+from metrics import metrics
+from resilience import resilience
+from storage import DB_PATH, aconnect
+from thread_store import IndexedAsyncSqliteSaver
+
+# =========================Async Graph Nodes======================
+@metrics.timed("node", node="chat_node")
+async def chat_node(state: backend.ChatState) -> dict:
+    """Async LLM node: same shortcuts and prompt as the sync chat_node."""
+    metrics.iteration()
+    try:
+        shortcut = backend.shortcut_reply(state)
+        if shortcut is not None:
+            return shortcut
+        prompt = backend.chat_prompt(state)
+        with metrics.span("llm_call") as span:
+            response = await backend.get_llm_with_tools().ainvoke(prompt)
+            backend.record_llm_usage(prompt, response, span)
+        backend.remember_llm_reply(state, response)
+        return {"messages": [response]}
+    except Exception as e:
+        metrics.error("async chat_node", e)
+        return {"messages": [SystemMessage(content="Sorry, I hit an error. Please try again.")]}
+
+async def _ainvoke_tool_call(tool_call):
+    """Execute a single tool call through its native coroutine."""
+    spec = backend.tool_registry.get(tool_call["name"])
+    if spec is None:
+        return backend.unknown_tool_result(tool_call["name"])
+    with metrics.span("tool", tool=spec.name) as span:
+        if spec.provider:
+            result = backend.normalize_tool_result(
+                await resilience.aguard(spec.provider, spec.tool.ainvoke, tool_call["args"])
+            )
+        else:
+            result = backend.normalize_tool_result(await spec.tool.ainvoke(tool_call["args"]))
+        span["status"] = backend.status_of(result)
+    return result
+
+@metrics.timed("node", node="tools_node")
+async def custom_tools_node(state: backend.ChatState) -> dict:
+    """Async tools node: all tool calls of the turn run concurrently on the event loop."""
+    last_message = state["messages"][-1]
+    if hasattr(last_message, "tool_calls") and last_message.tool_calls:
+        results = await backend.tool_executor.arun(last_message.tool_calls, _ainvoke_tool_call)
+        return backend.tool_messages(last_message.tool_calls, results)
+    return {"messages": []}
+
+graph = backend.build_graph(chat_node, custom_tools_node)
+
+# =========================Async App======================
+# aiosqlite connections belong to one event loop, so each loop gets its own app
+_apps = weakref.WeakKeyDictionary()
+
+async def _create_chatbot(db_path):
+    conn = await aconnect(db_path)
+    return graph.compile(checkpointer=IndexedAsyncSqliteSaver(conn))
+
+async def get_chatbot(db_path: str = None):
+    """Compiled async graph with an AsyncSqliteSaver for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _apps:
+        _apps[loop] = asyncio.ensure_future(_create_chatbot(db_path or DB_PATH))
+    return await _apps[loop]
+
+async def aclose():
+    """Close the running loop's checkpoint connection."""
+    task = _apps.pop(asyncio.get_running_loop(), None)
+    if task is not None:
+        app = await task
+        await app.checkpointer.conn.close()
+
+# =========================Turn Submission======================
+async def _aprepare_turn(app, config: dict, user_input):
+    if isinstance(user_input, str):
+        return backend.new_turn_messages(user_input), None
+    state = await app.aget_state(config)
+    values = state.values if state and state.values else {"messages": []}
+    new_messages = backend.new_turn_messages(user_input, values.get("messages", []))
+    return new_messages, (None if new_messages else values)
+
+async def arun_turn(thread_id: str, user_input, config: dict = None) -> dict:
+    """Async run_turn: submit only the new user turn and await the final state."""
+    app = await get_chatbot()
+    config = config or backend.make_config(thread_id)
+    with metrics.turn(config["configurable"]["thread_id"]):
+        new_messages, values = await _aprepare_turn(app, config, user_input)
+        if not new_messages:
+            return values
+        return await app.ainvoke({"messages": new_messages}, config=config)
+
+async def astream_turn(thread_id: str, user_input, config: dict = None):
+    """Async stream_turn: yields the same token/tool_start/tool_end/done events."""
+    app = await get_chatbot()
+    config = config or backend.make_config(thread_id)
+    with metrics.turn(config["configurable"]["thread_id"]):
+        new_messages, values = await _aprepare_turn(app, config, user_input)
+        if not new_messages:
+            yield {"type": "done", "state": values}
+            return
+
+        tool_names = {}
+        async for mode, payload in app.astream(
+            {"messages": new_messages}, config=config, stream_mode=["messages", "updates", "values"]
+        ):
+            if mode == "values":
+                values = payload
+            else:
+                for event in backend.stream_events(mode, payload, tool_names):
+                    yield event
+    yield {"type": "done", "state": values}
+
+# =========================Database Operations======================
+async def aget_threads(limit=None, offset=0):
+    """Thread IDs, most recently updated first."""
+    app = await get_chatbot()
+    return [thread["thread_id"] for thread in await app.checkpointer.alist_threads(limit=limit, offset=offset)]
+
+async def asearch_threads(query: str, limit: int = 10) -> list:
+    """Async search_threads."""
+    try:
+        app = await get_chatbot()
+        return await app.checkpointer.asearch_threads(query, limit=limit)
+    except Exception as e:
+        metrics.error("search_threads", e, f"Error searching threads: {e}")
+        return []
+
+async def aget_message_page(thread_id: str, limit: int = backend.MESSAGE_PAGE_SIZE, before=None) -> dict:
+    """Async get_message_page."""
+    try:
+        app = await get_chatbot()
+        page = await app.checkpointer.amessage_page(thread_id, limit=limit, before=before)
+    except Exception as e:
+        metrics.error("message_page", e, f"Error loading messages of thread {thread_id}: {e}")
+        return {"messages": [], "cursor": None}
+    return backend.chat_page(page)
+
+async def adelete_thread(thread_id: str) -> bool:
+    """Delete a specific thread from the database."""
+    try:
+        app = await get_chatbot()
+        await app.checkpointer.adelete_thread(thread_id)
+        return True
+    except Exception as e:
+        metrics.error("delete_thread", e, f"Error deleting thread {thread_id}: {e}")
+        return False
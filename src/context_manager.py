@@ -0,0 +1,131 @@
+import json
+import os
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+# =========================Context Budget Settings======================
+# Token budget for the messages sent to the LLM (summary + recent window)
+CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "4000"))
+# Upper bound for the rolling summary of older turns
+CONTEXT_SUMMARY_MAX_TOKENS = int(os.getenv("CONTEXT_SUMMARY_MAX_TOKENS", "600"))
+# Tool outputs from earlier turns are cut down to this many characters
+TOOL_OUTPUT_MAX_CHARS = int(os.getenv("TOOL_OUTPUT_MAX_CHARS", "600"))
+# Characters per line kept for each turn in the extractive summary
+SUMMARY_LINE_MAX_CHARS = 160
+CHARS_PER_TOKEN = 4
+
+
+def _content_text(message):
+    content = message.content
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+
+def estimate_tokens(message):
+    """Cheap token estimate (~4 chars per token plus per-message overhead)."""
+    tokens = len(_content_text(message)) // CHARS_PER_TOKEN + 4
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += len(json.dumps(tool_call.get("args", {}), default=str)) // CHARS_PER_TOKEN + 8
+    return tokens
+
+
+def is_tool_result(message):
+    return getattr(message, "tool_call_id", None) is not None
+
+
+def as_tool_message(message):
+    """
+    Threads saved before tool results were ToolMessages stored them as
+    AIMessages with a tool_call_id; send those to the LLM as ToolMessages.
+    """
+    if isinstance(message, AIMessage) and is_tool_result(message):
+        return ToolMessage(content=message.content, tool_call_id=message.tool_call_id, id=message.id)
+    return message
+
+
+def trim_tool_output(message, max_chars=TOOL_OUTPUT_MAX_CHARS):
+    """Shorten a bulky tool result; other messages are returned unchanged."""
+    content = message.content
+    if not is_tool_result(message) or not isinstance(content, str) or len(content) <= max_chars:
+        return message
+    return message.model_copy(update={"content": content[:max_chars].rstrip() + " … [trimmed]"})
+
+
+def _last_human_index(messages):
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return index
+    return 0
+
+
+def select_window(messages, budget):
+    """
+    Index where the recent window starts. The window fits in the token budget,
+    always contains the latest user turn, and starts on a user message so tool
+    results are never separated from the call that produced them.
+    """
+    last_human = _last_human_index(messages)
+    start = len(messages)
+    total = 0
+    for index in range(len(messages) - 1, -1, -1):
+        message = messages[index] if index >= last_human else trim_tool_output(messages[index])
+        total += estimate_tokens(message)
+        if total > budget:
+            break
+        start = index
+    start = min(start, last_human)
+    while start < last_human and not isinstance(messages[start], HumanMessage):
+        start += 1
+    return start
+
+
+def extractive_summary(previous_summary, messages, max_tokens=CONTEXT_SUMMARY_MAX_TOKENS):
+    """
+    Fold messages into the rolling summary without an LLM call: one short line per
+    user/assistant turn, keeping the most recent lines that fit in max_tokens.
+    """
+    lines = previous_summary.splitlines() if previous_summary else []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            speaker = "User"
+        elif isinstance(message, AIMessage) and message.content and not is_tool_result(message):
+            speaker = "Assistant"
+        else:
+            continue
+        text = " ".join(_content_text(message).split())
+        if len(text) > SUMMARY_LINE_MAX_CHARS:
+            text = text[:SUMMARY_LINE_MAX_CHARS - 1].rstrip() + "…"
+        lines.append(f"{speaker}: {text}")
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    kept, size = [], 0
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > max_chars:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+
+def compact_context(messages, summary="", summarized_count=0, max_tokens=CONTEXT_MAX_TOKENS,
+                    summarize=extractive_summary):
+    """
+    Fold messages that no longer fit in the window into the summary.
+    Returns (summary, summarized_count); the message history itself is untouched.
+    """
+    window_budget = max(max_tokens - CONTEXT_SUMMARY_MAX_TOKENS, 0)
+    unsummarized = messages[summarized_count:]
+    window_start = summarized_count + select_window(unsummarized, window_budget)
+    if window_start > summarized_count:
+        summary = summarize(summary, messages[summarized_count:window_start])
+        summarized_count = window_start
+    return summary, summarized_count
+
+
+def build_prompt(messages, summary="", summarized_count=0):
+    """Messages to send to the LLM: the summary, then the recent window."""
+    window = [as_tool_message(m) for m in messages[summarized_count:]]
+    last_human = _last_human_index(window)
+    prompt = [trim_tool_output(m) if index < last_human else m for index, m in enumerate(window)]
+    if summary:
+        prompt.insert(0, SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+    return prompt
@@ -0,0 +1,148 @@
+"""
+Retention and compaction for the checkpoint database.
+
+Run from the command line:
+    python src/db_maintenance.py --db chatbot.db --keep-last 5 --idle-days 30
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "5"))
+DEFAULT_IDLE_DAYS = float(os.getenv("THREAD_IDLE_DAYS", "0"))
+DEFAULT_JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+
+def _table_exists(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is not None
+
+
+def database_bytes(conn):
+    """Size of the database file plus its WAL, as seen on disk."""
+    path = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not path:
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        return page_count * conn.execute("PRAGMA page_size").fetchone()[0]
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def prune_checkpoints(conn, keep_last=DEFAULT_KEEP_LAST):
+    """
+    Keep only the newest keep_last checkpoints per thread and drop writes that
+    belonged to removed checkpoints. Returns (checkpoints_deleted, writes_deleted).
+    """
+    cursor = conn.execute(
+        "DELETE FROM checkpoints WHERE rowid IN ("
+        " SELECT rowid FROM ("
+        "  SELECT rowid, ROW_NUMBER() OVER ("
+        "   PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC) AS position"
+        "  FROM checkpoints)"
+        " WHERE position > ?)",
+        (keep_last,),
+    )
+    checkpoints_deleted = cursor.rowcount
+    cursor = conn.execute(
+        "DELETE FROM writes WHERE NOT EXISTS ("
+        " SELECT 1 FROM checkpoints c WHERE c.thread_id = writes.thread_id"
+        " AND c.checkpoint_ns = writes.checkpoint_ns AND c.checkpoint_id = writes.checkpoint_id)"
+    )
+    conn.commit()
+    return checkpoints_deleted, cursor.rowcount
+
+
+def expire_idle_threads(conn, idle_seconds):
+    """Delete threads with no activity for idle_seconds. Returns the number removed."""
+    if idle_seconds <= 0 or not _table_exists(conn, "thread_metadata"):
+        return 0
+    cutoff = time.time() - idle_seconds
+    expired = [row[0] for row in conn.execute(
+        "SELECT thread_id FROM thread_metadata WHERE updated_at < ?", (cutoff,)
+    )]
+    has_messages = _table_exists(conn, "thread_messages")
+    has_jobs = _table_exists(conn, "turn_jobs")
+    for thread_id in expired:
+        conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+        conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+        conn.execute("DELETE FROM thread_metadata WHERE thread_id = ?", (thread_id,))
+        if has_messages:
+            conn.execute("DELETE FROM thread_messages WHERE thread_id = ?", (thread_id,))
+        if has_jobs:
+            conn.execute("DELETE FROM turn_jobs WHERE thread_id = ?", (thread_id,))
+    conn.commit()
+    return len(expired)
+
+
+def prune_jobs(conn, retention_seconds):
+    """Delete background jobs that finished more than retention_seconds ago. Returns the number removed."""
+    if retention_seconds <= 0 or not _table_exists(conn, "turn_jobs"):
+        return 0
+    cursor = conn.execute(
+        "DELETE FROM turn_jobs WHERE status IN ('done', 'error', 'cancelled') AND finished_at < ?",
+        (time.time() - retention_seconds,),
+    )
+    conn.commit()
+    return cursor.rowcount
+
+
+def vacuum(conn):
+    """
+    Return free pages to the filesystem and truncate the WAL. The first run
+    switches the database to incremental auto-vacuum, which needs one full VACUUM.
+    """
+    conn.commit()
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    else:
+        conn.execute("PRAGMA incremental_vacuum").fetchall()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+
+def run_maintenance(conn, keep_last=DEFAULT_KEEP_LAST, idle_days=DEFAULT_IDLE_DAYS,
+                    job_retention_days=DEFAULT_JOB_RETENTION_DAYS):
+    """Prune, expire and vacuum in one pass. Returns a report dict."""
+    if not _table_exists(conn, "checkpoints"):
+        return {"checkpoints_deleted": 0, "writes_deleted": 0, "threads_expired": 0, "jobs_deleted": 0,
+                "bytes_before": 0, "bytes_after": 0, "bytes_reclaimed": 0}
+    bytes_before = database_bytes(conn)
+    threads_expired = expire_idle_threads(conn, idle_days * 24 * 60 * 60)
+    jobs_deleted = prune_jobs(conn, job_retention_days * 24 * 60 * 60)
+    checkpoints_deleted, writes_deleted = prune_checkpoints(conn, keep_last)
+    vacuum(conn)
+    bytes_after = database_bytes(conn)
+    return {
+        "checkpoints_deleted": checkpoints_deleted,
+        "writes_deleted": writes_deleted,
+        "threads_expired": threads_expired,
+        "jobs_deleted": jobs_deleted,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_reclaimed": max(bytes_before - bytes_after, 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the chatbot checkpoint database.")
+    parser.add_argument("--db", default="chatbot.db", help="Path to the SQLite database")
+    parser.add_argument("--keep-last", type=int, default=DEFAULT_KEEP_LAST,
+                        help="Checkpoints to keep per thread")
+    parser.add_argument("--idle-days", type=float, default=DEFAULT_IDLE_DAYS,
+                        help="Delete threads idle for longer than this (0 disables)")
+    parser.add_argument("--job-retention-days", type=float, default=DEFAULT_JOB_RETENTION_DAYS,
+                        help="Delete finished background jobs older than this (0 keeps them)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        report = run_maintenance(conn, keep_last=args.keep_last, idle_days=args.idle_days,
+                                 job_retention_days=args.job_retention_days)
+    finally:
+        conn.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatGroq. Replays scripted responses (text or AIMessages
+    with tool calls) and streams them word by word with configurable latency,
+    so time-to-first-token can be measured without network access.
+    """
+
+    responses: list = ["Hello! This is a scripted response from the fake model."]
+    # Optional callable(messages) -> str | AIMessage, used instead of cycling responses
+    script: Optional[Callable] = None
+    first_token_delay: float = 0.0
+    token_delay: float = 0.0
+    call_count: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming-chat-model"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next_message(self, messages) -> AIMessage:
+        if self.script is not None:
+            response = self.script(messages)
+        else:
+            response = self.responses[self.call_count % len(self.responses)]
+        self.call_count += 1
+        if isinstance(response, str):
+            return AIMessage(content=response, id=f"fake-{uuid.uuid4()}")
+        return response.model_copy(update={"id": f"fake-{uuid.uuid4()}"})
+
+    @staticmethod
+    def _tokens(content):
+        return [token for token in re.split(r"(\s)", content) if token] if content else []
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        message = self._next_message(messages)
+        time.sleep(self.first_token_delay + self.token_delay * len(self._tokens(message.content)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, message) -> list:
+        chunks = [
+            ChatGenerationChunk(message=AIMessageChunk(content=token, id=message.id))
+            for token in self._tokens(message.content)
+        ]
+        if message.tool_calls:
+            tool_call_chunks = [
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ]
+            chunks.append(ChatGenerationChunk(
+                message=AIMessageChunk(content="", id=message.id, tool_call_chunks=tool_call_chunks)
+            ))
+        return chunks
+
+    def _stream(self, messages: list[BaseMessage], stop=None, run_manager=None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        message = self._next_message(messages)
+        time.sleep(self.first_token_delay)
+        for index, chunk in enumerate(self._chunks(message)):
+            if index:
+                time.sleep(self.token_delay)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _agenerate(self, messages: list[BaseMessage], stop=None, run_manager=None,
+                         **kwargs: Any) -> ChatResult:
+        message = self._next_message(messages)
+        await asyncio.sleep(self.first_token_delay + self.token_delay * len(self._tokens(message.content)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages: list[BaseMessage], stop=None, run_manager=None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._next_message(messages)
+        await asyncio.sleep(self.first_token_delay)
+        for index, chunk in enumerate(self._chunks(message)):
+            if index:
+                await asyncio.sleep(self.token_delay)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+class ToolCallingScript:
+    """
+    Script for FakeStreamingChatModel that behaves like a function-calling
+    model: a user message matching rules gets one tool call per match, tool
+    results get a short answer quoting them, anything else gets `reply`.
+    Rules are (regex, tool_name, args); args is a dict or callable(match) -> dict.
+    """
+
+    def __init__(self, rules, reply="Happy to help with that. Here is a short, friendly answer.",
+                 answer_prefix="Here is what I found:", max_answer_chars=200):
+        self.rules = [(re.compile(pattern, re.IGNORECASE), name, args) for pattern, name, args in rules]
+        self.reply = reply
+        self.answer_prefix = answer_prefix
+        self.max_answer_chars = max_answer_chars
+
+    def tool_calls(self, text):
+        calls = []
+        for pattern, name, args in self.rules:
+            for match in pattern.finditer(text):
+                calls.append({
+                    "name": name,
+                    "args": args(match) if callable(args) else dict(args),
+                    "id": f"{name}_{uuid.uuid4().hex[:8]}",
+                })
+        return calls
+
+    def __call__(self, messages):
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            results = []
+            for message in reversed(messages):
+                if not isinstance(message, ToolMessage):
+                    break
+                results.append(message.content)
+            return f"{self.answer_prefix} {' '.join(reversed(results))[:self.max_answer_chars]}"
+        calls = self.tool_calls(last.content if isinstance(last.content, str) else "")
+        if calls:
+            return AIMessage(content="", tool_calls=calls)
+        return self.reply
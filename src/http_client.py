@@ -0,0 +1,83 @@
+import asyncio
+import os
+import threading
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# =========================HTTP Settings======================
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "8"))
+# Number of distinct upstream hosts to keep connection pools for
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "16"))
+# Max open connections per upstream host
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "8"))
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def default_timeout():
+    """(connect, read) timeout tuple used when a caller does not pass one."""
+    return (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+
+def create_session(pool_hosts=HTTP_POOL_HOSTS, max_per_host=HTTP_MAX_PER_HOST):
+    """Build a requests.Session with keep-alive connection pools per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=max_per_host, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Get the shared, pooled session used by all tools."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def get(url, params=None, timeout=None, **kwargs):
+    """GET through the shared session, reusing open connections to the host."""
+    return get_session().get(url, params=params, timeout=timeout or default_timeout(), **kwargs)
+
+
+def get_async_client():
+    """
+    Get the pooled httpx.AsyncClient for the running event loop.
+    Clients are bound to a loop, so each loop gets its own.
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_HOSTS * HTTP_MAX_PER_HOST,
+                max_keepalive_connections=HTTP_POOL_HOSTS * HTTP_MAX_PER_HOST,
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aget(url, params=None, **kwargs):
+    """Async GET through the pooled client for the running event loop."""
+    return await get_async_client().get(url, params=params, **kwargs)
+
+
+def close():
+    """Close the shared session so its pooled connections are released."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,200 @@
+import re
+import uuid
+
+from langchain_core.messages import AIMessage
+
+# =========================Router Settings======================
+GREETING_REPLY = "Hey there! I'm ready to help. What's on your mind?"
+MAX_JOKES = 10  # get_jokes' limit (JokeAPI's amount parameter)
+MAX_SYMBOLS = 10
+
+# A "city" containing any of these is a list, a person or a time, not a place
+NOT_A_CITY = re.compile(
+    r"\b(?:and|or|me|my|mine|us|our|you|your|here|there|this|that|"
+    r"morning|afternoon|evening|night|tonight|today|now|later|"
+    r"tomorrow|forecast|next|yesterday|week|weekend)\b",
+    re.IGNORECASE,
+)
+
+# Capitalised words are only taken for tickers when they are well-known symbols,
+# or when the message says stock/share and the word is not a common abbreviation
+KNOWN_TICKERS = {
+    "AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "TSLA", "NVDA", "META", "NFLX", "AMD", "INTC", "IBM", "ORCL",
+    "CRM", "ADBE", "PYPL", "UBER", "SHOP", "DIS", "KO", "PEP", "WMT", "JPM", "BAC", "XOM", "NKE", "SBUX",
+}
+NOT_TICKERS = {
+    "US", "USA", "UK", "EU", "UN", "TV", "IT", "OK", "AI", "PC", "ID", "CEO", "IPO", "ETF", "GDP", "FAQ",
+    "AM", "PM", "NYC", "LA", "SF", "DC", "LOL", "OMG", "FYI", "ASAP",
+}
+STOCK_WORDS = re.compile(r"\b(?:stocks?|shares?)\b", re.IGNORECASE)
+
+NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5}
+
+OPERATIONS = {
+    "+": "add", "plus": "add", "add": "add",
+    "-": "subtract", "minus": "subtract", "subtract": "subtract",
+    "*": "multiply", "x": "multiply", "times": "multiply", "multiplied by": "multiply", "multiply": "multiply",
+    "/": "divide", "divided by": "divide", "over": "divide", "divide": "divide",
+}
+
+# ISO codes the currency shortcut accepts; "100 lbs to kgs" must not look like a conversion
+CURRENCY_CODES = {
+    "USD", "EUR", "GBP", "JPY", "INR", "CNY", "CAD", "AUD", "CHF", "NZD", "SEK", "NOK", "DKK",
+    "SGD", "HKD", "KRW", "MXN", "BRL", "ZAR", "RUB", "TRY", "AED", "SAR", "PKR", "BDT", "THB",
+}
+
+_NUMBER = r"-?\d+(?:\.\d+)?"
+_OPERATOR = r"\+|-|\*|x|/|plus|minus|times|multiplied by|divided by|over"
+_FILLER = r"(?:please|pls|now|today|right now)"
+_END = rf"(?:\s*,?\s*{_FILLER})?\s*[?!.]*"
+_ASK = r"(?:what(?:'s| is)|whats|calculate|compute|how much is|tell me)\s+"
+
+
+def _compile(pattern, flags=re.IGNORECASE):
+    return re.compile(rf"\s*(?:{pattern}){_END}", flags)
+
+
+# Each rule must match the whole message; anything else goes to the LLM
+GREETING = _compile(
+    r"(?:(?:hi|hello|hey|hiya|yo|good (?:morning|afternoon|evening))(?: there)?[\s,!.]*)?"
+    r"(?:how are (?:you|u)(?: doing)?|how's it going)|"
+    r"(?:hi|hello|hey|hiya|yo|good (?:morning|afternoon|evening))(?: there)?"
+)
+JOKE = _compile(
+    r"(?:(?:tell|give|show) me |i want |i'd like )?"
+    r"(?:(?P<count>\d+|a|an|one|two|three|four|five|another|some)\s+)?"
+    r"(?:(?P<category>programming|pun|misc|any)\s+)?jokes?"
+)
+ARITHMETIC = _compile(
+    rf"(?:{_ASK})?(?P<first>{_NUMBER})\s*(?P<op>{_OPERATOR})\s*(?P<second>{_NUMBER})(?:\s*=\s*\??)?"
+)
+WEATHER = _compile(
+    r"(?:(?:what(?:'s| is) the |how(?:'s| is) the |show me the |get the |check the )?"
+    r"(?:current )?weather(?: like)? (?:in|for|at) )(?P<city>[a-z][a-z .'\-]{0,40}?)(?: right now| today| now)?"
+)
+# Tickers must be written in capitals (or with a $) so company names are left to the LLM;
+# a bare ticker needs two letters, so words like "I" and "A" are never taken for one
+def _ticker(n):
+    return rf"(?:\$(?P<cashtag{n}>[A-Za-z]{{1,5}})|(?-i:(?P<ticker{n}>[A-Z]{{2,5}})))"
+
+
+STOCK = _compile(
+    rf"(?:(?:what(?:'s| is) (?:the )?|get (?:the |me )?|show (?:me )?(?:the )?)?"
+    rf"(?:current )?(?:stock |share )?price (?:of |for ){_ticker(1)}(?: stock| shares?)?|"
+    rf"(?:what(?:'s| is) )?{_ticker(2)}(?:'s)? (?:current )?(?:stock |share )?(?:price|quote)|"
+    rf"(?:how is |how's ){_ticker(3)} (?:stock )?doing)"
+)
+_TICKER = r"(?:\$[A-Za-z]{1,5}|(?-i:[A-Z]{2,5}))"
+STOCKS = _compile(
+    r"(?:compare |(?:what are |get (?:me )?|show (?:me )?)?(?:the )?(?:current )?(?:stock |share )?(?:prices|quotes) (?:of |for ))"
+    rf"(?P<symbols>{_TICKER}(?:(?:\s*,\s*(?:and\s+)?|\s+and\s+|\s+){_TICKER})+)(?: stocks?| shares?)?"
+)
+CURRENCY = _compile(
+    r"(?:convert |exchange |change |how much is )?(?P<amount>\d+(?:\.\d+)?)\s*(?P<source>[a-z]{3})"
+    r" (?:to|in|into) (?P<target>[a-z]{3})"
+)
+
+
+def _tool_call(name, args):
+    return {"name": name, "args": args, "id": f"{name}_{uuid.uuid4().hex[:8]}"}
+
+
+def _tool_calls_message(tool_calls):
+    return AIMessage(content="", tool_calls=tool_calls)
+
+
+def _route_jokes(match):
+    count = match.group("count")
+    category = (match.group("category") or "any").capitalize()
+    if count is None or count.lower() in ("another", "some"):
+        number = 1
+    elif count.isdigit():
+        number = int(count)
+    else:
+        number = NUMBER_WORDS[count.lower()]
+    if not 1 <= number <= MAX_JOKES:
+        return None
+    if number == 1:
+        return _tool_calls_message([_tool_call("get_joke", {"category": category})])
+    # Several jokes are one batched request rather than one tool call each
+    return _tool_calls_message([_tool_call("get_jokes", {"count": number, "category": category})])
+
+
+def _route_arithmetic(match):
+    args = {
+        "first_num": float(match.group("first")),
+        "second_num": float(match.group("second")),
+        "operation": OPERATIONS[match.group("op").lower()],
+    }
+    return _tool_calls_message([_tool_call("calculator_tool", args)])
+
+
+def _route_weather(match):
+    city = match.group("city").strip(" .")
+    if not city or NOT_A_CITY.search(city):
+        return None
+    return _tool_calls_message([_tool_call("fetch_weather", {"city": city.title()})])
+
+
+def _is_ticker(word, text):
+    """A bare capitalised word is a ticker if it is well known, or the message is about stocks."""
+    return word in KNOWN_TICKERS or (word not in NOT_TICKERS and STOCK_WORDS.search(text) is not None)
+
+
+def _route_stock(match):
+    groups = match.groupdict()
+    cashtag = groups["cashtag1"] or groups["cashtag2"] or groups["cashtag3"]
+    symbol = cashtag or groups["ticker1"] or groups["ticker2"] or groups["ticker3"]
+    if not cashtag and not _is_ticker(symbol, match.string):
+        return None
+    return _tool_calls_message([_tool_call("get_stock_price", {"symbol": symbol.upper()})])
+
+
+def _route_stocks(match):
+    found = re.findall(r"\$([A-Za-z]{1,5})|\b([A-Z]{2,5})\b", match.group("symbols"))
+    if any(ticker and not _is_ticker(ticker, match.string) for _, ticker in found):
+        return None
+    symbols = list(dict.fromkeys((cashtag or ticker).upper() for cashtag, ticker in found))
+    if len(symbols) > MAX_SYMBOLS:
+        return None
+    return _tool_calls_message([_tool_call("get_stock_prices", {"symbols": symbols})])
+
+
+def _route_currency(match):
+    args = {
+        "amount": float(match.group("amount")),
+        "from_currency": match.group("source").upper(),
+        "to_currency": match.group("target").upper(),
+    }
+    if not {args["from_currency"], args["to_currency"]} <= CURRENCY_CODES:
+        return None
+    return _tool_calls_message([_tool_call("convert_currency", args)])
+
+
+RULES = [
+    ("greeting", GREETING, lambda match: AIMessage(content=GREETING_REPLY)),
+    ("joke", JOKE, _route_jokes),
+    ("arithmetic", ARITHMETIC, _route_arithmetic),
+    ("currency", CURRENCY, _route_currency),
+    ("weather", WEATHER, _route_weather),
+    ("stock", STOCK, _route_stock),
+    ("stock", STOCKS, _route_stocks),
+]
+
+
+def classify(text):
+    """(intent, AIMessage) for a message the router can answer, or (None, None)."""
+    if not isinstance(text, str) or len(text) > 200:
+        return None, None
+    for intent, pattern, build in RULES:
+        match = pattern.fullmatch(text)
+        if match:
+            message = build(match)
+            if message is not None:
+                return intent, message
+    return None, None
+
+
+def route(text):
+    """Direct reply or tool-call message for the user's text, or None to ask the LLM."""
+    return classify(text)[1]
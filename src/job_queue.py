@@ -0,0 +1,415 @@
+"""
+Background execution of chat turns.
+
+Turns are submitted as jobs to a durable SQLite table (turn_jobs) and run by a
+pool of worker threads, so a Streamlit rerun or a closed browser tab no longer
+interrupts or repeats a turn: the graph keeps running and saves its answer in
+the thread's checkpoint. The UI follows a job by polling JobQueue.events(job_id).
+
+Jobs of one thread run one at a time, in submission order. A job left running
+by a process that died is queued again: right away when that process ran on
+this host, otherwise once its heartbeat is older than JOB_LEASE_SECONDS. Each
+job carries the id of its user message, so a retried job never appends the
+message twice and finishes a half-run turn instead.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import langgraph_tool_backend as backend
+from metrics import metrics
+from storage import DB_PATH, ConnectionPool
+
+# =========================Job Settings======================
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# How often idle workers look for jobs submitted by other processes
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "0.5"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Jobs whose progress events are kept in memory for pollers
+JOB_EVENTS_KEEP = 256
+# Tells this process apart from an earlier one that had the same pid (e.g. in a container)
+PROCESS_TOKEN = uuid.uuid4().hex[:12]
+
+QUEUED, RUNNING, DONE, ERROR, CANCELLED = "queued", "running", "done", "error", "cancelled"
+FINISHED = (DONE, ERROR, CANCELLED)
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turn_jobs (
+    job_id TEXT PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    message_id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_turn_jobs_status ON turn_jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_turn_jobs_thread ON turn_jobs (thread_id, status);
+"""
+
+JOB_COLUMNS = ("job_id", "thread_id", "message_id", "content", "status", "attempts", "worker", "created_at",
+               "started_at", "heartbeat_at", "finished_at", "result", "error")
+SELECT_JOB_SQL = f"SELECT {', '.join(JOB_COLUMNS)} FROM turn_jobs"
+
+# The oldest queued job whose thread has nothing running. A single statement,
+# so two workers (or processes) can never claim the same job
+CLAIM_SQL = f"""
+UPDATE turn_jobs SET status = 'running', attempts = attempts + 1, worker = ?, started_at = ?, heartbeat_at = ?
+WHERE job_id = (
+    SELECT q.job_id FROM turn_jobs q
+    WHERE q.status = 'queued' AND NOT EXISTS (
+        SELECT 1 FROM turn_jobs r WHERE r.thread_id = q.thread_id AND r.status = 'running'
+    )
+    ORDER BY q.created_at, q.rowid LIMIT 1
+)
+RETURNING {', '.join(JOB_COLUMNS)}
+"""
+
+
+def _process_alive(pid):
+    if os.name == "nt":
+        # os.kill(pid, 0) would terminate the process on Windows; the lease applies there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def worker_alive(worker):
+    """
+    False when a job's worker ("host:pid:token") was a process on this host that
+    has exited. Workers on other hosts are presumed alive until their lease expires.
+    """
+    host, _, rest = (worker or "").partition(":")
+    pid, _, token = rest.partition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    if int(pid) == os.getpid():
+        return token == PROCESS_TOKEN
+    return _process_alive(int(pid))
+
+
+def _job_row(row):
+    job = dict(zip(JOB_COLUMNS, row))
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def turn_result(messages):
+    """The answer and the tools used (in call order) in a thread's last turn."""
+    answer, tools = None, []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        if answer is None and isinstance(message, AIMessage) and message.content:
+            answer = message.content
+        for tool_call in reversed(getattr(message, "tool_calls", None) or []):
+            tools.append(tool_call["name"])
+    return {"answer": answer, "tools": list(dict.fromkeys(reversed(tools)))}
+
+
+def _drain(events, emit):
+    """Send a stream_graph generator's events to emit; returns its final state."""
+    try:
+        while True:
+            emit(next(events))
+    except StopIteration as finished:
+        return finished.value
+
+
+def run_turn_job(job, emit):
+    """Run a job's turn through the graph, passing its stream events to emit."""
+    thread_id = job["thread_id"]
+    config = backend.make_config(thread_id)
+    with metrics.turn(thread_id):
+        snapshot = backend.get_chatbot().get_state(config)
+        stored = snapshot.values.get("messages", []) if snapshot and snapshot.values else []
+        if any(message.id == job["message_id"] for message in stored):
+            # An earlier attempt already saved the message: finish its turn, if it has not
+            if not snapshot.next:
+                return turn_result(stored)
+            values = _drain(backend.stream_graph(None, config), emit)
+        else:
+            message = HumanMessage(content=job["content"], id=job["message_id"])
+            values = _drain(backend.stream_graph({"messages": [message]}, config), emit)
+    return turn_result(values["messages"])
+
+
+# =========================Job Queue======================
+class JobQueue:
+    """Durable queue of chat turns and the worker threads that run them."""
+
+    def __init__(self, path=DB_PATH, workers=JOB_WORKERS, run=run_turn_job, poll_interval=JOB_POLL_INTERVAL,
+                 lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS):
+        self.pool = ConnectionPool(path)
+        self.workers = workers
+        self.run = run
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{PROCESS_TOKEN}"
+        # Workers look for stale jobs this often, and running jobs heartbeat at least this often
+        self.recovery_interval = max(lease_seconds / 4, poll_interval)
+        self._next_recovery = 0.0
+        self._recovery_lock = threading.Lock()
+        self._ready = False
+        self._write_lock = threading.Lock()
+        # Wakes an idle worker on submit, and waiters when a job finishes
+        self._work_available = threading.Condition()
+        self._submitted = 0
+        self._job_finished = threading.Condition()
+        self._events = OrderedDict()
+        self._events_lock = threading.Lock()
+        self._threads = []
+        self._stopping = False
+
+    def setup(self):
+        if self._ready:
+            return
+        with self._write_lock:
+            if not self._ready:
+                conn = self.pool.connection()
+                conn.executescript(JOBS_SCHEMA)
+                conn.commit()
+                self._ready = True
+
+    def _write(self, sql, params=()):
+        """Run one write statement; returns its RETURNING rows, if any."""
+        self.setup()
+        conn = self.pool.connection()
+        with self._write_lock:
+            try:
+                rows = conn.execute(sql, params).fetchall()
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return rows
+
+    def _read(self, sql, params=()):
+        self.setup()
+        return self.pool.connection().execute(sql, params).fetchall()
+
+    def submit(self, thread_id, content):
+        """Queue a user message for a thread; returns the job id."""
+        job_id = uuid.uuid4().hex
+        self._write(
+            "INSERT INTO turn_jobs (job_id, thread_id, message_id, content, status, created_at) "
+            "VALUES (?, ?, ?, ?, 'queued', ?)",
+            (job_id, str(thread_id), str(uuid.uuid4()), content, time.time()),
+        )
+        metrics.inc("jobs_submitted")
+        with self._work_available:
+            self._submitted += 1
+            self._work_available.notify()
+        return job_id
+
+    def get(self, job_id):
+        """The job's row as a dict (result decoded), or None."""
+        rows = self._read(f"{SELECT_JOB_SQL} WHERE job_id = ?", (job_id,))
+        return _job_row(rows[0]) if rows else None
+
+    def events(self, job_id, after=0):
+        """
+        (progress events from index `after`, job) for a poller. The job is read
+        first, so once it shows a finished status the events are complete.
+        """
+        job = self.get(job_id)
+        with self._events_lock:
+            log = self._events.get(job_id, [])
+        return log[after:], job
+
+    def wait(self, job_id, timeout=None):
+        """Block until the job has finished (or timeout); returns the job."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return job
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return job
+            with self._job_finished:
+                self._job_finished.wait(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+
+    def active_jobs(self, thread_id):
+        """Ids of the thread's queued and running jobs, oldest first."""
+        rows = self._read(
+            "SELECT job_id FROM turn_jobs WHERE thread_id = ? AND status IN ('queued', 'running') "
+            "ORDER BY created_at, rowid",
+            (str(thread_id),),
+        )
+        return [row[0] for row in rows]
+
+    def cancel(self, job_id):
+        """Cancel a job that has not started yet. True if it was cancelled."""
+        rows = self._write(
+            "UPDATE turn_jobs SET status = 'cancelled', finished_at = ? WHERE job_id = ? AND status = 'queued' "
+            "RETURNING job_id",
+            (time.time(), job_id),
+        )
+        return bool(rows)
+
+    def stats(self):
+        """Job counts by status, and the number of worker threads."""
+        counts = dict(self._read("SELECT status, COUNT(*) FROM turn_jobs GROUP BY status"))
+        return {**{status: counts.get(status, 0) for status in (QUEUED, RUNNING, *FINISHED)},
+                "workers": len(self._threads)}
+
+    def claim(self):
+        """Mark the next runnable job as running on this process; None if there is none."""
+        now = time.time()
+        rows = self._write(CLAIM_SQL, (self.worker_id, now, now))
+        return _job_row(rows[0]) if rows else None
+
+    def heartbeat(self, job_id):
+        self._write("UPDATE turn_jobs SET heartbeat_at = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def finish(self, job_id, status, result=None, error=None):
+        self._write(
+            "UPDATE turn_jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE job_id = ?",
+            (status, time.time(), json.dumps(result) if result is not None else None, error, job_id),
+        )
+        metrics.inc("jobs", status=status)
+        with self._job_finished:
+            self._job_finished.notify_all()
+
+    def recover_stale(self):
+        """
+        Queue again the jobs whose worker is gone: its process on this host has
+        exited, or it stopped sending heartbeats. Jobs lost max_attempts times
+        fail instead. Returns the number requeued.
+        """
+        lost = [job_id for job_id, worker in self._read("SELECT job_id, worker FROM turn_jobs WHERE status = 'running'")
+                if not worker_alive(worker)]
+        stale = "status = 'running' AND (heartbeat_at < ? OR job_id IN (SELECT value FROM json_each(?)))"
+        params = (time.time() - self.lease_seconds, json.dumps(lost))
+        self._write(
+            f"UPDATE turn_jobs SET status = 'error', finished_at = ?, error = 'worker lost too many times' "
+            f"WHERE {stale} AND attempts >= ?",
+            (time.time(), *params, self.max_attempts),
+        )
+        return len(self._write(
+            f"UPDATE turn_jobs SET status = 'queued', worker = NULL WHERE {stale} RETURNING job_id", params
+        ))
+
+    def _recover_if_due(self):
+        with self._recovery_lock:
+            if time.monotonic() < self._next_recovery:
+                return
+            self._next_recovery = time.monotonic() + self.recovery_interval
+        try:
+            self.recover_stale()
+        except Exception as e:
+            metrics.error("job_recover", e, f"Error recovering stale jobs: {e}")
+
+    def _event_log(self, job_id):
+        with self._events_lock:
+            log = self._events.setdefault(job_id, [])
+            while len(self._events) > JOB_EVENTS_KEEP:
+                self._events.popitem(last=False)
+        return log
+
+    def execute(self, job):
+        """Run a claimed job and record its outcome."""
+        job_id = job["job_id"]
+        log = self._event_log(job_id)
+        last_heartbeat = [time.monotonic()]
+
+        def emit(event):
+            log.append(event)
+            if event["type"] != "token" or time.monotonic() - last_heartbeat[0] >= self.recovery_interval:
+                self.heartbeat(job_id)
+                last_heartbeat[0] = time.monotonic()
+
+        metrics.observe("job_wait_seconds", time.time() - job["created_at"])
+        try:
+            outcome = {"status": DONE, "result": self.run(job, emit)}
+        except Exception as e:
+            metrics.error("job", e, f"Error running job {job_id}: {e}")
+            outcome = {"status": ERROR, "error": str(e)}
+        try:
+            self.finish(job_id, **outcome)
+        except Exception as e:
+            # The worker lives on; the job stays running until its lease runs out and is then recovered
+            metrics.error("job_finish", e, f"Error recording the outcome of job {job_id}: {e}")
+
+    def _work(self):
+        while not self._stopping:
+            self._recover_if_due()
+            try:
+                job = self.claim()
+            except Exception as e:
+                metrics.error("job_claim", e, f"Error claiming a job: {e}")
+                job = None
+            if job is not None:
+                self.execute(job)
+                continue
+            with self._work_available:
+                if not self._submitted and not self._stopping:
+                    self._work_available.wait(self.poll_interval)
+                self._submitted = max(self._submitted - 1, 0)
+
+    def start(self):
+        """Queue again jobs left by dead processes and start the workers. Idempotent."""
+        if self._threads:
+            return self
+        self._stopping = False
+        self._next_recovery = 0.0
+        self._recover_if_due()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True) for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop the workers after their current job; queued jobs stay queued."""
+        self._stopping = True
+        with self._work_available:
+            self._work_available.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def collect(self):
+        """Queue depth samples for the metrics registry."""
+        stats = self.stats()
+        return [("jobs_" + status, "gauge", {}, stats[status]) for status in (QUEUED, RUNNING)] + [
+            ("job_workers", "gauge", {}, stats["workers"])
+        ]
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """The process-wide job queue, with its workers started on first use."""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                queue = JobQueue().start()
+                metrics.register_collector(queue.collect)
+                _job_queue = queue
+    return _job_queue
@@ -1,51 +1,105 @@
-from langgraph.graph import StateGraph, START, END
 from typing import TypedDict, Annotated
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage
-from langchain_groq import ChatGroq
-from langgraph.checkpoint.sqlite import SqliteSaver
-from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
-from langchain_community.tools import DuckDuckGoSearchRun
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage, ToolMessage
 from langchain_core.tools import tool
 from dotenv import load_dotenv
-import sqlite3
+import asyncio
 import os
-import requests
 import json
+import functools
 import random
+import uuid
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from tool_executor import ToolExecutor
+from tool_registry import ToolRegistry
+from tool_cache import cached_tool, tool_cache
+from tool_results import ToolResult, UNCACHEABLE_PREFIXES, combine, for_llm, is_mock, status_of
+from single_flight import single_flight
+import http_client
+from resilience import resilience
+from context_manager import build_prompt, compact_context, estimate_tokens
+from db_maintenance import DEFAULT_IDLE_DAYS, DEFAULT_KEEP_LAST, run_maintenance
+import intent_router
+from metrics import metrics
+from semantic_cache import SEMANTIC_CACHE_ENABLED, SemanticCache
+import threading
 
 load_dotenv()
 import time
 
-def safe_api_call(func, *args, **kwargs):
-    max_retries = 3
-    delay = 1
-    for attempt in range(max_retries):
-        try:
-            return func(*args, **kwargs)
-        except requests.HTTPError as e:
-            if e.response.status_code == 429:
-                if attempt == max_retries - 1:
-                    return "❌ Rate limit exceeded. Please try again later."
-                time.sleep(delay)
-                delay *= 2
-            else:
-                raise
-        except Exception:
-            if attempt == max_retries - 1:
-                raise
-            time.sleep(delay)
-            delay *= 2
+# =========================Lazy Application Objects======================
+# The LLM client, the search client, the checkpointer and the compiled graph
+# are built on first use, not at import, so importing this module (tests,
+# tools, Streamlit cold start) does not pay for langgraph, groq or the
+# database. Use the get_* factories below; module attributes such as
+# `chatbot` or `llm_with_tools` still work and assigning one replaces it.
+# monkeypatch.setattr reads the attribute first, which builds the real object;
+# tests patch these with monkeypatch.setitem(vars(backend), name, value).
+_MISSING = object()
+_lazy_lock = threading.RLock()
+
+def _lazy(name, build):
+    """Module global `name`, created by build() the first time it is needed."""
+    value = globals().get(name, _MISSING)
+    if value is _MISSING:
+        with _lazy_lock:
+            value = globals().get(name, _MISSING)
+            if value is _MISSING:
+                value = globals()[name] = build()
+    return value
 
 # =========================LLM Setup======================
-llm = ChatGroq(
-    model="llama-3.1-8b-instant",
-    temperature=0.7,
-)
+def _build_llm():
+    from langchain_groq import ChatGroq
+    return ChatGroq(
+        model="llama-3.1-8b-instant",
+        temperature=0.7,
+        streaming=True,
+    )
+
+def get_llm():
+    return _lazy("llm", _build_llm)
+
+def get_llm_with_tools():
+    return _lazy("llm_with_tools", lambda: get_llm().bind_tools(tools=tools))
 
 # =========================Tools Setup======================
+# Every tool is registered with its metadata (icon, cache TTL, concurrency,
+# timeout, cost class); ENABLED_TOOLS selects the subset bound to the LLM
+tool_registry = ToolRegistry()
+tool_executor = ToolExecutor()
+
+def apply_tool_settings(spec):
+    """Hand a tool's cache TTL, concurrency cap and timeout to the cache and executor."""
+    if spec.cache_ttl:
+        tool_cache.ttls[spec.name] = spec.cache_ttl
+    if spec.max_concurrency:
+        tool_executor.per_tool_limits[spec.name] = spec.max_concurrency
+    if spec.timeout:
+        tool_executor.per_tool_timeouts[spec.name] = spec.timeout
+
+def register_tool(tool, **metadata):
+    apply_tool_settings(tool_registry.register(tool, **metadata))
+    return tool
+
 # ========================DuckDuckGo Search Tool======================
-search_tool = DuckDuckGoSearchRun()
+def _build_search_client():
+    from langchain_community.tools import DuckDuckGoSearchRun
+    return DuckDuckGoSearchRun()
+
+def get_search_client():
+    return _lazy("search_client", _build_search_client)
+
+@tool
+def search_tool(query: str) -> str:
+    """
+    A wrapper around DuckDuckGo Search. Useful for when you need to answer questions about current events.
+    query (str): The search query to look up.
+    """
+    return get_search_client().invoke(query)
+
+register_tool(search_tool, icon="🔍", display_name="Web Search", max_concurrency=2, timeout=10,
+              cost_class="free", provider="duckduckgo")
 
 @tool
 def calculator_tool(first_num: float, second_num: float, operation: str) -> str:
@@ -56,117 +110,311 @@ def calculator_tool(first_num: float, second_num: float, operation: str) -> str:
     try:
         if operation == "add":
             result = first_num + second_num
-            return f"{first_num} + {second_num} = {result}"
+            return ToolResult(f"{first_num} + {second_num} = {result}", {"result": result})
         elif operation == "subtract":
             result = first_num - second_num
-            return f"{first_num} - {second_num} = {result}"
+            return ToolResult(f"{first_num} - {second_num} = {result}", {"result": result})
         elif operation == "multiply":
             result = first_num * second_num
-            return f"{first_num} × {second_num} = {result}"
+            return ToolResult(f"{first_num} × {second_num} = {result}", {"result": result})
         elif operation == "divide":
             if second_num == 0:
                 return "❌ Error: Division by zero is not allowed."
             result = first_num / second_num
-            return f"{first_num} ÷ {second_num} = {result}"
+            return ToolResult(f"{first_num} ÷ {second_num} = {result}", {"result": result})
         else:
             return f"❌ Error: Unsupported operation '{operation}'. Use: add, subtract, multiply, or divide."
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
+register_tool(calculator_tool, icon="🧮", display_name="Calculator", cost_class="local")
+
+# =========================Upstream Calls======================
+# Each network tool builds a request spec (url, params, parse, on_error), or
+# returns its answer directly (e.g. missing API key). The same spec is run by
+# the sync tool and by its native async variant, both under the provider's
+# rate limit and circuit breaker; on_error is the fallback when they refuse
+# or retries run out, and gives the tool's mock answer where it has one.
+# parse returns a ToolResult: the UI text plus the structured payload.
+def run_request(request) -> str:
+    """Fetch an upstream JSON API and turn the response into the tool's answer."""
+    if isinstance(request, str):
+        return request
+    try:
+        with metrics.span("http", host=urlsplit(request["url"]).hostname):
+            response = resilience.call(
+                request["url"], lambda: http_client.get(request["url"], params=request.get("params"))
+            )
+        return request["parse"](json.loads(response.text))
+    except Exception as e:
+        return request["on_error"](e)
+
+async def arun_request(request) -> str:
+    """Async variant of run_request using the pooled async HTTP client."""
+    if isinstance(request, str):
+        return request
+    try:
+        with metrics.span("http", host=urlsplit(request["url"]).hostname):
+            response = await resilience.acall(
+                request["url"], lambda: http_client.aget(request["url"], params=request.get("params"))
+            )
+        return request["parse"](json.loads(response.text))
+    except Exception as e:
+        return request["on_error"](e)
+
+def add_async_variant(sync_tool, build_request):
+    """Attach a native coroutine to a tool so tool.ainvoke never blocks a thread."""
+    @functools.wraps(build_request)
+    async def coroutine(*args, **kwargs):
+        return await arun_request(build_request(*args, **kwargs))
+
+    # Tools that are never cached (e.g. jokes) must not be coalesced either:
+    # two concurrent callers should not get the same random joke
+    sync_tool.coroutine = cached_tool(sync_tool.name)(coroutine) if tool_cache.ttls.get(sync_tool.name) else coroutine
+    return sync_tool
+
+# =========================Batch Calls======================
+# Batch tools answer several items in one tool call. Items are fetched through
+# the per-item cached tools, so a batch shares cache entries and in-flight
+# requests with single calls; they run on their own small pool so a batch
+# running inside the tool executor never waits for a slot it is holding.
+MAX_BATCH_ITEMS = 10
+_batch_pool = ThreadPoolExecutor(max_workers=MAX_BATCH_ITEMS, thread_name_prefix="batch")
+
+def _batch_items(items):
+    """Upper-cased, de-duplicated items in order, or an error message."""
+    if isinstance(items, str):
+        items = items.split(",")
+    items = list(dict.fromkeys(item.strip().upper() for item in items if item and item.strip()))
+    if not items:
+        return "❌ Error: No items given."
+    if len(items) > MAX_BATCH_ITEMS:
+        return f"❌ Error: At most {MAX_BATCH_ITEMS} items per call."
+    return items
+
+def _join_batch(results):
+    # Identical lines (e.g. the same missing-key warning for every item) are shown once
+    return combine(results)
+
 # ========================Stock Price Tool======================
-@tool
-def get_stock_price(symbol: str) -> str:
-    """
-    Fetch the current stock price for a given symbol using Alpha Vantage API.
-    symbol (str): The stock symbol (e.g., 'AAPL', 'GOOGL', 'MSFT')
-    """
+MOCK_PRICES = {"AAPL": 195.50, "GOOGL": 142.80, "TSLA": 238.45, "MSFT": 380.25, "AMZN": 180.50}
+
+def _mock_stock_price(symbol):
+    price = MOCK_PRICES.get(symbol.upper(), 150.00)
+    return ToolResult(f"📈 {symbol.upper()}: ${price:.2f} (mock data)",
+                      {"symbol": symbol.upper(), "price": price, "mock": True})
+
+def _stock_price_request(symbol: str):
     api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
     if not api_key:
         return "⚠️ ALPHA_VANTAGE_API_KEY not configured. Using mock data."
-    
-    try:
-        url = "https://www.alphavantage.co/query"
-        params = {'function': 'GLOBAL_QUOTE', 'symbol': symbol.upper(), 'apikey': api_key}
-        response = requests.get(url, params=params, timeout=8)
-        data = response.json()
-        
+
+    def parse(data):
         if "Global Quote" in data and data["Global Quote"].get("05. price"):
             price = float(data["Global Quote"]["05. price"])
             change = data["Global Quote"].get("09. change", "N/A")
-            return f"📈 {symbol.upper()}: ${price:.2f} (Change: {change})"
+            return ToolResult(f"📈 {symbol.upper()}: ${price:.2f} (Change: {change})",
+                              {"symbol": symbol.upper(), "price": price, "change": change})
         else:
             # Fallback to mock data
-            mock_prices = {"AAPL": 195.50, "GOOGL": 142.80, "TSLA": 238.45, "MSFT": 380.25, "AMZN": 180.50}
-            price = mock_prices.get(symbol.upper(), 150.00)
-            return f"📈 {symbol.upper()}: ${price:.2f} (mock data)"
-    except Exception as e:
-        return f"❌ Error fetching stock price: {str(e)}"
+            return _mock_stock_price(symbol)
+
+    return {
+        "url": "https://www.alphavantage.co/query",
+        "params": {'function': 'GLOBAL_QUOTE', 'symbol': symbol.upper(), 'apikey': api_key},
+        "parse": parse,
+        "on_error": lambda e: _mock_stock_price(symbol),
+    }
 
-# ========================Weather Tool======================
 @tool
-def fetch_weather(city: str) -> str:
+@cached_tool("get_stock_price")
+def get_stock_price(symbol: str) -> str:
     """
-    Fetch the current weather for a given city using the WeatherAPI.
-    city (str): The name of the city (e.g., 'London', 'New York')
+    Fetch the current stock price for a given symbol using Alpha Vantage API.
+    symbol (str): The stock symbol (e.g., 'AAPL', 'GOOGL', 'MSFT')
+    """
+    return run_request(_stock_price_request(symbol))
+
+register_tool(get_stock_price, icon="📈", display_name="Stock Price", cache_ttl=30, max_concurrency=2, cost_class="quota")
+add_async_variant(get_stock_price, _stock_price_request)
+
+@tool
+def get_stock_prices(symbols: list[str]) -> str:
     """
+    Fetch current prices for several stock symbols in one call, e.g. to compare companies.
+    symbols (list[str]): Stock symbols (e.g., ['AAPL', 'MSFT', 'GOOGL']), at most 10.
+    """
+    symbols = _batch_items(symbols)
+    if isinstance(symbols, str):
+        return symbols
+    return _join_batch(_batch_pool.map(get_stock_price.func, symbols))
+
+async def _aget_stock_prices(symbols: list[str]) -> str:
+    symbols = _batch_items(symbols)
+    if isinstance(symbols, str):
+        return symbols
+    return _join_batch(await asyncio.gather(*(get_stock_price.coroutine(symbol) for symbol in symbols)))
+
+get_stock_prices.coroutine = _aget_stock_prices
+register_tool(get_stock_prices, icon="📈", display_name="Stock Prices", cost_class="quota")
+
+# ========================Weather Tool======================
+def _weather_result(icon, city, temp, condition, humidity, mock=False):
+    return ToolResult(
+        f"{icon} {city}: {temp}°C, {condition}, Humidity: {humidity}%",
+        {"city": city, "temp_c": temp, "condition": condition, "humidity": humidity, "mock": mock},
+    )
+
+MOCK_WEATHER = {
+    "london": ("🌤️", "London", 12, "Cloudy", 75),
+    "new york": ("☀️", "New York", 18, "Sunny", 60),
+    "tokyo": ("⛅", "Tokyo", 22, "Partly Cloudy", 65),
+}
+
+def _mock_weather(city):
+    icon, name, temp, condition, humidity = MOCK_WEATHER.get(city.lower(), ("🌤️", city.title(), 20, "Clear", 70))
+    return _weather_result(icon, name, temp, condition, humidity, mock=True)
+
+def _weather_request(city: str):
     api_key = os.getenv("WEATHER_API_KEY")
     if not api_key:
         return "⚠️ WEATHER_API_KEY not configured. Using mock data."
-    
-    try:
-        url = f"http://api.weatherapi.com/v1/current.json?key={api_key}&q={city}"
-        r = requests.get(url, timeout=8)
-        data = json.loads(r.text)
-        
+
+    def parse(data):
         if "error" in data:
             # Fallback to mock data
-            mock_weather = {
-                "london": "🌤️ London: 12°C, Cloudy, Humidity: 75%",
-                "new york": "☀️ New York: 18°C, Sunny, Humidity: 60%",
-                "tokyo": "⛅ Tokyo: 22°C, Partly Cloudy, Humidity: 65%"
-            }
-            return mock_weather.get(city.lower(), f"🌤️ {city.title()}: 20°C, Clear, Humidity: 70%")
-        
+            return _mock_weather(city)
+
         temp = data["current"]["temp_c"]
         condition = data["current"]["condition"]["text"]
         humidity = data["current"]["humidity"]
-        return f"🌤️ {city.title()}: {temp}°C, {condition}, Humidity: {humidity}%"
-    except Exception as e:
-        return f"❌ Error fetching weather: {str(e)}"
+        return _weather_result("🌤️", city.title(), temp, condition, humidity)
+
+    return {
+        "url": f"http://api.weatherapi.com/v1/current.json?key={api_key}&q={city}",
+        "parse": parse,
+        "on_error": lambda e: _mock_weather(city),
+    }
 
-# ========================News Tool======================
 @tool
-def fetch_news(topic: str) -> str:
+@cached_tool("fetch_weather")
+def fetch_weather(city: str) -> str:
     """
-    Fetch latest news headlines on a given topic.
-    topic (str): The news topic (e.g., 'technology', 'sports').
+    Fetch the current weather for a given city using the WeatherAPI.
+    city (str): The name of the city (e.g., 'London', 'New York')
     """
+    return run_request(_weather_request(city))
+
+register_tool(fetch_weather, icon="🌤️", display_name="Weather", cache_ttl=10 * 60, cost_class="quota")
+add_async_variant(fetch_weather, _weather_request)
+
+# ========================News Tool======================
+def _news_result(topic, headlines, mock=False):
+    return ToolResult(
+        f"📰 Latest {topic.title()} News:\n" + "\n".join(f"• {headline}" for headline in headlines),
+        {"topic": topic, "headlines": headlines, "mock": mock},
+    )
+
+MOCK_NEWS = {
+    "technology": ["AI Models Reach New Capabilities", "Tech Giants Invest in Quantum Computing"],
+    "business": ["Stock Markets Show Growth", "Major Companies Report Earnings"],
+    "sports": ["Championship Teams Advance", "Record Breaking Performances"]
+}
+
+def _mock_news(topic):
+    return _news_result(topic, MOCK_NEWS.get(topic.lower(), ["Latest news updates"]), mock=True)
+
+def _news_request(topic: str):
     api_key = os.getenv("NEWS_API_KEY")
     if not api_key:
         return "⚠️ NEWS_API_KEY not configured. Using mock data."
-    
-    try:
-        url = f"https://newsapi.org/v2/everything?q={topic}&apiKey={api_key}&pageSize=5&sortBy=publishedAt"
-        r = requests.get(url, timeout=8)
-        data = json.loads(r.text)
-        
+
+    def parse(data):
         if "articles" in data and data["articles"]:
-            headlines = [f"• {article['title']}" for article in data["articles"][:5]]
-            return f"📰 Latest {topic.title()} News:\n" + "\n".join(headlines)
+            return _news_result(topic, [article["title"] for article in data["articles"][:5]])
         else:
             # Mock data fallback
-            mock_news = {
-                "technology": ["• AI Models Reach New Capabilities", "• Tech Giants Invest in Quantum Computing"],
-                "business": ["• Stock Markets Show Growth", "• Major Companies Report Earnings"],
-                "sports": ["• Championship Teams Advance", "• Record Breaking Performances"]
-            }
-            headlines = mock_news.get(topic.lower(), ["• Latest news updates"])
-            return f"📰 Latest {topic.title()} News:\n" + "\n".join(headlines)
-    except Exception as e:
-        return f"❌ Error fetching news: {str(e)}"
+            return _mock_news(topic)
+
+    return {
+        "url": f"https://newsapi.org/v2/everything?q={topic}&apiKey={api_key}&pageSize=5&sortBy=publishedAt",
+        "parse": parse,
+        "on_error": lambda e: _mock_news(topic),
+    }
+
+@tool
+@cached_tool("fetch_news")
+def fetch_news(topic: str) -> str:
+    """
+    Fetch latest news headlines on a given topic.
+    topic (str): The news topic (e.g., 'technology', 'sports').
+    """
+    return run_request(_news_request(topic))
+
+register_tool(fetch_news, icon="📰", display_name="News", cache_ttl=15 * 60, cost_class="quota")
+add_async_variant(fetch_news, _news_request)
 
 # ========================Currency Converter Tool======================
+MOCK_RATES = {("USD", "EUR"): 0.92, ("USD", "GBP"): 0.79, ("EUR", "USD"): 1.09}
+
+def _exchange_rates_request():
+    api_key = os.getenv("EXCHANGE_API_KEY")
+    if not api_key:
+        return "⚠️ EXCHANGE_API_KEY not configured. Using mock rates."
+
+    return {
+        "url": f"https://openexchangerates.org/api/latest.json?app_id={api_key}",
+        "parse": lambda data: json.dumps(data.get("rates", {})),
+        # An empty table prices conversions from MOCK_RATES; marked mock so it is not cached
+        "on_error": lambda e: ToolResult("{}", {"mock": True}),
+    }
+
+# The whole rate table is one cached entry, so any number of conversions
+# (single or batched) cost at most one upstream request per TTL
+@cached_tool("exchange_rates")
+def _exchange_rates() -> str:
+    return run_request(_exchange_rates_request())
+
+@cached_tool("exchange_rates")
+async def _aexchange_rates() -> str:
+    return await arun_request(_exchange_rates_request())
+
+def _convert(amount, from_currency, to_currency, rates):
+    from_curr = from_currency.upper()
+    to_curr = to_currency.upper()
+    mock = not rates
+    if mock:
+        # Mock rates fallback
+        rate = MOCK_RATES.get((from_curr, to_curr), 1.0)
+    else:
+        try:
+            rate = rates[to_curr] / rates[from_curr]
+        except KeyError as e:
+            return f"❌ Error converting currency: {str(e)}"
+    converted = round(amount * rate, 2)
+    return ToolResult(
+        f"💱 {amount} {from_curr} = {amount * rate:.2f} {to_curr}" + (" (mock rate)" if mock else ""),
+        {"amount": amount, "from": from_curr, "to": to_curr, "result": converted, "mock": mock},
+    )
+
+def _conversions(amount, pairs, table):
+    """One line per (from, to) pair, all priced from the same rate table."""
+    if table.startswith(UNCACHEABLE_PREFIXES):
+        return table
+    rates = json.loads(table)
+    results = [_convert(amount, from_curr, to_curr, rates) for from_curr, to_curr in pairs]
+    return results[0] if len(results) == 1 else combine(results)
+
+def _currency_pairs(from_currencies, to_currencies):
+    from_currencies = _batch_items(from_currencies)
+    to_currencies = _batch_items(to_currencies)
+    for items in (from_currencies, to_currencies):
+        if isinstance(items, str):
+            return items
+    return [(f, t) for f in from_currencies for t in to_currencies if f != t] or "❌ Error: Nothing to convert."
+
 @tool
+@cached_tool("convert_currency")
 def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
     """
     Convert an amount from one currency to another.
@@ -174,224 +422,736 @@ def convert_currency(amount: float, from_currency: str, to_currency: str) -> str
     from_currency (str): Source currency (e.g., 'USD').
     to_currency (str): Target currency (e.g., 'EUR').
     """
-    api_key = os.getenv("EXCHANGE_API_KEY")
-    if not api_key:
-        return "⚠️ EXCHANGE_API_KEY not configured. Using mock rates."
-    
-    try:
-        url = f"https://openexchangerates.org/api/latest.json?app_id={api_key}"
-        r = requests.get(url, timeout=8)
-        data = json.loads(r.text)
-        
-        if "rates" in data:
-            from_curr = from_currency.upper()
-            to_curr = to_currency.upper()
-            rate = data["rates"][to_curr] / data["rates"][from_curr]
-            result = amount * rate
-            return f"💱 {amount} {from_curr} = {result:.2f} {to_curr}"
-        else:
-            # Mock rates fallback
-            mock_rates = {("USD", "EUR"): 0.92, ("USD", "GBP"): 0.79, ("EUR", "USD"): 1.09}
-            rate = mock_rates.get((from_currency.upper(), to_currency.upper()), 1.0)
-            result = amount * rate
-            return f"💱 {amount} {from_currency.upper()} = {result:.2f} {to_currency.upper()} (mock rate)"
-    except Exception as e:
-        return f"❌ Error converting currency: {str(e)}"
+    return _conversions(amount, [(from_currency, to_currency)], _exchange_rates())
+
+@cached_tool("convert_currency")
+async def _aconvert_currency(amount: float, from_currency: str, to_currency: str) -> str:
+    return _conversions(amount, [(from_currency, to_currency)], await _aexchange_rates())
+
+convert_currency.coroutine = _aconvert_currency
+register_tool(convert_currency, icon="💱", display_name="Currency Converter", cache_ttl=5 * 60, cost_class="quota")
+
+@tool
+def convert_currencies(amount: float, from_currencies: list[str], to_currencies: list[str]) -> str:
+    """
+    Convert an amount between several currencies at once (every source to every target).
+    amount (float): The amount to convert.
+    from_currencies (list[str]): Source currencies (e.g., ['USD']).
+    to_currencies (list[str]): Target currencies (e.g., ['EUR', 'GBP', 'JPY']).
+    """
+    pairs = _currency_pairs(from_currencies, to_currencies)
+    if isinstance(pairs, str):
+        return pairs
+    return _conversions(amount, pairs, _exchange_rates())
+
+async def _aconvert_currencies(amount: float, from_currencies: list[str], to_currencies: list[str]) -> str:
+    pairs = _currency_pairs(from_currencies, to_currencies)
+    if isinstance(pairs, str):
+        return pairs
+    return _conversions(amount, pairs, await _aexchange_rates())
+
+convert_currencies.coroutine = _aconvert_currencies
+register_tool(convert_currencies, icon="💱", display_name="Currency Converter", cost_class="quota")
 
 # ========================Joke Tool======================
+MAX_JOKES_PER_REQUEST = 10  # JokeAPI's limit for the amount parameter
+FALLBACK_JOKES = [
+    "Why don't scientists trust atoms? Because they make up everything!",
+    "What did the ocean say to the beach? Nothing, it just waved!",
+    "Why don't eggs tell jokes? They'd crack each other up!",
+]
+
+def _joke_text(data):
+    if "joke" in data and data["joke"]:
+        return data["joke"]
+    elif "setup" in data and "delivery" in data:
+        return f"{data['setup']}\n\n{data['delivery']}"
+    else:
+        return random.choice(FALLBACK_JOKES)
+
+def _joke_result(joke):
+    return ToolResult(f"😂 {joke}", {"joke": joke})
+
+def _format_joke(data):
+    return _joke_result(_joke_text(data))
+
+def _joke_request(category: str = "Any"):
+    return {
+        "url": f"https://v2.jokeapi.dev/joke/{category}?type=single",
+        "parse": _format_joke,
+        "on_error": lambda e: _joke_result("Why don't programmers like nature? It has too many bugs!"),
+    }
+
 @tool
 def get_joke(category: str = "Any") -> str:
     """
     Fetch a random joke from a category.
     category (str): Joke category (e.g., 'Programming', 'Pun', 'Misc', 'Any'). Default: 'Any'.
     """
-    try:
-        url = f"https://v2.jokeapi.dev/joke/{category}?type=single"
-        r = requests.get(url, timeout=8)
-        data = json.loads(r.text)
-        
-        if "joke" in data and data["joke"]:
-            return f"😂 {data['joke']}"
-        elif "setup" in data and "delivery" in data:
-            return f"😂 {data['setup']}\n\n{data['delivery']}"
-        else:
-            # Fallback jokes
-            fallback_jokes = [
-                "Why don't scientists trust atoms? Because they make up everything!",
-                "What did the ocean say to the beach? Nothing, it just waved!",
-                "Why don't eggs tell jokes? They'd crack each other up!"
-            ]
-            return f"😂 {random.choice(fallback_jokes)}"
-    except Exception as e:
-        return f"😂 Why don't programmers like nature? It has too many bugs!"
+    return run_request(_joke_request(category))
+
+register_tool(get_joke, icon="😂", display_name="Joke", max_concurrency=5, cost_class="free")
+add_async_variant(get_joke, _joke_request)
+
+def _jokes_result(jokes):
+    return ToolResult("\n\n".join(f"😂 {joke}" for joke in jokes), {"jokes": jokes})
+
+def _jokes_request(count: int = 3, category: str = "Any"):
+    count = max(1, min(int(count), MAX_JOKES_PER_REQUEST))
+
+    def parse(data):
+        # amount=1 answers with a single joke object, larger amounts with a list
+        jokes = data.get("jokes") or [data]
+        return _jokes_result([_joke_text(joke) for joke in jokes[:count]])
+
+    return {
+        "url": f"https://v2.jokeapi.dev/joke/{category}?type=single&amount={count}",
+        "parse": parse,
+        "on_error": lambda e: _jokes_result(random.sample(FALLBACK_JOKES, min(count, len(FALLBACK_JOKES)))),
+    }
 
-# ========================NASA APOD Tool======================
 @tool
-def get_nasa_apod() -> str:
+def get_jokes(count: int = 3, category: str = "Any") -> str:
     """
-    Fetch NASA's Astronomy Picture of the Day (APOD).
+    Fetch several different jokes in one call.
+    count (int): How many jokes (1-10). Default: 3.
+    category (str): Joke category (e.g., 'Programming', 'Pun', 'Misc', 'Any'). Default: 'Any'.
     """
+    return run_request(_jokes_request(count, category))
+
+register_tool(get_jokes, icon="😂", display_name="Jokes", cost_class="free")
+add_async_variant(get_jokes, _jokes_request)
+
+# ========================NASA APOD Tool======================
+def _mock_apod():
+    title = "Pillars of Creation"
+    explanation = "The iconic Pillars of Creation are elephant-like stellar nurseries in the Eagle Nebula, showcasing the beauty of star formation."
+    return ToolResult(f"🌌 **{title}**\n\n{explanation}", {"title": title, "explanation": explanation, "mock": True})
+
+def _nasa_apod_request():
     api_key = os.getenv("NASA_API_KEY")
     if not api_key:
         return "⚠️ NASA_API_KEY not configured. Please add it to your .env file to use this feature.\n\nGet your free API key at: https://api.nasa.gov"
-    
-    try:
-        url = f"https://api.nasa.gov/planetary/apod?api_key={api_key}"
-        r = requests.get(url, timeout=8)
-        data = json.loads(r.text)
-        
+
+    def parse(data):
         if "error" not in data:
             title = data.get("title", "Astronomy Picture")
             explanation = data.get("explanation", "")[:250]
             image_url = data.get("url", "")
-            return f"🌌 **{title}**\n\n{explanation}...\n\n🖼️ Image: {image_url}"
+            return ToolResult(f"🌌 **{title}**\n\n{explanation}...\n\n🖼️ Image: {image_url}",
+                              {"title": title, "explanation": explanation, "image": image_url})
         else:
-            return "🌌 **Pillars of Creation**\n\nThe iconic Pillars of Creation are elephant-like stellar nurseries in the Eagle Nebula, showcasing the beauty of star formation."
-    except Exception as e:
-        return f"❌ Error fetching NASA APOD: {str(e)}"
+            return _mock_apod()
+
+    return {
+        "url": f"https://api.nasa.gov/planetary/apod?api_key={api_key}",
+        "parse": parse,
+        "on_error": lambda e: _mock_apod(),
+    }
 
-# ========================IP Location Tool======================
 @tool
-def get_ip_location(ip: str) -> str:
+@cached_tool("get_nasa_apod")
+def get_nasa_apod() -> str:
     """
-    Fetch location info for a given IP address.
-    ip (str): The IP address (e.g., '8.8.8.8').
+    Fetch NASA's Astronomy Picture of the Day (APOD).
     """
-    try:
-        url = f"https://ipapi.co/{ip}/json/"
-        r = requests.get(url, timeout=8)
-        data = json.loads(r.text)
-        
+    return run_request(_nasa_apod_request())
+
+register_tool(get_nasa_apod, icon="🌌", display_name="NASA APOD", cache_ttl=24 * 60 * 60, cost_class="quota")
+add_async_variant(get_nasa_apod, _nasa_apod_request)
+
+# ========================IP Location Tool======================
+def _ip_location_request(ip: str):
+    def parse(data):
         if "error" not in data:
             city = data.get("city", "Unknown")
             country = data.get("country_name", "Unknown")
             region = data.get("region", "")
             lat = data.get("latitude", "N/A")
             lon = data.get("longitude", "N/A")
-            
+
             location = f"{city}, {region}, {country}" if region else f"{city}, {country}"
-            return f"🌐 IP: {ip}\n📍 Location: {location}\n🗺️ Coordinates: {lat}, {lon}"
+            return ToolResult(f"🌐 IP: {ip}\n📍 Location: {location}\n🗺️ Coordinates: {lat}, {lon}",
+                              {"location": location, "lat": lat, "lon": lon})
         else:
             return f"❌ Error: {data.get('reason', 'Unknown error')}"
-    except Exception as e:
-        return f"❌ Error fetching IP location: {str(e)}"
 
-tools = [search_tool, calculator_tool, get_stock_price, fetch_weather, fetch_news, convert_currency, get_joke, get_nasa_apod, get_ip_location]
-llm_with_tools = llm.bind_tools(tools=tools)
+    return {
+        "url": f"https://ipapi.co/{ip}/json/",
+        "parse": parse,
+        "on_error": lambda e: f"❌ Error fetching IP location: {str(e)}",
+    }
+
+@tool
+@cached_tool("get_ip_location")
+def get_ip_location(ip: str) -> str:
+    """
+    Fetch location info for a given IP address.
+    ip (str): The IP address (e.g., '8.8.8.8').
+    """
+    return run_request(_ip_location_request(ip))
+
+register_tool(get_ip_location, icon="🌐", display_name="IP Location", cache_ttl=3 * 24 * 60 * 60, cost_class="free")
+add_async_variant(get_ip_location, _ip_location_request)
+
+# Tools whose successful output is already a user-ready answer; the turn ends
+# after them instead of asking the LLM to restate the result
+FINAL_OUTPUT_TOOLS = {
+    name.strip() for name in os.getenv(
+        "FINAL_OUTPUT_TOOLS", "calculator_tool,get_joke,get_jokes,fetch_weather,convert_currency,convert_currencies"
+    ).split(",") if name.strip()
+}
+
+# Tools from installed "chatbot.tools" entry points and TOOL_PLUGINS
+tool_registry.load_plugins()
+for spec in tool_registry.specs():
+    apply_tool_settings(spec)
+
+# The enabled tools, in registration order: the schema bound to the LLM
+tools = tool_registry.tools()
+
+# Optional cache of LLM replies to repeated standalone questions (SEMANTIC_CACHE_ENABLED=1)
+semantic_cache = SemanticCache() if SEMANTIC_CACHE_ENABLED else None
 
 # =========================State===========================
-class ChatState(TypedDict):
-    messages: Annotated[list[BaseMessage], add_messages]
+# The add_messages reducer lives in langgraph, so the state schema is built
+# with the graph; node annotations refer to it by name ("ChatState").
+def _build_chat_state():
+    from langgraph.graph.message import add_messages
+
+    class ChatState(TypedDict):
+        messages: Annotated[list[BaseMessage], add_messages]
+        # Rolling summary of turns that fell out of the LLM context window
+        context_summary: str
+        # Number of leading messages already folded into context_summary
+        summarized_count: int
+
+    return ChatState
+
+def get_chat_state():
+    return _lazy("ChatState", _build_chat_state)
 
 # =========================Graph Node Definition======================
-def chat_node(state: ChatState) -> dict:
+@metrics.timed("node", node="context_node")
+def context_node(state: "ChatState") -> dict:
+    """Keep the LLM prompt within budget by folding old turns into the summary."""
+    summary = state.get("context_summary", "")
+    summarized_count = state.get("summarized_count", 0)
+    new_summary, new_count = compact_context(state["messages"], summary, summarized_count)
+    if new_count == summarized_count:
+        return {}
+    return {"context_summary": new_summary, "summarized_count": new_count}
+
+def shortcut_reply(state: "ChatState"):
+    """Answer routed intents and cached replies without the LLM. Returns None otherwise."""
+    last_message = state["messages"][-1]
+    # Only fresh user input is routed; tool results always go back to the LLM
+    if not isinstance(last_message, HumanMessage):
+        return None
+    message = intent_router.route(last_message.content)
+    # A routed call to a tool this deployment does not enable goes to the LLM instead
+    if message is not None and not all(tool_registry.is_enabled(call["name"]) for call in message.tool_calls):
+        message = None
+    if message is not None:
+        metrics.inc("shortcut_replies", source="intent_router")
+        return {"messages": [message]}
+    message = cached_llm_reply(last_message.content)
+    if message is not None:
+        metrics.inc("shortcut_replies", source="semantic_cache")
+        return {"messages": [message]}
+    return None
+
+def cached_llm_reply(user_text: str):
+    """The LLM's earlier reply to a near-identical standalone question, with fresh tool call ids."""
+    if semantic_cache is None:
+        return None
+    hit = semantic_cache.get(user_text)
+    if hit is None:
+        return None
+    content, tool_calls = hit[0]
+    return AIMessage(content=content, tool_calls=[
+        {**tool_call, "id": f"{tool_call['name']}_{uuid.uuid4().hex[:8]}"} for tool_call in tool_calls
+    ])
+
+def remember_llm_reply(state: "ChatState", response) -> None:
+    """
+    Cache the LLM's reply to the first message of a thread. Later replies may
+    depend on the conversation, and replies to tool results are never cached.
+    """
+    messages = state["messages"]
+    if semantic_cache is None or len(messages) != 1 or not isinstance(messages[0], HumanMessage):
+        return
+    if not isinstance(response, AIMessage) or response.invalid_tool_calls or not (response.content or response.tool_calls):
+        return
+    tool_calls = [{"name": call["name"], "args": call["args"], "type": "tool_call"} for call in response.tool_calls]
+    semantic_cache.set(messages[0].content, (response.content, tool_calls))
+
+def chat_prompt(state: "ChatState") -> list:
+    return build_prompt(state["messages"], state.get("context_summary", ""), state.get("summarized_count", 0))
+
+def record_llm_usage(prompt: list, response, span: dict) -> None:
+    """Count an LLM call's tokens: the provider's usage when it reports one, else an estimate."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        source, input_tokens, output_tokens = "provider", usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    else:
+        source = "estimate"
+        input_tokens = sum(estimate_tokens(message) for message in prompt)
+        output_tokens = estimate_tokens(response)
+    metrics.inc("llm_tokens", input_tokens, direction="input", source=source)
+    metrics.inc("llm_tokens", output_tokens, direction="output", source=source)
+    span.update(input_tokens=input_tokens, output_tokens=output_tokens, tool_calls=len(response.tool_calls or []))
+
+@metrics.timed("node", node="chat_node")
+def chat_node(state: "ChatState") -> dict:
     """LLM node that handles conversation or requests a tool call."""
+    metrics.iteration()
     try:
-        last_message = state["messages"][-1].content.lower()
-        # Handle casual conversation
-        if "how are you" in last_message or "hey" in last_message:
-            return {"messages": [AIMessage(content="Hey there! I'm ready to help. What's on your mind?")]}
-        # Handle single joke request
-        elif "tell me a joke" in last_message or "another joke" in last_message:
-            return {"messages": [AIMessage(content="", tool_calls=[{"name": "get_joke", "args": {"category": "Any"}, "id": "joke_call"}])]}
-        # Handle multiple joke requests (e.g., "tell me 4 jokes")
-        elif "joke" in last_message and any(num in last_message for num in ["1", "2", "3", "4", "5"]):
-            try:
-                num_jokes = int(next(num for num in ["1", "2", "3", "4", "5"] if num in last_message))
-                tool_calls = [
-                    {"name": "get_joke", "args": {"category": random.choice(["Any", "Programming", "Pun", "Misc"])}, "id": f"joke_call_{i}"}
-                    for i in range(num_jokes)
-                ]
-                return {"messages": [AIMessage(content="", tool_calls=tool_calls)]}
-            except:
-                return {"messages": [AIMessage(content="", tool_calls=[{"name": "get_joke", "args": {"category": "Any"}, "id": "joke_call"}])]}
-        else:
-            response = llm_with_tools.invoke(state["messages"])
-            return {"messages": [response]}
+        shortcut = shortcut_reply(state)
+        if shortcut is not None:
+            return shortcut
+        prompt = chat_prompt(state)
+        with metrics.span("llm_call") as span:
+            response = get_llm_with_tools().invoke(prompt)
+            record_llm_usage(prompt, response, span)
+        remember_llm_reply(state, response)
+        return {"messages": [response]}
     except Exception as e:
-        print(f"Error in chat_node: {str(e)}")
+        metrics.error("chat_node", e)
         return {"messages": [SystemMessage(content="Sorry, I hit an error. Please try again.")]}
 
-def custom_tools_node(state: ChatState) -> dict:
+def unknown_tool_result(tool_name: str) -> str:
+    return f"❌ Error: Unknown tool '{tool_name}'. Available tools: {', '.join(tool_registry.names())}"
+
+def normalize_tool_result(result):
+    """Convert a tool result to a string (a ToolResult keeping the payload) if it's a dict."""
+    if isinstance(result, dict):
+        if "joke" in result:
+            result = result["joke"]
+        elif "error" in result:
+            result = f"❌ Error: {result['error']}"
+        else:
+            result = ToolResult(json.dumps(result), result)
+    return result
+
+def _invoke_tool_call(tool_call):
+    """Execute a single tool call and normalize its result to a string."""
+    spec = tool_registry.get(tool_call["name"])
+    if spec is None:
+        return unknown_tool_result(tool_call["name"])
+    with metrics.span("tool", tool=spec.name) as span:
+        # Tools whose client does its own HTTP are guarded as a whole by provider name
+        if spec.provider:
+            result = normalize_tool_result(resilience.guard(spec.provider, spec.tool.invoke, tool_call["args"]))
+        else:
+            result = normalize_tool_result(spec.tool.invoke(tool_call["args"]))
+        span["status"] = status_of(result)
+    return result
+
+_llm_savings = {"llm_calls_saved": 0, "tools": {}}
+_llm_savings_lock = threading.Lock()
+
+def final_answer(tool_calls, results):
+    """
+    The combined answer when every call of the turn went to a final-output tool
+    and succeeded with real data, or None when the LLM should see the results first.
+    """
+    if not tool_calls or any(tool_call["name"] not in FINAL_OUTPUT_TOOLS for tool_call in tool_calls):
+        return None
+    if any(status_of(result) != "success" or is_mock(result) for result in results):
+        return None
+    return "\n\n".join(map(str, results))
+
+def tool_message(tool_call, result) -> ToolMessage:
+    """
+    The ToolMessage answering tool_call. The LLM reads the compact rendering of
+    the payload; the UI text and the payload itself travel in the artifact.
+    """
+    return ToolMessage(
+        content=for_llm(result, tool_call.get("args")),
+        tool_call_id=tool_call["id"],
+        name=tool_call["name"],
+        status="error" if status_of(result) == "error" else "success",
+        artifact={"display": str(result), "data": getattr(result, "data", None)},
+    )
+
+def tool_display(message) -> str:
+    """The user-facing text of a tool result message."""
+    artifact = getattr(message, "artifact", None)
+    if isinstance(artifact, dict) and artifact.get("display"):
+        return artifact["display"]
+    return message.content
+
+def tool_messages(tool_calls, results) -> dict:
+    # Every tool_call needs its ToolMessage, or the provider rejects the thread's next request
+    results = [
+        ToolResult(f"❌ Error: {tool_call['name']} returned no result.") if result is None else result
+        for tool_call, result in zip(tool_calls, results)
+    ]
+    messages = [tool_message(tool_call, result) for tool_call, result in zip(tool_calls, results)]
+    answer = final_answer(tool_calls, results)
+    if answer is not None:
+        # An AIMessage after the tool results ends the turn (see route_after_tools)
+        messages.append(AIMessage(content=answer))
+        with _llm_savings_lock:
+            _llm_savings["llm_calls_saved"] += 1
+            for name in dict.fromkeys(tool_call["name"] for tool_call in tool_calls):
+                _llm_savings["tools"][name] = _llm_savings["tools"].get(name, 0) + 1
+    return {"messages": messages}
+
+@metrics.timed("node", node="tools_node")
+def custom_tools_node(state: "ChatState") -> dict:
     """Custom tools node to handle tool call results cleanly."""
     messages = state["messages"]
     last_message = messages[-1]
     if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-        tool_results = []
-        for tool_call in last_message.tool_calls:
-            tool_name = tool_call["name"]
-            tool_args = tool_call["args"]
-            tool_id = tool_call["id"]
-            # Find and execute the tool
-            for tool in tools:
-                if tool.name == tool_name:
-                    result = tool.invoke(tool_args)
-                    # Convert result to string if it's a dict
-                    if isinstance(result, dict):
-                        if "joke" in result:
-                            result = result["joke"]
-                        elif "error" in result:
-                            result = f"Error: {result['error']}"
-                        else:
-                            result = json.dumps(result)
-                    tool_results.append(AIMessage(content=result, tool_call_id=tool_id))
-        return {"messages": tool_results}
+        # Run all tool calls of this turn concurrently; results keep tool_call order
+        results = tool_executor.run(last_message.tool_calls, _invoke_tool_call)
+        return tool_messages(last_message.tool_calls, results)
     return {"messages": []}
 
 # =========================Database Setup======================
-conn = sqlite3.connect(database="chatbot.db", check_same_thread=False)
-checkpointer = SqliteSaver(conn=conn)
+def _build_db_pool():
+    from storage import DB_PATH, ConnectionPool
+    # Each thread gets its own tuned connection (WAL, busy_timeout, mmap)
+    return ConnectionPool(DB_PATH)
 
-# =========================Graph Definition======================
-graph = StateGraph(ChatState)
-graph.add_node("chat_node", chat_node)
-graph.add_node("tools_node", custom_tools_node)
+def _build_checkpointer():
+    from storage import PooledSqliteSaver
+    return PooledSqliteSaver(get_db_pool())
 
-graph.add_edge(START, "chat_node")
+def get_db_pool():
+    return _lazy("db_pool", _build_db_pool)
 
-def route_tools(state: ChatState):
+def get_checkpointer():
+    return _lazy("checkpointer", _build_checkpointer)
+
+# =========================Graph Definition======================
+def route_tools(state: "ChatState"):
     messages = state["messages"]
     last_message = messages[-1]
     if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
         return "tools_node"
     return "__end__"
 
-graph.add_conditional_edges(
-    "chat_node",
-    route_tools,
-    {
-        "tools_node": "tools_node",
-        "__end__": END,
-    }
-)
+def route_after_tools(state: "ChatState"):
+    last_message = state["messages"][-1]
+    # Tool results are ToolMessages; an AIMessage here is the combined final answer
+    if isinstance(last_message, AIMessage) and not last_message.tool_calls:
+        return "__end__"
+    return "context_node"
+
+def build_graph(chat, tools_node):
+    """Wire the chat/tools loop; the sync and async apps differ only in their nodes."""
+    from langgraph.graph import StateGraph, START, END
+
+    graph = StateGraph(get_chat_state())
+    graph.add_node("context_node", context_node)
+    graph.add_node("chat_node", chat)
+    graph.add_node("tools_node", tools_node)
+
+    graph.add_edge(START, "context_node")
+    graph.add_edge("context_node", "chat_node")
+
+    graph.add_conditional_edges(
+        "chat_node",
+        route_tools,
+        {
+            "tools_node": "tools_node",
+            "__end__": END,
+        }
+    )
+
+    graph.add_conditional_edges(
+        "tools_node",
+        route_after_tools,
+        {
+            "context_node": "context_node",
+            "__end__": END,
+        }
+    )
+    return graph
+
+def get_graph():
+    return _lazy("graph", lambda: build_graph(chat_node, custom_tools_node))
+
+def get_chatbot():
+    """The compiled graph with the SQLite checkpointer, built on first use."""
+    return _lazy("chatbot", lambda: get_graph().compile(checkpointer=get_checkpointer()))
+
+_LAZY_ATTRIBUTES = {
+    "llm": get_llm,
+    "llm_with_tools": get_llm_with_tools,
+    "search_client": get_search_client,
+    "ChatState": get_chat_state,
+    "db_pool": get_db_pool,
+    "checkpointer": get_checkpointer,
+    "graph": get_graph,
+    "chatbot": get_chatbot,
+}
+
+def __getattr__(name):
+    # Only called for names not (yet) in the module globals
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# =========================Turn Submission======================
+def make_config(thread_id: str) -> dict:
+    """Graph config for a conversation thread."""
+    return {"configurable": {"thread_id": thread_id}, "recursion_limit": 50}
+
+def filter_new_messages(existing: list, incoming: list) -> list:
+    """
+    Drop incoming messages that are already part of the thread's history.
+    Messages with an id are matched by id. Id-less messages are only dropped when
+    the client resent the whole stored user/assistant conversation ahead of its
+    new messages; a message is never dropped just because its text was seen before.
+    """
+    existing_ids = {m.id for m in existing if m.id}
+    fresh = [m for m in incoming if not (m.id and m.id in existing_ids)]
+
+    stored = [
+        (m.type, m.content) for m in existing
+        if isinstance(m, HumanMessage) or (isinstance(m, AIMessage) and m.content)
+    ]
+    resent = [(m.type, m.content) for m in fresh[:len(stored)] if not m.id]
+    if stored and resent == stored:
+        return fresh[len(stored):]
+    return fresh
+
+def new_turn_messages(user_input, existing: list = None) -> list:
+    """
+    Messages to submit for a turn, each with a stable id. Text becomes a fresh
+    HumanMessage; messages already present in existing are dropped.
+    """
+    if isinstance(user_input, str):
+        return [HumanMessage(content=user_input, id=str(uuid.uuid4()))]
+    incoming = user_input if isinstance(user_input, list) else [user_input]
+    new_messages = filter_new_messages(existing or [], incoming)
+    for message in new_messages:
+        if not message.id:
+            message.id = str(uuid.uuid4())
+    return new_messages
+
+def _prepare_turn(config: dict, user_input):
+    """
+    Build the messages to submit for a turn. Returns (new_messages, state_values);
+    state_values is only set when there is nothing new to submit.
+    """
+    if isinstance(user_input, str):
+        return new_turn_messages(user_input), None
+    state = get_chatbot().get_state(config)
+    values = state.values if state and state.values else {"messages": []}
+    new_messages = new_turn_messages(user_input, values.get("messages", []))
+    return new_messages, (None if new_messages else values)
+
+def run_turn(thread_id: str, user_input, config: dict = None) -> dict:
+    """
+    Submit only the new user turn for a thread; the graph loads the rest of the
+    history from the checkpoint. Accepts the user's text, a message, or a list of
+    messages (already-stored messages are dropped instead of being appended again).
+    """
+    config = config or make_config(thread_id)
+    with metrics.turn(config["configurable"]["thread_id"]):
+        new_messages, values = _prepare_turn(config, user_input)
+        if not new_messages:
+            return values
+        return get_chatbot().invoke({"messages": new_messages}, config=config)
+
+def stream_turn(thread_id: str, user_input, config: dict = None):
+    """
+    Streaming variant of run_turn. Yields event dicts as the turn progresses:
+      {"type": "token", "content": str}                         LLM/answer text
+      {"type": "tool_start", "name": str, "tool_call_id": str}
+      {"type": "tool_end", "name": str, "tool_call_id": str, "content": str}
+      {"type": "done", "state": dict}                           final graph state
+    """
+    config = config or make_config(thread_id)
+    with metrics.turn(config["configurable"]["thread_id"]):
+        new_messages, values = _prepare_turn(config, user_input)
+        if not new_messages:
+            yield {"type": "done", "state": values}
+            return
+        values = yield from stream_graph({"messages": new_messages}, config)
+    yield {"type": "done", "state": values}
 
-graph.add_edge("tools_node", "chat_node")
+def stream_graph(graph_input, config: dict):
+    """
+    Run the graph on graph_input, yielding token/tool_start/tool_end events, and
+    return the final state. graph_input None resumes a thread's interrupted turn
+    from its last checkpoint.
+    """
+    values = None
+    tool_names = {}
+    for mode, payload in get_chatbot().stream(
+        graph_input, config=config, stream_mode=["messages", "updates", "values"]
+    ):
+        if mode == "values":
+            values = payload
+        else:
+            yield from stream_events(mode, payload, tool_names)
+    return values
 
-chatbot = graph.compile(checkpointer=checkpointer)
+def stream_events(mode: str, payload, tool_names: dict):
+    """Translate one graph stream item ("messages" or "updates" mode) into UI events."""
+    if mode == "messages":
+        chunk, metadata = payload
+        if (metadata.get("langgraph_node") == "chat_node" and isinstance(chunk, AIMessage)
+                and isinstance(chunk.content, str) and chunk.content):
+            yield {"type": "token", "content": chunk.content}
+    elif mode == "updates":
+        for node, update in payload.items():
+            messages = (update or {}).get("messages", [])
+            if node == "chat_node":
+                for message in messages:
+                    for tool_call in getattr(message, "tool_calls", None) or []:
+                        tool_names[tool_call["id"]] = tool_call["name"]
+                        yield {"type": "tool_start", "name": tool_call["name"], "tool_call_id": tool_call["id"]}
+            elif node == "tools_node":
+                for message in messages:
+                    if not isinstance(message, ToolMessage):
+                        # Final tool output is the answer itself
+                        yield {"type": "token", "content": message.content}
+                        continue
+                    yield {
+                        "type": "tool_end",
+                        "name": message.name or tool_names.get(message.tool_call_id, "unknown"),
+                        "tool_call_id": message.tool_call_id,
+                        "content": tool_display(message),
+                    }
 
 # =========================Database Operations======================
-def retrieve_all_threads():
-    """Retrieve all unique thread IDs from checkpoints."""
-    all_threads = set()
+def retrieve_all_threads(limit=None, offset=0):
+    """Retrieve thread metadata ordered by most recent activity."""
+    try:
+        return get_checkpointer().list_threads(limit=limit, offset=offset)
+    except Exception as e:
+        metrics.error("retrieve_threads", e, f"Error retrieving threads: {e}")
+        return []
+
+def get_threads(limit=None, offset=0):
+    """Get thread IDs, most recently updated first (frontend compatibility function)."""
+    return [thread["thread_id"] for thread in retrieve_all_threads(limit=limit, offset=offset)]
+
+def search_threads(query: str, limit: int = 10) -> list:
+    """
+    Threads whose messages contain every word of `query` (as word prefixes),
+    most recent match first, with title, updated_at and a snippet of that message.
+    """
+    try:
+        return get_checkpointer().search_threads(query, limit=limit)
+    except Exception as e:
+        metrics.error("search_threads", e, f"Error searching threads: {e}")
+        return []
+
+# Messages per history page in the chat UI
+MESSAGE_PAGE_SIZE = 20
+
+def chat_page(page: dict) -> dict:
+    """A thread_store message page with its rows turned into HumanMessage/AIMessage."""
+    return {
+        "messages": [
+            HumanMessage(content=m["content"]) if m["role"] == "user" else AIMessage(content=m["content"])
+            for m in page["messages"]
+        ],
+        "cursor": page["cursor"],
+    }
+
+def get_message_page(thread_id: str, limit: int = MESSAGE_PAGE_SIZE, before=None) -> dict:
+    """
+    The last `limit` user/assistant messages of a thread before the `before`
+    cursor (the newest when None), oldest first, as HumanMessage/AIMessage,
+    plus the cursor of the next older page (None when there is none).
+    """
+    try:
+        page = get_checkpointer().message_page(thread_id, limit=limit, before=before)
+    except Exception as e:
+        metrics.error("message_page", e, f"Error loading messages of thread {thread_id}: {e}")
+        return {"messages": [], "cursor": None}
+    return chat_page(page)
+
+def get_thread_version(thread_id: str):
+    """Last write time of a thread (None if unknown); changes whenever a turn is saved."""
     try:
-        for checkpoint in checkpointer.list(None):
-            all_threads.add(checkpoint["config"]["configurable"]["thread_id"])
+        return get_checkpointer().thread_version(thread_id)
     except Exception as e:
-        print(f"Error retrieving threads: {e}")
-    return list(all_threads)
+        metrics.error("thread_version", e, f"Error reading thread {thread_id}: {e}")
+        return None
+
+def get_cache_stats():
+    """Get tool response cache hit/miss counters (and coalesced in-flight calls) for monitoring."""
+    return {**tool_cache.stats(), "single_flight": single_flight.stats()}
+
+def get_resilience_stats():
+    """Per-provider breaker state, remaining rate-limit tokens, retries and hedges."""
+    return resilience.stats()
+
+def get_semantic_cache_stats():
+    """Hit/miss counters of the semantic response cache, or None when it is disabled."""
+    return semantic_cache.stats() if semantic_cache is not None else None
 
-def get_threads():
-    """Get all thread IDs (frontend compatibility function)."""
-    return retrieve_all_threads()
+def get_tool_catalog():
+    """Metadata of the enabled tools (icon, display name, cache TTL, limits, cost class)."""
+    return tool_registry.describe()
+
+def get_llm_savings_stats():
+    """LLM round trips skipped because a final-output tool answered the turn."""
+    with _llm_savings_lock:
+        return {"llm_calls_saved": _llm_savings["llm_calls_saved"], "tools": dict(_llm_savings["tools"])}
+
+def get_metrics_text(openmetrics: bool = False) -> str:
+    """All metrics in Prometheus text format (or OpenMetrics), as served on METRICS_PORT."""
+    return metrics.render(openmetrics=openmetrics)
+
+def _collect_component_stats():
+    """Cache, single-flight, resilience and LLM-savings counters, read at scrape time."""
+    samples = []
+    for name, counters in tool_cache.stats()["tools"].items():
+        samples.append(("tool_cache_hits", "counter", {"tool": name}, counters["hits"]))
+        samples.append(("tool_cache_misses", "counter", {"tool": name}, counters["misses"]))
+    samples.append(("tool_cache_entries", "gauge", {}, len(tool_cache.memory)))
+    flight = single_flight.stats()
+    samples.append(("single_flight_coalesced", "counter", {}, flight["coalesced"]))
+    samples.append(("single_flight_in_flight", "gauge", {}, flight["in_flight"]))
+    if semantic_cache is not None:
+        semantic = semantic_cache.stats()
+        samples.append(("semantic_cache_hits", "counter", {}, semantic["hits"]))
+        samples.append(("semantic_cache_misses", "counter", {}, semantic["misses"]))
+    for provider, stats in resilience.stats().items():
+        for field in ("calls", "retries", "hedges", "rejected", "failures"):
+            samples.append((f"upstream_{field}", "counter", {"provider": provider}, stats[field]))
+        samples.append(("circuit_open", "gauge", {"provider": provider}, int(stats["state"] != "closed")))
+    samples.append(("llm_calls_saved", "counter", {}, get_llm_savings_stats()["llm_calls_saved"]))
+    return samples
+
+metrics.register_collector(_collect_component_stats)
 
 def delete_thread(thread_id: str) -> bool:
     """Delete a specific thread from the database."""
     try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
-        cursor.execute("DELETE FROM checkpoint_writes WHERE thread_id = ?", (thread_id,))
-        conn.commit()
+        get_checkpointer().delete_thread(thread_id)
         return True
     except Exception as e:
-        print(f"Error deleting thread {thread_id}: {e}")
-        return False
\ No newline at end of file
+        metrics.error("delete_thread", e, f"Error deleting thread {thread_id}: {e}")
+        return False
+
+def run_db_maintenance(keep_last: int = DEFAULT_KEEP_LAST, idle_days: float = DEFAULT_IDLE_DAYS) -> dict:
+    """Prune old checkpoints, expire idle threads and vacuum the database."""
+    checkpointer = get_checkpointer()
+    checkpointer.setup()
+    with checkpointer.lock:
+        return run_maintenance(checkpointer.conn, keep_last=keep_last, idle_days=idle_days)
+
+def _maintenance_loop(interval: float):
+    while True:
+        time.sleep(interval)
+        try:
+            print(f"DB maintenance: {run_db_maintenance()}")
+        except Exception as e:
+            metrics.error("db_maintenance", e, f"Error running DB maintenance: {e}")
+
+# Optional background compaction, e.g. DB_MAINTENANCE_INTERVAL=3600 for hourly
+DB_MAINTENANCE_INTERVAL = float(os.getenv("DB_MAINTENANCE_INTERVAL", "0"))
+if DB_MAINTENANCE_INTERVAL > 0:
+    threading.Thread(target=_maintenance_loop, args=(DB_MAINTENANCE_INTERVAL,), daemon=True).start()
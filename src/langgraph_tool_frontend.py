@@ -1,9 +1,21 @@
 # langgraph_tool_frontend.py
 import streamlit as st
-from langgraph_tool_backend import chatbot, get_threads, delete_thread
+from langgraph_tool_backend import (
+    delete_thread, get_message_page, get_thread_version, get_tool_catalog, retrieve_all_threads, search_threads,
+    tool_registry
+)
 from langchain_core.messages import HumanMessage, AIMessage
+import time
 import uuid
+from job_queue import FINISHED, get_job_queue
 from login_manager import LoginManager
+from metrics import start_metrics_server
+
+# Prometheus/OpenMetrics scrape endpoint when METRICS_PORT is set (started once per process)
+start_metrics_server()
+
+# How often the page checks a running turn for progress
+JOB_POLL_SECONDS = 0.1
 
 # Page configuration
 st.set_page_config(
@@ -153,6 +165,80 @@ def login_page():
         st.markdown('</div>', unsafe_allow_html=True)
 
 
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_message_page(thread_id, before, version):
+    """
+    One page of a thread's history. Cached per (thread, cursor, version): the
+    version is the thread's last write time, so a new turn makes its pages miss.
+    """
+    return get_message_page(thread_id, before=before)
+
+
+def follow_job(job_id):
+    """
+    Render a turn running on a background worker as it progresses, then add its
+    answer to the chat. A rerun stops only this rendering, not the turn: the
+    next run of the script follows the same job again.
+    """
+    response_placeholder = st.empty()
+    tool_status_placeholder = st.empty()
+    response_placeholder.info("🤔 Thinking...")
+
+    seen = 0
+    streamed_text = ""
+    while True:
+        events, job = get_job_queue().events(job_id, after=seen)
+        seen += len(events)
+        for event in events:
+            if event["type"] == "token":
+                streamed_text += event["content"]
+                response_placeholder.markdown(streamed_text + "▌")
+            elif event["type"] == "tool_start":
+                # Text streamed before a tool call is not the final answer
+                streamed_text = ""
+                response_placeholder.info(f"🔧 Running {event['name']}...")
+        if job is None or job["status"] in FINISHED:
+            break
+        if job["status"] == "queued":
+            response_placeholder.info("⏳ Waiting for a free worker...")
+        time.sleep(JOB_POLL_SECONDS)
+    st.session_state.pending_jobs.remove(job_id)
+
+    if job is None or job["status"] == "cancelled":
+        response_placeholder.error("❌ Failed to get response from agent.")
+    elif job["status"] == "error":
+        error_msg = job["error"] or ""
+        # Check for specific errors
+        if "recursion" in error_msg.lower():
+            response_placeholder.error("❌ The agent got stuck in a loop. Starting fresh conversation...")
+            st.info("💡 Try rephrasing your question or start a new chat.")
+            # Reset on recursion error
+            st.session_state.thread_id = str(uuid.uuid4())
+            st.session_state.messages = []
+            st.session_state.pending_jobs = []
+        elif "api" in error_msg.lower() or "key" in error_msg.lower():
+            response_placeholder.error(f"❌ API Error: {error_msg}")
+            st.info("💡 Make sure your GROQ_API_KEY is set correctly in the .env file")
+        else:
+            response_placeholder.error(f"❌ Error: {error_msg}")
+            st.info("💡 Try starting a new chat or rephrasing your message")
+    else:
+        result = job["result"]
+        # Display the tools used in this turn, if any
+        if result["tools"]:
+            tools_text = ", ".join([
+                f"{tool_registry.icon(tool)} **{tool_registry.display_name(tool)}**"
+                for tool in result["tools"]
+            ])
+            tool_status_placeholder.success(f"🔧 **Tools Used:** {tools_text}")
+
+        if result["answer"]:
+            response_placeholder.write(result["answer"])
+            st.session_state.messages.append(AIMessage(content=result["answer"]))
+        else:
+            response_placeholder.warning("⚠️ No response generated. Please try again.")
+
+
 if not st.session_state.logged_in:
     login_page()
 else:
@@ -162,13 +248,6 @@ else:
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
-    config = {
-        "configurable": {
-            "thread_id": st.session_state.thread_id
-        },
-        "recursion_limit": 50  # Increased limit as safety net
-    }
-
     # ========================= SIDEBAR =========================
     with st.sidebar:
         st.title("🤖 AI Assistant")
@@ -188,44 +267,41 @@ else:
         st.markdown("---")
         st.markdown("### 💬 Chat History")
         
-        # Display thread history
-        threads = get_threads()
+        # Recent threads, or the ones matching the search box
+        query = st.text_input("Search chats", placeholder="🔍 Search chats", label_visibility="collapsed")
+        threads = search_threads(query, limit=15) if query.strip() else retrieve_all_threads(limit=15)
         if threads:
-            for thread in reversed(threads[-15:]):
+            for thread in threads:
+                thread_id = thread["thread_id"]
                 col1, col2 = st.columns([4, 1])
                 with col1:
                     if st.button(
-                        f"🔹 {thread[:12]}...",
-                        key=f"thread_{thread}",
+                        f"🔹 {thread['title'] or thread_id[:12] + '...'}",
+                        key=f"thread_{thread_id}",
                         use_container_width=True,
-                        disabled=(thread == st.session_state.thread_id)
+                        disabled=(thread_id == st.session_state.thread_id)
                     ):
-                        st.session_state.thread_id = thread
+                        st.session_state.thread_id = thread_id
                         st.session_state.messages = []
                         st.rerun()
+                    if thread.get("snippet"):
+                        st.caption(thread["snippet"])
                 with col2:
-                    if st.button("🗑️", key=f"del_{thread}"):
-                        delete_thread(thread)
-                        if thread == st.session_state.thread_id:
+                    if st.button("🗑️", key=f"del_{thread_id}"):
+                        delete_thread(thread_id)
+                        if thread_id == st.session_state.thread_id:
                             st.session_state.thread_id = str(uuid.uuid4())
                             st.session_state.messages = []
                         st.rerun()
         else:
-            st.info("No chat history")
+            st.info("No matching chats" if query.strip() else "No chat history")
         
         st.markdown("---")
         st.markdown("### 🛠️ Available Tools")
-        tools_list = [
-            " Web Search",
-            "🧮 Calculator",
-            "🌤️ Weather",
-            "📈 Stock Price",
-            "💱 Currency Convert",
-            "📰 News",
-            "😂 Jokes",
-            "🌌 NASA APOD",
-            "🌐 IP Location"
-        ]
+        # The enabled tools from the registry, plugins included
+        tools_list = dict.fromkeys(
+            f"{tool['icon']} {tool['display_name']}" for tool in get_tool_catalog().values()
+        )
         for tool in tools_list:
             st.markdown(f"• {tool}")
         
@@ -236,22 +312,25 @@ else:
     st.title("✨ AI Assistant with Tools")
     st.caption("Chat with AI - Tools work automatically! Try asking for a joke, weather, stock prices, and more!")
 
-    # Load existing messages from checkpoint
+    # Load the latest page of the thread's history (older pages on demand)
     if not st.session_state.messages:
-        try:
-            state = chatbot.get_state(config)
-            if state and state.values and "messages" in state.values:
-                msgs = state.values["messages"]
-                # Filter to only user and assistant messages with content
-                st.session_state.messages = []
-                for m in msgs:
-                    if isinstance(m, HumanMessage):
-                        st.session_state.messages.append(m)
-                    elif isinstance(m, AIMessage) and m.content:
-                        st.session_state.messages.append(m)
-        except Exception as e:
-            print(f"Error loading messages: {e}")
-            st.session_state.messages = []
+        version = get_thread_version(st.session_state.thread_id)
+        page = load_message_page(st.session_state.thread_id, None, version) if version is not None else None
+        st.session_state.messages = list(page["messages"]) if page else []
+        st.session_state.history_cursor = page["cursor"] if page else None
+        # Turns of this thread may still be running, e.g. submitted before the tab was closed
+        st.session_state.pending_jobs = get_job_queue().active_jobs(st.session_state.thread_id)
+
+    if st.session_state.get("history_cursor") is not None:
+        if st.button("⬆️ Load older messages"):
+            older = load_message_page(
+                st.session_state.thread_id,
+                st.session_state.history_cursor,
+                get_thread_version(st.session_state.thread_id),
+            )
+            st.session_state.messages = list(older["messages"]) + st.session_state.messages
+            st.session_state.history_cursor = older["cursor"]
+            st.rerun()
 
     # Display chat messages
     for msg in st.session_state.messages:
@@ -272,106 +351,20 @@ else:
         with st.chat_message("user"):
             st.write(user_input)
         
-        # Get AI response
+        # The turn runs on a background worker, so reruns and closed tabs don't interrupt it.
+        # A message sent while an answer is still coming is queued behind it, not dropped.
+        st.session_state.pending_jobs.append(get_job_queue().submit(st.session_state.thread_id, user_input))
+
+    # Get AI responses, oldest first
+    followed = 0
+    while st.session_state.get("pending_jobs"):
         with st.chat_message("assistant"):
-            response_placeholder = st.empty()
-            tool_status_placeholder = st.empty()
-            # Clear any previous tool status
-            tool_status_placeholder.empty()
-            
-            try:
-                # Show immediate feedback
-                response_placeholder.info("🤔 Thinking...")
-                
-                # Invoke the chatbot with timeout
-                result = chatbot.invoke(
-                    {"messages": st.session_state.messages},
-                    config=config
-                )
-                
-                # Extract the final response
-                if result and "messages" in result:
-                    messages = result["messages"]
-                    
-                    # Show tools used only from the latest AI message
-                    tool_calls_made = []
-                    # Find the last AIMessage that may contain tool calls
-                    for msg in reversed(messages):
-                        # STOP scanning if we hit the user's message
-                        if isinstance(msg, HumanMessage):
-                            break
-                            
-                        if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                            for tool_call in msg.tool_calls:
-                                tool_name = tool_call.get('name', 'unknown')
-                                tool_calls_made.append(tool_name)
-                            # We keep going until we hit the HumanMessage to catch ALL tool calls in the chain
-                    
-                    # Display tool calls if any were made
-                    if tool_calls_made:
-                        tool_icons = {
-                            'search_tool': '🔍',
-                            'calculator_tool': '🧮',
-                            'fetch_weather': '🌤️',
-                            'get_stock_price': '📈',
-                            'convert_currency': '💱',
-                            'fetch_news': '📰',
-                            'get_joke': '😂',
-                            'get_nasa_apod': '🌌',
-                            'get_ip_location': '🌐'
-                        }
-                        
-                        tool_display_names = {
-                            'search_tool': 'Web Search',
-                            'calculator_tool': 'Calculator',
-                            'fetch_weather': 'Weather',
-                            'get_stock_price': 'Stock Price',
-                            'convert_currency': 'Currency Converter',
-                            'fetch_news': 'News',
-                            'get_joke': 'Joke',
-                            'get_nasa_apod': 'NASA APOD',
-                            'get_ip_location': 'IP Location'
-                        }
-                        
-                        # Remove duplicates while preserving order
-                        unique_tools = list(dict.fromkeys(tool_calls_made))
-                        tools_text = ", ".join([
-                            f"{tool_icons.get(tool, '🔧')} **{tool_display_names.get(tool, tool)}**"
-                            for tool in unique_tools
-                        ])
-                        tool_status_placeholder.success(f"🔧 **Tools Used:** {tools_text}")
-                    
-                    # Find the last AI message with content
-                    ai_response = None
-                    for msg in reversed(messages):
-                        if isinstance(msg, AIMessage) and msg.content:
-                            ai_response = msg.content
-                            break
-                    
-                    if ai_response:
-                        response_placeholder.write(ai_response)
-                        st.session_state.messages.append(AIMessage(content=ai_response))
-                    else:
-                        response_placeholder.warning("⚠️ No response generated. Please try again.")
-                else:
-                    response_placeholder.error("❌ Failed to get response from agent.")
-                        
-            except Exception as e:
-                error_msg = str(e)
-                
-                # Check for specific errors
-                if "recursion" in error_msg.lower():
-                    response_placeholder.error("❌ The agent got stuck in a loop. Starting fresh conversation...")
-                    st.info("💡 Try rephrasing your question or start a new chat.")
-                    # Reset on recursion error
-                    st.session_state.thread_id = str(uuid.uuid4())
-                    st.session_state.messages = []
-                elif "api" in error_msg.lower() or "key" in error_msg.lower():
-                    response_placeholder.error(f"❌ API Error: {error_msg}")
-                    st.info("💡 Make sure your GROQ_API_KEY is set correctly in the .env file")
-                else:
-                    response_placeholder.error(f"❌ Error: {error_msg}")
-                    st.info("💡 Try starting a new chat or rephrasing your message")
+            follow_job(st.session_state.pending_jobs[0])
+        followed += 1
+    if followed > 1:
+        # The answers were shown below all the queued messages; reload the thread
+        # on the next run so it shows them in the order they were saved
+        st.session_state.messages = []
 
     # Footer
     st.markdown("---")
@@ -0,0 +1,355 @@
+import asyncio
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# =========================Metrics Settings======================
+# Counters and histograms are cheap enough to leave on (METRICS_ENABLED=0 turns them off)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+# JSONL file receiving one event per span, turn and error (empty disables tracing)
+METRICS_TRACE_PATH = os.getenv("METRICS_TRACE_PATH", "")
+# Port for a Prometheus/OpenMetrics scrape endpoint (0 disables it)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRIC_PREFIX = "chatbot_"
+
+# Histogram buckets: latencies in seconds, and LLM iterations per turn
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ITERATION_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 25)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# The turn being processed: {"turn_id", "thread_id", "iterations"}
+_current_turn = contextvars.ContextVar("metrics_turn", default=None)
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class TraceWriter:
+    """Appends JSON events to a file from a background thread, so spans never wait on disk."""
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name="metrics-trace", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, event):
+        self._queue.put(event)
+
+    def _drain(self):
+        with open(self.path, "a", encoding="utf-8") as trace:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    return
+                trace.write(json.dumps(event, default=str, ensure_ascii=False) + "\n")
+                if self._queue.empty():
+                    trace.flush()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+
+class Metrics:
+    """
+    In-process counters and histograms with labels, timing spans and per-turn
+    context. render() produces Prometheus text or OpenMetrics; collectors add
+    values read from other components (cache stats, ...) at scrape time.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED, trace_path=METRICS_TRACE_PATH):
+        self.enabled = enabled
+        self._counters = {}
+        self._histograms = {}
+        self._buckets = {}
+        self._help = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self.trace = TraceWriter(trace_path) if trace_path else None
+
+    # -------------------------Recording-------------------------
+    def describe(self, name, help_text, buckets=None):
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = tuple(buckets)
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        buckets = self._buckets.get(name, LATENCY_BUCKETS)
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[index] += 1
+                    break
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def event(self, name, **fields):
+        """Write a trace event tagged with the current turn (no-op without a trace file)."""
+        if self.trace is None or not self.enabled:
+            return
+        turn = _current_turn.get()
+        if turn is not None:
+            fields = {"turn_id": turn["turn_id"], "thread_id": turn["thread_id"], **fields}
+        self.trace.write({"ts": time.time(), "event": name, **fields})
+
+    @contextmanager
+    def span(self, name, **labels):
+        """
+        Time a block into the `<name>_seconds` histogram. The yielded dict can
+        carry a "status" (default ok, or error when the block raises) and extra
+        fields for the trace event.
+        """
+        if not self.enabled:
+            yield {}
+            return
+        fields = {}
+        start = time.perf_counter()
+        try:
+            yield fields
+        except BaseException:
+            fields["status"] = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            status = fields.pop("status", "ok")
+            self.observe(f"{name}_seconds", elapsed, status=status, **labels)
+            self.event(name, duration_ms=round(elapsed * 1000, 3), status=status, **labels, **fields)
+
+    def timed(self, name, **labels):
+        """Decorator form of span() for sync and async functions."""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name, **labels):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def error(self, where, error, message=None):
+        """Report a handled error: printed as before, counted and traced."""
+        print(message or f"Error in {where}: {error}")
+        self.inc("errors", where=where, type=type(error).__name__)
+        self.event("error", where=where, type=type(error).__name__, message=str(error))
+
+    # -------------------------Turns-------------------------
+    @contextmanager
+    def turn(self, thread_id):
+        """Scope one user turn: its duration and LLM iterations are recorded when it ends."""
+        if not self.enabled:
+            yield None
+            return
+        turn = {"turn_id": uuid.uuid4().hex, "thread_id": str(thread_id), "iterations": 0}
+        token = _current_turn.set(turn)
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield turn
+        except (GeneratorExit, asyncio.CancelledError):
+            # The caller stopped reading a streamed turn
+            status = "cancelled"
+            raise
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe("turn_seconds", elapsed, status=status)
+            self.observe("turn_iterations", turn["iterations"])
+            self.inc("turns", status=status)
+            self.event("turn", duration_ms=round(elapsed * 1000, 3), status=status, iterations=turn["iterations"])
+            try:
+                _current_turn.reset(token)
+            except ValueError:
+                # A streaming turn closed from another context (e.g. garbage collected)
+                _current_turn.set(None)
+
+    def iteration(self):
+        """Count one pass through the chat node for the current turn."""
+        turn = _current_turn.get()
+        if turn is not None:
+            turn["iterations"] += 1
+
+    # -------------------------Export-------------------------
+    def register_collector(self, collect):
+        """collect() returns (name, type, labels, value) samples; type is "counter" or "gauge"."""
+        self._collectors.append(collect)
+
+    def snapshot(self):
+        """Counters and histograms as plain dicts (for tests and JSON dumps)."""
+        with self._lock:
+            counters = {(name, key): value for (name, key), value in self._counters.items()}
+            histograms = {(name, key): list(values) for (name, key), values in self._histograms.items()}
+        return {
+            "counters": [{"name": name, "labels": dict(key), "value": value} for (name, key), value in counters.items()],
+            "histograms": [
+                {"name": name, "labels": dict(key), "count": values[-1], "sum": values[-2]}
+                for (name, key), values in histograms.items()
+            ],
+        }
+
+    def _collected(self):
+        samples = []
+        for collect in self._collectors:
+            try:
+                samples.extend(collect())
+            except Exception as e:
+                self.error("collector", e, f"Error collecting metrics: {e}")
+        return samples
+
+    def render(self, openmetrics=False):
+        """Prometheus text exposition format (0.0.4), or OpenMetrics 1.0 when openmetrics is set."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+
+        families = {}
+        for (name, key), value in counters.items():
+            families.setdefault((name, "counter"), []).append((key, value))
+        for name, kind, labels, value in self._collected():
+            families.setdefault((name, kind), []).append((_label_key(labels), value))
+
+        lines = []
+        for (name, kind), samples in sorted(families.items()):
+            full = METRIC_PREFIX + name
+            sample_name = full + "_total" if kind == "counter" else full
+            # OpenMetrics names the counter family without the _total suffix its samples carry
+            family = full if openmetrics else sample_name
+            if name in self._help:
+                lines.append(f"# HELP {family} {self._help[name]}")
+            lines.append(f"# TYPE {family} {kind}")
+            lines.extend(f"{sample_name}{_format_labels(key)} {_format_value(value)}" for key, value in sorted(samples))
+
+        by_name = {}
+        for (name, key), values in histograms.items():
+            by_name.setdefault(name, []).append((key, values))
+        for name, series in sorted(by_name.items()):
+            full = METRIC_PREFIX + name
+            buckets = self._buckets.get(name, LATENCY_BUCKETS)
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} histogram")
+            for key, values in sorted(series):
+                cumulative = 0
+                for bound, count in zip(buckets, values):
+                    cumulative += count
+                    lines.append(f"{full}_bucket{_format_labels(key, [('le', _format_value(float(bound)))])} {cumulative}")
+                lines.append(f"{full}_bucket{_format_labels(key, [('le', '+Inf')])} {values[-1]}")
+                lines.append(f"{full}_sum{_format_labels(key)} {_format_value(float(values[-2]))}")
+                lines.append(f"{full}_count{_format_labels(key)} {values[-1]}")
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+metrics = Metrics()
+metrics.describe("node_seconds", "Time spent in each graph node")
+metrics.describe("llm_call_seconds", "Latency of LLM calls")
+metrics.describe("tool_seconds", "Latency of tool calls, by tool and result status")
+metrics.describe("http_seconds", "Latency of upstream HTTP requests made by tools")
+metrics.describe("db_seconds", "Latency of checkpoint reads, writes and thread listing")
+metrics.describe("turn_seconds", "Wall time of a user turn")
+metrics.describe("turn_iterations", "Chat node passes (LLM loop iterations) per turn", buckets=ITERATION_BUCKETS)
+metrics.describe("llm_tokens", "Tokens sent to and received from the LLM")
+metrics.describe("shortcut_replies", "Turns answered without an LLM call")
+metrics.describe("errors", "Handled errors by where they happened")
+metrics.describe("jobs_submitted", "Turns submitted to the background job queue")
+metrics.describe("jobs", "Background turn jobs finished, by final status")
+metrics.describe("job_wait_seconds", "Time background turn jobs spent queued before a worker took them")
+metrics.describe("turns", "User turns processed")
+
+
+# =========================Scrape Endpoint======================
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT, registry=None):
+    """
+    Serve /metrics on a daemon thread (Prometheus text, or OpenMetrics when the
+    scraper asks for it). Idempotent; returns the server, or None when port is 0.
+    """
+    global _server
+    if not port:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    source = registry or metrics
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = source.render(openmetrics=openmetrics).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
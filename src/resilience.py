@@ -0,0 +1,348 @@
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# =========================Resilience Settings======================
+DEFAULT_RATE = float(os.getenv("PROVIDER_RATE", "10"))
+DEFAULT_BURST = int(os.getenv("PROVIDER_BURST", "20"))
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("BREAKER_RESET", "30"))
+MAX_RETRIES = int(os.getenv("PROVIDER_MAX_RETRIES", "2"))
+# Total time a call may spend waiting between retries
+RETRY_BUDGET = float(os.getenv("PROVIDER_RETRY_BUDGET", "1.0"))
+RETRY_BASE_DELAY = 0.1
+# Seconds before a duplicate request is sent for a slow call (0 disables hedging)
+HEDGE_AFTER = float(os.getenv("PROVIDER_HEDGE_AFTER", "2.0"))
+
+# Per-provider overrides; anything not listed uses the defaults above
+PROVIDERS = {
+    # Free tier allows ~5 requests/minute; never spend quota on hedges
+    "alphavantage": {"hosts": ("www.alphavantage.co",), "rate": 5 / 60, "burst": 5, "hedge_after": 0},
+    "weatherapi": {"hosts": ("api.weatherapi.com",)},
+    "newsapi": {"hosts": ("newsapi.org",), "hedge_after": 0},
+    "openexchangerates": {"hosts": ("openexchangerates.org",), "hedge_after": 0},
+    "jokeapi": {"hosts": ("v2.jokeapi.dev",)},
+    "nasa": {"hosts": ("api.nasa.gov",)},
+    "ipapi": {"hosts": ("ipapi.co",)},
+    "duckduckgo": {"hosts": ()},
+}
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """The provider failed repeatedly and is being given time to recover."""
+
+
+class RateLimitedError(Exception):
+    """The provider's request budget is used up for now."""
+
+
+class UpstreamError(Exception):
+    """The provider answered with a status that means "try again later"."""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"upstream returned HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() never waits."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until or self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def pause(self, seconds):
+        """Hand out no tokens for a while, e.g. after the provider answered 429."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; after
+    `reset_timeout` one trial call is let through (half-open) to probe recovery.
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURES, reset_timeout=BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            # A trial that never reported back re-arms after another reset_timeout
+            if now - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._opened_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class Provider:
+    """Rate limit, breaker and retry/hedge policy for one upstream API."""
+
+    def __init__(self, name, rate=DEFAULT_RATE, burst=DEFAULT_BURST, failure_threshold=BREAKER_FAILURES,
+                 reset_timeout=BREAKER_RESET, max_retries=MAX_RETRIES, retry_budget=RETRY_BUDGET,
+                 hedge_after=HEDGE_AFTER, hosts=()):
+        self.name = name
+        self.hosts = tuple(hosts)
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.hedge_after = hedge_after
+        self.counters = {"calls": 0, "retries": 0, "hedges": 0, "rejected": 0, "failures": 0}
+        self._lock = threading.Lock()
+
+    def count(self, field):
+        with self._lock:
+            self.counters[field] += 1
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "state": self.breaker.state,
+            "trips": self.breaker.trips,
+            "tokens": round(self.bucket.tokens, 2),
+        }
+
+
+def check_response(response):
+    """Raise UpstreamError for throttling and server errors so they count as failures."""
+    status = getattr(response, "status_code", 200)
+    if status in RETRYABLE_STATUS:
+        retry_after = response.headers.get("Retry-After") if hasattr(response, "headers") else None
+        try:
+            retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            retry_after = None
+        raise UpstreamError(status, retry_after)
+    return response
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, RETRY_BASE_DELAY * (2 ** attempt))
+
+
+# =========================Retry Scheduling======================
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _scheduler_loop():
+    """The background event loop that schedules retries and hedges for sync callers."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="resilience-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+class Resilience:
+    """
+    Guards every upstream call: per-provider token bucket (fail fast when
+    empty), circuit breaker, bounded retries and hedged requests for slow calls.
+    Callers turn the raised errors into the tool's existing fallback answer.
+    """
+
+    def __init__(self, providers=None, hedge_workers=32):
+        self._providers = {}
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="hedge")
+        for name, settings in (PROVIDERS if providers is None else providers).items():
+            self.add_provider(Provider(name, **settings))
+
+    def add_provider(self, provider):
+        with self._lock:
+            self._providers[provider.name] = provider
+            for host in provider.hosts:
+                self._hosts[host] = provider
+        return provider
+
+    def provider(self, name):
+        """Provider by name, created with default limits on first use."""
+        with self._lock:
+            if name not in self._providers:
+                self._providers[name] = Provider(name)
+            return self._providers[name]
+
+    def provider_for(self, url):
+        host = urlsplit(url).hostname or url
+        with self._lock:
+            provider = self._hosts.get(host)
+        return provider or self.provider(host)
+
+    def _admit(self, provider):
+        if not provider.breaker.allow():
+            provider.count("rejected")
+            raise CircuitOpenError(f"{provider.name} is temporarily unavailable (circuit open)")
+        if not provider.bucket.acquire():
+            provider.count("rejected")
+            raise RateLimitedError(f"{provider.name} rate limit reached, try again shortly")
+
+    def _failed(self, provider, error):
+        provider.count("failures")
+        provider.breaker.record_failure()
+        if isinstance(error, UpstreamError) and error.status == 429:
+            provider.bucket.pause(error.retry_after or 1.0)
+
+    def _retry_delay(self, provider, attempt, error, started):
+        """Delay before the next attempt, or None when the call should give up."""
+        if isinstance(error, (CircuitOpenError, RateLimitedError)) or attempt >= provider.max_retries:
+            return None
+        delay = backoff_delay(attempt)
+        if isinstance(error, UpstreamError) and error.status == 429:
+            # Wait out the provider's pause, if it fits in the budget at all
+            delay = max(delay, error.retry_after or 1.0)
+        if time.monotonic() - started + delay > provider.retry_budget:
+            return None
+        return delay
+
+    # ---------------- sync ----------------
+    def call(self, url, fetch, provider=None):
+        """
+        Run fetch() for url under the provider's limits; returns the response or raises.
+        Backoff and hedge timers are scheduled on the resilience event loop and the
+        attempts run on the hedge pool, so the calling tool thread never sleeps between retries.
+        """
+        loop = _scheduler_loop()
+        context = contextvars.copy_context()
+
+        def afetch():
+            return loop.run_in_executor(self._hedge_pool, context.copy().run, fetch)
+
+        return asyncio.run_coroutine_threadsafe(self.acall(url, afetch, provider), loop).result()
+
+    # ---------------- async ----------------
+    async def _ahedged(self, provider, afetch):
+        if not provider.hedge_after:
+            return check_response(await afetch())
+        tasks = [asyncio.ensure_future(afetch())]
+        done, _ = await asyncio.wait(tasks, timeout=provider.hedge_after)
+        if not done and provider.bucket.acquire():
+            provider.count("hedges")
+            tasks.append(asyncio.ensure_future(afetch()))
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.remove(task)
+                    if task.exception() is None or not tasks:
+                        return check_response(task.result())
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def acall(self, url, afetch, provider=None):
+        """Async call(): retries are awaited, so no thread is held while backing off."""
+        provider = provider or self.provider_for(url)
+        provider.count("calls")
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self._admit(provider)
+            try:
+                response = await self._ahedged(provider, afetch)
+            except Exception as error:
+                self._failed(provider, error)
+                delay = self._retry_delay(provider, attempt, error, started)
+                if delay is None:
+                    raise
+                provider.count("retries")
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            provider.breaker.record_success()
+            return response
+
+    def guard(self, provider_name, func, *args, **kwargs):
+        """Rate limit and breaker (no retries or hedging) around a non-HTTP client call."""
+        provider = self.provider(provider_name)
+        provider.count("calls")
+        self._admit(provider)
+        try:
+            result = func(*args, **kwargs)
+        except Exception as error:
+            self._failed(provider, error)
+            raise
+        provider.breaker.record_success()
+        return result
+
+    async def aguard(self, provider_name, afunc, *args, **kwargs):
+        provider = self.provider(provider_name)
+        provider.count("calls")
+        self._admit(provider)
+        try:
+            result = await afunc(*args, **kwargs)
+        except Exception as error:
+            self._failed(provider, error)
+            raise
+        provider.breaker.record_success()
+        return result
+
+    def stats(self):
+        with self._lock:
+            providers = list(self._providers.values())
+        return {provider.name: provider.stats() for provider in providers}
+
+
+resilience = Resilience()
@@ -0,0 +1,201 @@
+import math
+import os
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict, defaultdict
+
+# =========================Semantic Cache Settings======================
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "0") == "1"
+DEFAULT_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85"))
+DEFAULT_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+DEFAULT_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "1000"))
+EMBEDDING_DIM = 1 << 18
+MAX_CANDIDATES = 5
+# Relative weight of word unigrams, word bigrams and character trigrams
+FEATURE_WEIGHTS = {"w": 1.0, "b": 0.5, "c": 0.3}
+
+STOPWORDS = frozenset(
+    "a an the is are was be what whats who how me my i you your to of in on at for about please pls "
+    "tell give show can could would will do does some any and or get find let us".split()
+)
+
+# Answers to these depend on when they are asked, so they are never cached
+TIME_SENSITIVE = re.compile(
+    r"\b(?:today|tonight|now|current(?:ly)?|latest|recent|yesterday|tomorrow|live|breaking|"
+    r"this (?:morning|afternoon|evening|week|month|year))\b"
+)
+# Follow-ups that lean on earlier turns, and questions about the user, can't be
+# answered from another conversation ("tell me about ..." is still standalone)
+CONTEXTUAL = re.compile(
+    r"\b(?:it|its|that|this|those|these|them|they|their|he|she|his|her|above|previous|again|"
+    r"more|else|same|i|im|ive|id|my|mine|myself|we|our|ours|us)\b|"
+    r"(?<!tell )(?<!give )(?<!show )\bme\b|^(?:and|also|what about|how about)\b"
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?|[+\-*/×÷=%$€£]")
+
+
+def normalize_prompt(text):
+    """Lowercase, drop punctuation noise and collapse whitespace."""
+    return " ".join(_TOKEN.findall(text.lower()))
+
+
+def _trigrams(token):
+    padded = f"#{token}#"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def embed(normalized):
+    """
+    Sparse hashed embedding of content-word unigrams, bigrams and character
+    trigrams, with sublinear term weights and L2 normalization. Runs locally.
+    """
+    tokens = [token for token in normalized.split() if token not in STOPWORDS] or normalized.split()
+    counts = defaultdict(int)
+    for token in tokens:
+        counts[("w", token)] += 1
+        for gram in _trigrams(token):
+            counts[("c", gram)] += 1
+    for first, second in zip(tokens, tokens[1:]):
+        counts[("b", f"{first} {second}")] += 1
+
+    vector = defaultdict(float)
+    for (kind, feature), count in counts.items():
+        digest = zlib.crc32(f"{kind}:{feature}".encode("utf-8"))
+        sign = 1.0 if digest & 1 else -1.0
+        vector[(digest >> 1) % EMBEDDING_DIM] += sign * FEATURE_WEIGHTS[kind] * (1.0 + math.log(count))
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {index: weight / norm for index, weight in vector.items() if weight} if norm else {}
+
+
+def _content_words(normalized):
+    return {token for token in normalized.split() if token not in STOPWORDS}
+
+
+def _numbers(normalized):
+    return sorted(token for token in normalized.split() if token[0].isdigit())
+
+
+def _same_meaning(words, other_words):
+    """Every content word needs a counterpart (equal, or a close spelling such as a plural)."""
+    for word in words ^ other_words:
+        candidates = other_words if word in words else words
+        grams = _trigrams(word)
+        if not any(len(grams & _trigrams(c)) / len(grams | _trigrams(c)) >= 0.5 for c in candidates):
+            return False
+    return True
+
+
+def is_cacheable_prompt(text):
+    """Only standalone, time-independent questions are served from the cache."""
+    if not isinstance(text, str) or not text.strip():
+        return False
+    normalized = normalize_prompt(text)
+    return bool(normalized) and not TIME_SENSITIVE.search(normalized) and not CONTEXTUAL.search(normalized)
+
+
+class _Entry:
+    __slots__ = ("normalized", "words", "numbers", "vector", "value", "expires_at")
+
+    def __init__(self, normalized, vector, value, expires_at):
+        self.normalized = normalized
+        self.words = _content_words(normalized)
+        self.numbers = _numbers(normalized)
+        self.vector = vector
+        self.value = value
+        self.expires_at = expires_at
+
+
+class SemanticCache:
+    """
+    In-memory cache of LLM responses keyed by prompt similarity. Prompts are
+    embedded locally and looked up through an inverted index over the sparse
+    vectors; a hit also needs the same numbers and matching content words, so
+    "25 + 37" never answers "25 + 38".
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, ttl=DEFAULT_TTL, maxsize=DEFAULT_SIZE):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._postings = defaultdict(set)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        for index in entry.vector:
+            postings = self._postings[index]
+            postings.discard(entry_id)
+            if not postings:
+                del self._postings[index]
+
+    def _scores(self, vector):
+        scores = defaultdict(float)
+        for index, weight in vector.items():
+            for entry_id in self._postings.get(index, ()):
+                scores[entry_id] += weight * self._entries[entry_id].vector[index]
+        return scores
+
+    def get(self, prompt):
+        """(value, similarity) of the closest fresh match above the threshold, or None."""
+        if not is_cacheable_prompt(prompt):
+            with self._lock:
+                self.bypassed += 1
+            return None
+        normalized = normalize_prompt(prompt)
+        vector = embed(normalized)
+        words, numbers = _content_words(normalized), _numbers(normalized)
+        now = time.time()
+        with self._lock:
+            scores = self._scores(vector)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:MAX_CANDIDATES]
+            for entry_id, similarity in ranked:
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[entry_id]
+                if entry.expires_at <= now:
+                    self._remove(entry_id)
+                    continue
+                if entry.numbers == numbers and _same_meaning(words, entry.words):
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    return entry.value, similarity
+            self.misses += 1
+            return None
+
+    def set(self, prompt, value, ttl=None):
+        if not is_cacheable_prompt(prompt):
+            return
+        normalized = normalize_prompt(prompt)
+        entry_id = uuid.uuid4().hex
+        entry = _Entry(normalized, embed(normalized), value, time.time() + (self.ttl if ttl is None else ttl))
+        with self._lock:
+            self._entries[entry_id] = entry
+            for index in entry.vector:
+                self._postings[index].add(entry_id)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            self.hits = self.misses = self.bypassed = 0
@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from thread_store import IndexedSqliteSaver
+
+# =========================SQLite Settings======================
+DB_PATH = os.getenv("CHATBOT_DB_PATH", "chatbot.db")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_KB = int(os.getenv("SQLITE_CACHE_KB", "16384"))
+
+
+def _pragmas():
+    return [
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA journal_mode = WAL",
+        f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size = -{SQLITE_CACHE_KB}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+
+
+def apply_pragmas(conn):
+    """WAL lets readers run alongside the writer; busy_timeout waits out short write locks."""
+    for pragma in _pragmas():
+        conn.execute(pragma)
+    return conn
+
+
+def connect(path=DB_PATH):
+    """Open a tuned connection to the chatbot database."""
+    conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    return apply_pragmas(conn)
+
+
+async def aconnect(path=DB_PATH):
+    """Open a tuned aiosqlite connection for the async checkpointer."""
+    import aiosqlite
+
+    conn = await aiosqlite.connect(path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+    for pragma in _pragmas():
+        await conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """
+    One SQLite connection per thread. Connections of threads that have exited
+    (e.g. finished Streamlit script runs) are closed the next time one is opened.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def connection(self):
+        thread = threading.current_thread()
+        conn = self._connections.get(thread)
+        if conn is None:
+            with self._lock:
+                self._reap()
+                conn = connect(self.path)
+                self._connections[thread] = conn
+        return conn
+
+    def _reap(self):
+        for thread in [t for t in self._connections if not t.is_alive()]:
+            self._connections.pop(thread).close()
+
+    def __len__(self):
+        return len(self._connections)
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+
+class PooledSqliteSaver(IndexedSqliteSaver):
+    """
+    Checkpointer that gives each thread its own connection instead of sharing
+    one connection behind a global lock, so reads from concurrent sessions
+    don't queue up behind each other or behind writes.
+    """
+
+    def __init__(self, pool, *, serde=None):
+        self.pool = pool
+        self._ready = False
+        # Connections are opened lazily, per thread, on first use
+        super().__init__(None, serde=serde)
+
+    @property
+    def conn(self):
+        return self.pool.connection()
+
+    @conn.setter
+    def conn(self, value):
+        # Connections always come from the pool
+        pass
+
+    def setup(self) -> None:
+        if self._ready:
+            return
+        with self.lock:
+            if not self._ready:
+                super().setup()
+                self._ready = True
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        """
+        Reads run in parallel on per-thread connections. Writes still take the
+        saver lock: SQLite allows one writer at a time anyway, and an in-process
+        handoff is much faster than busy_timeout's sleep-and-retry.
+        """
+        self.setup()
+        conn = self.conn
+        if transaction:
+            self.lock.acquire()
+        cur = conn.cursor()
+        try:
+            yield cur
+        finally:
+            if transaction:
+                try:
+                    conn.commit()
+                finally:
+                    self.lock.release()
+            cur.close()
@@ -0,0 +1,573 @@
+import json
+import re
+import time
+import unicodedata
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import get_checkpoint_metadata
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from metrics import metrics
+
+TITLE_MAX_LENGTH = 60
+# Words of context in a search result's snippet
+SNIPPET_WORDS = 12
+_WORD = re.compile(r"\w+")
+
+# Gregorian epoch offset used by time-based UUIDs, in 100ns ticks
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def _checkpoint_timestamp(checkpoint_id):
+    """Unix timestamp encoded in a checkpoint id (UUIDv6), or now if it has none."""
+    try:
+        value = uuid.UUID(checkpoint_id).int
+        ticks = ((value >> 96) << 28) | (((value >> 80) & 0xFFFF) << 12) | ((value >> 64) & 0x0FFF)
+        return (ticks - _UUID_EPOCH_OFFSET) / 1e7
+    except (ValueError, TypeError):
+        return time.time()
+
+
+METADATA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS thread_metadata (
+    thread_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    title TEXT,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_thread_metadata_updated_at
+    ON thread_metadata (updated_at DESC);
+"""
+
+# Text of the messages the chat UI shows (user turns and assistant answers), one row
+# per message at its position (seq) in the thread, so history pages are plain range reads
+MESSAGES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS thread_messages (
+    id INTEGER PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_thread_messages_thread_seq
+    ON thread_messages (thread_id, seq);
+"""
+
+# Full-text index over thread_messages, kept in sync by triggers (an upsert
+# rather than INSERT OR REPLACE, whose implicit delete would skip them)
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS thread_messages_fts USING fts5(
+    content, content='thread_messages', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS thread_messages_fts_insert AFTER INSERT ON thread_messages BEGIN
+    INSERT INTO thread_messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS thread_messages_fts_delete AFTER DELETE ON thread_messages BEGIN
+    INSERT INTO thread_messages_fts (thread_messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS thread_messages_fts_update AFTER UPDATE ON thread_messages BEGIN
+    INSERT INTO thread_messages_fts (thread_messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO thread_messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+"""
+
+SCHEMA = METADATA_SCHEMA + MESSAGES_SCHEMA + SEARCH_SCHEMA
+SEARCH_INDEX_EXISTS_SQL = "SELECT 1 FROM sqlite_master WHERE name = 'thread_messages_fts'"
+REBUILD_SEARCH_INDEX_SQL = "INSERT INTO thread_messages_fts (thread_messages_fts) VALUES ('rebuild')"
+UNINDEXED_THREADS_SQL = (
+    "SELECT thread_id FROM thread_metadata WHERE thread_id NOT IN (SELECT thread_id FROM thread_messages)"
+)
+LATEST_CHECKPOINT_SQL = (
+    "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = '' "
+    "ORDER BY checkpoint_id DESC LIMIT 1"
+)
+# The row SqliteSaver.put writes; the savers below write it themselves so the
+# checkpoint and its index rows commit in one transaction
+CHECKPOINT_INSERT_SQL = (
+    "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, "
+    "checkpoint, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+FILL_TITLE_SQL = "UPDATE thread_metadata SET title = ? WHERE thread_id = ? AND title IS NULL"
+
+LAST_SEQ_SQL = "SELECT MAX(seq) FROM thread_messages WHERE thread_id = ?"
+INSERT_MESSAGE_SQL = (
+    "INSERT INTO thread_messages (thread_id, seq, role, content) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(thread_id, seq) DO UPDATE SET role = excluded.role, content = excluded.content"
+)
+MESSAGE_PAGE_SQL = (
+    "SELECT seq, role, content FROM thread_messages WHERE thread_id = ? AND seq < ? "
+    "ORDER BY seq DESC LIMIT ?"
+)
+# Cursor meaning "from the newest message"
+_NEWEST = 2**62
+
+# Matching messages, newest first. FTS5 walks its index in rowid order, so the
+# caller can stop after the first `limit` threads instead of ranking every hit
+SEARCH_SQL = """
+SELECT m.id, m.thread_id, m.seq, m.role, m.content, meta.title, meta.updated_at
+FROM thread_messages_fts
+JOIN thread_messages m ON m.id = thread_messages_fts.rowid
+LEFT JOIN thread_metadata meta ON meta.thread_id = m.thread_id
+WHERE thread_messages_fts MATCH ?
+ORDER BY thread_messages_fts.rowid DESC
+"""
+
+LIST_THREADS_SQL = (
+    "SELECT thread_id, created_at, updated_at, title, message_count FROM thread_metadata "
+    "ORDER BY updated_at DESC LIMIT ? OFFSET ?"
+)
+
+
+def make_title(messages):
+    """Title for a thread: the start of its first user message."""
+    for message in messages:
+        if isinstance(message, HumanMessage) and isinstance(message.content, str) and message.content.strip():
+            title = " ".join(message.content.split())
+            if len(title) > TITLE_MAX_LENGTH:
+                title = title[:TITLE_MAX_LENGTH - 1].rstrip() + "…"
+            return title
+    return None
+
+
+def display_text(message):
+    """(role, text) of a message as the chat UI shows it, or None for tool traffic."""
+    if isinstance(message, HumanMessage):
+        role = "user"
+    elif isinstance(message, AIMessage) and getattr(message, "tool_call_id", None) is None:
+        # Older threads tagged tool-result AIMessages with a tool_call_id
+        role = "assistant"
+    else:
+        return None
+    content = message.content
+    if not isinstance(content, str):
+        content = "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content if isinstance(part, (str, dict))
+        )
+    if role == "assistant" and not content:
+        return None
+    return role, content
+
+
+def message_index_statements(thread_id, messages, last_seq):
+    """
+    (sql, rows) pairs bringing thread_messages up to date with a checkpoint's
+    messages, given the highest seq already indexed (None if none). Only
+    messages after last_seq are looked at, so a write costs O(new messages).
+    """
+    start = 0 if last_seq is None else last_seq + 1
+    statements = []
+    if last_seq is not None and len(messages) <= last_seq:
+        # Messages were removed from the thread: index it again from scratch
+        statements.append(("DELETE FROM thread_messages WHERE thread_id = ?", [(thread_id,)]))
+        start = 0
+    rows = []
+    for seq in range(start, len(messages)):
+        shown = display_text(messages[seq])
+        if shown is not None:
+            rows.append((thread_id, seq, *shown))
+    if rows:
+        statements.append((INSERT_MESSAGE_SQL, rows))
+    return statements
+
+
+def search_query(text):
+    """
+    FTS5 query for free text typed by a user: every word must appear, as a
+    word prefix. None if the text has no words. Quoting each word keeps FTS5
+    syntax (quotes, AND/OR, column filters) out of user input.
+    """
+    words = _WORD.findall(text or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _newest_hit_per_thread(rows, limit):
+    """The first (newest) row of each thread, up to limit threads; stops reading there."""
+    hits = {}
+    for row in rows:
+        if row[1] not in hits:
+            hits[row[1]] = row
+            if len(hits) >= limit:
+                break
+    return list(hits.values())
+
+
+def _fold(text):
+    """Lowercase without accents, matching the index's remove_diacritics tokenizer."""
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)).casefold()
+
+
+def make_snippet(content, query):
+    """
+    About SNIPPET_WORDS words of content around the first word matching the
+    query, matching words in **bold**. Built here rather than with FTS5's
+    snippet(), which re-runs the match per row and costs milliseconds each.
+    """
+    prefixes = [_fold(word) for word in _WORD.findall(query)]
+    tokens = content.split()
+    matched = [
+        any(word.startswith(prefix) for word in _WORD.findall(_fold(token)) for prefix in prefixes)
+        for token in tokens
+    ]
+    first = matched.index(True) if True in matched else 0
+    start = max(0, first - SNIPPET_WORDS // 3)
+    end = start + SNIPPET_WORDS
+    shown = [f"**{token}**" if hit else token for token, hit in zip(tokens[start:end], matched[start:end])]
+    return ("… " if start else "") + " ".join(shown) + (" …" if end < len(tokens) else "")
+
+
+def _search_results(hits, query):
+    return [
+        {
+            "thread_id": thread_id,
+            "title": title,
+            "updated_at": updated_at,
+            "seq": seq,
+            "role": role,
+            "snippet": make_snippet(content, query),
+        }
+        for _, thread_id, seq, role, content, title, updated_at in hits
+    ]
+
+
+def _checkpoint_messages(checkpoint):
+    return checkpoint.get("channel_values", {}).get("messages")
+
+
+def _message_page(rows, limit):
+    """Page dict from up to limit + 1 rows read newest first."""
+    page = rows[:limit][::-1]
+    return {
+        "messages": [{"seq": seq, "role": role, "content": content} for seq, role, content in page],
+        # Pass back as `before` to get the next older page; None when there is none
+        "cursor": page[0][0] if len(rows) > limit else None,
+    }
+
+
+class IndexedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver that keeps a thread_metadata table up to date on every checkpoint
+    write, so listing threads never has to deserialize checkpoints.
+    """
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        search_index_existed = self.conn.execute(SEARCH_INDEX_EXISTS_SQL).fetchone() is not None
+        self.conn.executescript(SCHEMA)
+        self._backfill_thread_metadata()
+        if not search_index_existed:
+            self.conn.execute(REBUILD_SEARCH_INDEX_SQL)
+            self._backfill_message_index()
+        self.conn.commit()
+
+    def _backfill_thread_metadata(self):
+        """Index threads written before the metadata table existed."""
+        rows = self.conn.execute(
+            "SELECT thread_id, MIN(checkpoint_id), MAX(checkpoint_id) FROM checkpoints "
+            "WHERE thread_id NOT IN (SELECT thread_id FROM thread_metadata) GROUP BY thread_id"
+        ).fetchall()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO thread_metadata (thread_id, created_at, updated_at) VALUES (?, ?, ?)",
+            [
+                (thread_id, _checkpoint_timestamp(first_id), _checkpoint_timestamp(last_id))
+                for thread_id, first_id, last_id in rows
+            ],
+        )
+
+    def _backfill_message_index(self):
+        """
+        Index the messages of threads written before the search index existed.
+        Runs once, when the index is created; later writes index themselves.
+        """
+        cur = self.conn.cursor()
+        for (thread_id,) in cur.execute(UNINDEXED_THREADS_SQL).fetchall():
+            row = cur.execute(LATEST_CHECKPOINT_SQL, (thread_id,)).fetchone()
+            messages = _checkpoint_messages(self.serde.loads_typed(row)) if row else None
+            if messages:
+                self._index_messages(cur, thread_id, messages)
+                cur.execute(FILL_TITLE_SQL, (make_title(messages), thread_id))
+        cur.close()
+
+    def get_tuple(self, config):
+        with metrics.span("db", op="checkpoint_read"):
+            return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        # One transaction: search and paging never fall behind a saved checkpoint
+        row = checkpoint_row(self.serde, config, checkpoint, metadata)
+        upsert = metadata_upsert(config, checkpoint)
+        messages = _checkpoint_messages(checkpoint)
+        with metrics.span("db", op="checkpoint_write"), self.cursor() as cur:
+            try:
+                cur.execute(CHECKPOINT_INSERT_SQL, row)
+                if upsert is not None:
+                    cur.execute(*upsert)
+                    if messages is not None:
+                        self._index_messages(cur, row[0], messages)
+            except BaseException:
+                self.conn.rollback()
+                raise
+        return next_checkpoint_config(config, checkpoint)
+
+    @staticmethod
+    def _index_messages(cur, thread_id, messages):
+        cur.execute(LAST_SEQ_SQL, (thread_id,))
+        for sql, rows in message_index_statements(thread_id, messages, cur.fetchone()[0]):
+            cur.executemany(sql, rows)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with metrics.span("db", op="delete_thread"):
+            super().delete_thread(thread_id)
+            with self.cursor() as cur:
+                cur.execute("DELETE FROM thread_metadata WHERE thread_id = ?", (str(thread_id),))
+                cur.execute("DELETE FROM thread_messages WHERE thread_id = ?", (str(thread_id),))
+
+    def list_threads(self, limit=None, offset=0):
+        """Thread metadata rows ordered by most recently updated first."""
+        with metrics.span("db", op="list_threads"), self.cursor(transaction=False) as cur:
+            cur.execute(LIST_THREADS_SQL, (-1 if limit is None else limit, offset))
+            return [_thread_row(row) for row in cur.fetchall()]
+
+    def thread_version(self, thread_id):
+        """updated_at of a thread, or None if it has no metadata."""
+        with self.cursor(transaction=False) as cur:
+            cur.execute("SELECT updated_at FROM thread_metadata WHERE thread_id = ?", (str(thread_id),))
+            row = cur.fetchone()
+        return row[0] if row else None
+
+    def message_page(self, thread_id, limit=20, before=None):
+        """
+        The last `limit` displayable messages of a thread before the `before`
+        cursor (newest page when None), oldest first, plus the cursor of the
+        next older page. No checkpoint is deserialized, except once for a
+        thread written before the message index existed.
+        """
+        thread_id = str(thread_id)
+        with metrics.span("db", op="message_page"):
+            rows = self._read_page(thread_id, limit, before)
+            if not rows and before is None and self._index_from_checkpoint(thread_id):
+                rows = self._read_page(thread_id, limit, before)
+        return _message_page(rows, limit)
+
+    def _read_page(self, thread_id, limit, before):
+        with self.cursor(transaction=False) as cur:
+            cur.execute(MESSAGE_PAGE_SQL, (thread_id, _NEWEST if before is None else before, limit + 1))
+            return cur.fetchall()
+
+    def _index_from_checkpoint(self, thread_id):
+        """Index the messages of the thread's latest checkpoint. False if it has none."""
+        checkpoint_tuple = self.get_tuple({"configurable": {"thread_id": thread_id}})
+        messages = _checkpoint_messages(checkpoint_tuple.checkpoint) if checkpoint_tuple else None
+        if not messages:
+            return False
+        with self.cursor() as cur:
+            self._index_messages(cur, thread_id, messages)
+            cur.execute(FILL_TITLE_SQL, (make_title(messages), thread_id))
+        return True
+
+    def search_threads(self, query, limit=10):
+        """
+        Threads whose user or assistant messages match every word of `query`
+        (prefix match), most recent match first, each with its title and a
+        snippet of that message. Reading stops once `limit` threads are found,
+        so common words cost no more than rare ones.
+        """
+        match = search_query(query)
+        if match is None:
+            return []
+        with metrics.span("db", op="search_threads"), self.cursor(transaction=False) as cur:
+            hits = _newest_hit_per_thread(cur.execute(SEARCH_SQL, (match,)), limit)
+        return _search_results(hits, query)
+
+
+class IndexedAsyncSqliteSaver(AsyncSqliteSaver):
+    """AsyncSqliteSaver that maintains the same thread_metadata table."""
+
+    _metadata_ready = False
+
+    async def setup(self) -> None:
+        if self._metadata_ready:
+            return
+        await super().setup()
+        async with self.lock:
+            if not self._metadata_ready:
+                async with self.conn.execute(SEARCH_INDEX_EXISTS_SQL) as cur:
+                    search_index_existed = await cur.fetchone() is not None
+                await self.conn.executescript(SCHEMA)
+                if not search_index_existed:
+                    await self.conn.execute(REBUILD_SEARCH_INDEX_SQL)
+                    await self._abackfill_message_index()
+                await self.conn.commit()
+                self._metadata_ready = True
+
+    async def _abackfill_message_index(self):
+        """Async _backfill_message_index; the caller holds self.lock."""
+        async with self.conn.execute(UNINDEXED_THREADS_SQL) as cur:
+            thread_ids = [row[0] async for row in cur]
+        for thread_id in thread_ids:
+            async with self.conn.execute(LATEST_CHECKPOINT_SQL, (thread_id,)) as cur:
+                row = await cur.fetchone()
+            messages = _checkpoint_messages(self.serde.loads_typed(row)) if row else None
+            if messages:
+                await self._aindex_messages(thread_id, messages)
+                await self.conn.execute(FILL_TITLE_SQL, (make_title(messages), thread_id))
+
+    async def aget_tuple(self, config):
+        with metrics.span("db", op="checkpoint_read"):
+            return await super().aget_tuple(config)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        await self.setup()
+        row = checkpoint_row(self.serde, config, checkpoint, metadata)
+        upsert = metadata_upsert(config, checkpoint)
+        messages = _checkpoint_messages(checkpoint)
+        with metrics.span("db", op="checkpoint_write"):
+            async with self.lock:
+                try:
+                    await self.conn.execute(CHECKPOINT_INSERT_SQL, row)
+                    if upsert is not None:
+                        await self.conn.execute(*upsert)
+                        if messages is not None:
+                            await self._aindex_messages(row[0], messages)
+                except BaseException:
+                    await self.conn.rollback()
+                    raise
+                await self.conn.commit()
+        return next_checkpoint_config(config, checkpoint)
+
+    async def _aindex_messages(self, thread_id, messages):
+        """Caller holds self.lock and commits."""
+        async with self.conn.execute(LAST_SEQ_SQL, (thread_id,)) as cur:
+            (last_seq,) = await cur.fetchone()
+        for sql, rows in message_index_statements(thread_id, messages, last_seq):
+            await self.conn.executemany(sql, rows)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        with metrics.span("db", op="delete_thread"):
+            await super().adelete_thread(thread_id)
+            async with self.lock:
+                await self.conn.execute("DELETE FROM thread_metadata WHERE thread_id = ?", (str(thread_id),))
+                await self.conn.execute("DELETE FROM thread_messages WHERE thread_id = ?", (str(thread_id),))
+                await self.conn.commit()
+
+    async def alist_threads(self, limit=None, offset=0):
+        """Thread metadata rows ordered by most recently updated first."""
+        await self.setup()
+        with metrics.span("db", op="list_threads"):
+            async with self.lock, self.conn.execute(
+                LIST_THREADS_SQL, (-1 if limit is None else limit, offset)
+            ) as cur:
+                return [_thread_row(row) async for row in cur]
+
+    async def amessage_page(self, thread_id, limit=20, before=None):
+        """Async message_page."""
+        await self.setup()
+        thread_id = str(thread_id)
+        with metrics.span("db", op="message_page"):
+            rows = await self._aread_page(thread_id, limit, before)
+            if not rows and before is None and await self._aindex_from_checkpoint(thread_id):
+                rows = await self._aread_page(thread_id, limit, before)
+        return _message_page(rows, limit)
+
+    async def _aread_page(self, thread_id, limit, before):
+        async with self.lock, self.conn.execute(
+            MESSAGE_PAGE_SQL, (thread_id, _NEWEST if before is None else before, limit + 1)
+        ) as cur:
+            return await cur.fetchall()
+
+    async def _aindex_from_checkpoint(self, thread_id):
+        checkpoint_tuple = await self.aget_tuple({"configurable": {"thread_id": thread_id}})
+        messages = _checkpoint_messages(checkpoint_tuple.checkpoint) if checkpoint_tuple else None
+        if not messages:
+            return False
+        async with self.lock:
+            await self._aindex_messages(thread_id, messages)
+            await self.conn.execute(FILL_TITLE_SQL, (make_title(messages), thread_id))
+            await self.conn.commit()
+        return True
+
+    async def asearch_threads(self, query, limit=10):
+        """Async search_threads."""
+        await self.setup()
+        match = search_query(query)
+        if match is None:
+            return []
+        with metrics.span("db", op="search_threads"):
+            async with self.lock:
+                hits = {}
+                async with self.conn.execute(SEARCH_SQL, (match,)) as cur:
+                    async for row in cur:
+                        hits.setdefault(row[1], row)
+                        if len(hits) >= limit:
+                            break
+        return _search_results(list(hits.values()), query)
+
+
+def _thread_row(row):
+    thread_id, created_at, updated_at, title, message_count = row
+    return {
+        "thread_id": thread_id,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "title": title,
+        "message_count": message_count,
+    }
+
+
+def checkpoint_row(serde, config, checkpoint, metadata):
+    """Parameters of CHECKPOINT_INSERT_SQL, serialized the way SqliteSaver.put does."""
+    type_, serialized_checkpoint = serde.dumps_typed(checkpoint)
+    serialized_metadata = json.dumps(
+        get_checkpoint_metadata(config, metadata), ensure_ascii=False
+    ).encode("utf-8", "ignore")
+    return (
+        str(config["configurable"]["thread_id"]),
+        config["configurable"]["checkpoint_ns"],
+        checkpoint["id"],
+        config["configurable"].get("checkpoint_id"),
+        type_,
+        serialized_checkpoint,
+        serialized_metadata,
+    )
+
+
+def next_checkpoint_config(config, checkpoint):
+    return {
+        "configurable": {
+            "thread_id": config["configurable"]["thread_id"],
+            "checkpoint_ns": config["configurable"]["checkpoint_ns"],
+            "checkpoint_id": checkpoint["id"],
+        }
+    }
+
+
+def metadata_upsert(config, checkpoint):
+    """(sql, params) recording a checkpoint write in thread_metadata, or None for subgraphs."""
+    if config["configurable"].get("checkpoint_ns", ""):
+        # Subgraph checkpoints belong to their parent thread's history
+        return None
+    thread_id = str(config["configurable"]["thread_id"])
+    messages = checkpoint.get("channel_values", {}).get("messages")
+    now = time.time()
+    if messages is None:
+        return (
+            "INSERT INTO thread_metadata (thread_id, created_at, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(thread_id) DO UPDATE SET updated_at = excluded.updated_at",
+            (thread_id, now, now),
+        )
+    return (
+        "INSERT INTO thread_metadata (thread_id, created_at, updated_at, title, message_count) "
+        "VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(thread_id) DO UPDATE SET updated_at = excluded.updated_at, "
+        "message_count = excluded.message_count, "
+        "title = COALESCE(thread_metadata.title, excluded.title)",
+        (thread_id, now, now, make_title(messages), len(messages)),
+    )
@@ -0,0 +1,243 @@
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from single_flight import single_flight
+from tool_results import dump, is_mock, load, status_of
+
+# =========================Cache Settings======================
+DEFAULT_CACHE_SIZE = int(os.getenv("TOOL_CACHE_SIZE", "512"))
+# Set TOOL_CACHE_DB to a file path to share cached results across Streamlit workers
+DEFAULT_CACHE_DB = os.getenv("TOOL_CACHE_DB", "")
+# Expired rows of the shared tier are deleted once every this many writes
+PRUNE_EVERY = 256
+
+# Freshness policy for cached entries that are not tools, in seconds; each
+# tool's TTL is registered with the tool (cache_ttl in the tool registry)
+TOOL_TTLS = {
+    "exchange_rates": 5 * 60,
+}
+
+
+def make_key(tool_name, args):
+    """Build a cache key from the tool name and its normalized arguments."""
+    normalized = {}
+    for name, value in args.items():
+        if isinstance(value, str):
+            value = value.strip().lower()
+        elif isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        normalized[name] = value
+    return f"{tool_name}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+class TTLCache:
+    """In-memory LRU cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SqliteCacheTier:
+    """Second cache tier stored in SQLite so several processes can share results."""
+
+    def __init__(self, path, prune_every=PRUNE_EVERY):
+        self.path = path
+        self.prune_every = prune_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """(value, expires_at) for a fresh entry, or None."""
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM tool_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return load(json.loads(row[0])), row[1]
+
+    def set(self, key, value, ttl):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO tool_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(dump(value)), time.time() + ttl),
+        )
+        conn.commit()
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.prune_every == 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """Delete expired rows. Returns the number of rows removed."""
+        conn = self._conn()
+        cursor = conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (time.time(),))
+        conn.commit()
+        return cursor.rowcount
+
+
+class ToolCache:
+    """
+    Response cache for external-API tools: an in-memory LRU tier backed by an
+    optional shared SQLite tier. Hit/miss counters are kept per tool.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, db_path=DEFAULT_CACHE_DB, ttls=None):
+        self.memory = TTLCache(maxsize)
+        self.shared = SqliteCacheTier(db_path) if db_path else None
+        self.ttls = dict(TOOL_TTLS if ttls is None else ttls)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _count(self, tool_name, field):
+        with self._lock:
+            counters = self._counters.setdefault(tool_name, {"hits": 0, "misses": 0})
+            counters[field] += 1
+
+    def get(self, tool_name, args):
+        key = make_key(tool_name, args)
+        value = self.memory.get(key)
+        if value is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                # Only the entry's remaining lifetime, so it never outlives its TTL
+                self.memory.set(key, value, expires_at - time.time())
+        self._count(tool_name, "hits" if value is not None else "misses")
+        return value
+
+    def set(self, tool_name, args, value):
+        ttl = self.ttls.get(tool_name, 0)
+        # Only successful real results are cached; errors, config warnings and
+        # mock fallbacks are retried, so they end as soon as the upstream recovers
+        if ttl <= 0 or status_of(value) != "success" or is_mock(value):
+            return
+        key = make_key(tool_name, args)
+        self.memory.set(key, value, ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, ttl)
+
+    def stats(self):
+        """Hit/miss counters per tool plus overall totals, for monitoring."""
+        with self._lock:
+            per_tool = {name: dict(counters) for name, counters in self._counters.items()}
+        hits = sum(c["hits"] for c in per_tool.values())
+        misses = sum(c["misses"] for c in per_tool.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "size": len(self.memory),
+            "evictions": self.memory.evictions,
+            "tools": per_tool,
+        }
+
+    def clear(self):
+        self.memory.clear()
+        with self._lock:
+            self._counters.clear()
+
+
+tool_cache = ToolCache()
+
+
+def cached_tool(tool_name, cache=None, flight=None):
+    """
+    Decorator that serves a tool's result from the cache while it is fresh.
+    On a miss, concurrent identical calls (sync or async) share one upstream
+    request. Apply it underneath @tool so the tool schema still comes from the function.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def arguments(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                active_cache = cache or tool_cache
+                call_args = arguments(args, kwargs)
+                cached = active_cache.get(tool_name, call_args)
+                if cached is not None:
+                    return cached
+
+                async def fetch():
+                    result = await func(*args, **kwargs)
+                    active_cache.set(tool_name, call_args, result)
+                    return result
+
+                return await (flight or single_flight).ado(make_key(tool_name, call_args), fetch)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            active_cache = cache or tool_cache
+            call_args = arguments(args, kwargs)
+            cached = active_cache.get(tool_name, call_args)
+            if cached is not None:
+                return cached
+
+            def fetch():
+                result = func(*args, **kwargs)
+                active_cache.set(tool_name, call_args, result)
+                return result
+
+            return (flight or single_flight).do(make_key(tool_name, call_args), fetch)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,131 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# =========================Executor Settings======================
+DEFAULT_MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", "8"))
+DEFAULT_TURN_DEADLINE = float(os.getenv("TOOL_TURN_DEADLINE", "20"))
+DEFAULT_PER_TOOL_LIMIT = 4
+
+
+class ToolExecutor:
+    """
+    Runs the tool calls of a single turn concurrently on a bounded thread pool.
+    Results are returned in the same order as the tool calls were requested.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, turn_deadline=DEFAULT_TURN_DEADLINE,
+                 per_tool_limits=None, default_per_tool_limit=DEFAULT_PER_TOOL_LIMIT, per_tool_timeouts=None):
+        self.max_workers = max_workers
+        self.turn_deadline = turn_deadline
+        self.per_tool_limits = dict(per_tool_limits or {})
+        self.default_per_tool_limit = default_per_tool_limit
+        self.per_tool_timeouts = dict(per_tool_timeouts or {})
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._semaphores = {}
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self, tool_name):
+        """Get (or lazily create) the concurrency cap for a tool."""
+        with self._lock:
+            if tool_name not in self._semaphores:
+                limit = self.per_tool_limits.get(tool_name, self.default_per_tool_limit)
+                self._semaphores[tool_name] = threading.BoundedSemaphore(limit)
+            return self._semaphores[tool_name]
+
+    def _run_one(self, tool_call, invoke, deadline):
+        semaphore = self._semaphore(tool_call["name"])
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not semaphore.acquire(timeout=remaining):
+            raise TimeoutError(f"{tool_call['name']} did not start before the turn deadline")
+        try:
+            return invoke(tool_call)
+        finally:
+            semaphore.release()
+
+    def time_limit(self, tool_name):
+        """Seconds a call may take: the tool's own timeout, capped by the turn deadline."""
+        return min(self.turn_deadline, self.per_tool_timeouts.get(tool_name, self.turn_deadline))
+
+    def run(self, tool_calls, invoke):
+        """
+        Execute invoke(tool_call) for every tool call and wait for all of them,
+        up to the per-turn deadline (or the tool's shorter timeout). Calls that
+        fail or time out get an error string in their slot so every
+        tool_call_id still receives a result.
+        """
+        if not tool_calls:
+            return []
+        started = time.monotonic()
+        deadline = started + self.turn_deadline
+        # Each call runs in a copy of the caller's context so metrics spans keep the turn they belong to
+        futures = [
+            self._pool.submit(contextvars.copy_context().run, self._run_one, tool_call, invoke, deadline)
+            for tool_call in tool_calls
+        ]
+
+        results = []
+        for tool_call, future in zip(tool_calls, futures):
+            limit = self.time_limit(tool_call["name"])
+            try:
+                results.append(future.result(timeout=max(0.0, started + limit - time.monotonic())))
+            except (TimeoutError, FutureTimeoutError) as e:
+                if future.done():
+                    results.append(f"❌ Error: {str(e)}")
+                else:
+                    future.cancel()
+                    results.append(f"❌ Error: {tool_call['name']} timed out after {limit:g}s")
+            except Exception as e:
+                results.append(f"❌ Error running {tool_call['name']}: {str(e)}")
+        return results
+
+    def _async_semaphore(self, tool_name):
+        """Per-tool cap for the async path; asyncio primitives belong to one event loop."""
+        semaphores = self._async_semaphores.setdefault(asyncio.get_running_loop(), {})
+        if tool_name not in semaphores:
+            limit = self.per_tool_limits.get(tool_name, self.default_per_tool_limit)
+            semaphores[tool_name] = asyncio.Semaphore(limit)
+        return semaphores[tool_name]
+
+    async def _arun_one(self, tool_call, ainvoke):
+        async with self._async_semaphore(tool_call["name"]):
+            timeout = self.per_tool_timeouts.get(tool_call["name"])
+            if timeout is None or timeout >= self.turn_deadline:
+                return await ainvoke(tool_call)
+            try:
+                return await asyncio.wait_for(ainvoke(tool_call), timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"{tool_call['name']} timed out after {timeout:g}s") from None
+
+    async def arun(self, tool_calls, ainvoke):
+        """
+        Async counterpart of run(): awaits ainvoke(tool_call) for every tool call
+        on the running event loop, with the same deadline, caps and ordering.
+        """
+        if not tool_calls:
+            return []
+        tasks = [asyncio.ensure_future(self._arun_one(tool_call, ainvoke)) for tool_call in tool_calls]
+        done, pending = await asyncio.wait(tasks, timeout=self.turn_deadline)
+        for task in pending:
+            task.cancel()
+
+        results = []
+        for tool_call, task in zip(tool_calls, tasks):
+            if task not in done:
+                results.append(f"❌ Error: {tool_call['name']} timed out after {self.turn_deadline:g}s")
+                continue
+            try:
+                results.append(task.result())
+            except TimeoutError as e:
+                results.append(f"❌ Error: {str(e)}")
+            except Exception as e:
+                results.append(f"❌ Error running {tool_call['name']}: {str(e)}")
+        return results
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
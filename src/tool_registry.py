@@ -0,0 +1,138 @@
+import os
+import threading
+from importlib import import_module
+from importlib.metadata import entry_points
+
+from metrics import metrics
+
+# =========================Registry Settings======================
+# Comma-separated tool names to expose to the LLM; empty enables every registered
+# tool. Fewer bound tools means a smaller schema in every prompt.
+ENABLED_TOOLS = os.getenv("ENABLED_TOOLS", "")
+# Extra "module:attribute" plugins to load besides installed entry points
+TOOL_PLUGINS = os.getenv("TOOL_PLUGINS", "")
+ENTRY_POINT_GROUP = "chatbot.tools"
+DEFAULT_ICON = "🔧"
+
+# local: no network; free: public API without a key;
+# quota: keyed free tier with tight limits; metered: billed per call
+COST_CLASSES = ("local", "free", "quota", "metered")
+
+
+def parse_names(value):
+    """Set of names from a comma-separated string (empty string -> empty set)."""
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class ToolSpec:
+    """A tool plus everything the app needs to know about it."""
+
+    def __init__(self, tool, icon=DEFAULT_ICON, display_name=None, cache_ttl=0, max_concurrency=None,
+                 timeout=None, cost_class="free", provider=None):
+        if cost_class not in COST_CLASSES:
+            raise ValueError(f"Unknown cost class {cost_class!r}; use one of {', '.join(COST_CLASSES)}")
+        self.tool = tool
+        self.name = tool.name
+        self.icon = icon
+        self.display_name = display_name or tool.name
+        # Seconds a result stays fresh in the tool cache (0 = never cached)
+        self.cache_ttl = cache_ttl
+        # Simultaneous calls per turn (None = executor default)
+        self.max_concurrency = max_concurrency
+        # Seconds before a running call is abandoned (None = turn deadline)
+        self.timeout = timeout
+        self.cost_class = cost_class
+        # Resilience provider that guards the whole call, for clients doing their own HTTP
+        self.provider = provider
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "icon": self.icon,
+            "display_name": self.display_name,
+            "cache_ttl": self.cache_ttl,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
+            "cost_class": self.cost_class,
+            "provider": self.provider,
+        }
+
+
+class ToolRegistry:
+    """
+    Name-indexed tool catalog. Tools register with their metadata; a deployment
+    can enable only a subset, and plugins add tools through the "chatbot.tools"
+    entry point group (or TOOL_PLUGINS). An entry point resolves to a tool or to
+    a callable that receives the registry.
+    """
+
+    def __init__(self, enabled=None):
+        self._specs = {}
+        self._lock = threading.Lock()
+        self._enabled = parse_names(ENABLED_TOOLS) if enabled is None else set(enabled)
+
+    def register(self, tool, **metadata):
+        spec = ToolSpec(tool, **metadata)
+        with self._lock:
+            if spec.name in self._specs:
+                raise ValueError(f"Tool {spec.name!r} is already registered")
+            self._specs[spec.name] = spec
+        return spec
+
+    def is_enabled(self, name):
+        return name in self._specs and (not self._enabled or name in self._enabled)
+
+    def get(self, name):
+        """Spec of an enabled tool, or None."""
+        return self._specs[name] if self.is_enabled(name) else None
+
+    def tool(self, name):
+        spec = self.get(name)
+        return spec.tool if spec is not None else None
+
+    def specs(self):
+        """Enabled specs in registration order."""
+        with self._lock:
+            specs = list(self._specs.values())
+        return [spec for spec in specs if self.is_enabled(spec.name)]
+
+    def tools(self):
+        return [spec.tool for spec in self.specs()]
+
+    def names(self):
+        return [spec.name for spec in self.specs()]
+
+    def icon(self, name):
+        spec = self._specs.get(name)
+        return spec.icon if spec is not None else DEFAULT_ICON
+
+    def display_name(self, name):
+        spec = self._specs.get(name)
+        return spec.display_name if spec is not None else name
+
+    def describe(self):
+        return {spec.name: spec.describe() for spec in self.specs()}
+
+    def _load(self, plugin, source):
+        if hasattr(plugin, "name") and hasattr(plugin, "invoke"):
+            self.register(plugin)
+        elif callable(plugin):
+            plugin(self)
+        else:
+            raise TypeError(f"{source} is neither a tool nor a register(registry) callable")
+
+    def load_plugins(self, group=ENTRY_POINT_GROUP, modules=TOOL_PLUGINS):
+        """Register tools from installed entry points and "module:attribute" paths. Returns how many loaded."""
+        sources = [(entry_point.name, entry_point.load) for entry_point in entry_points(group=group)]
+        for path in parse_names(modules):
+            module_name, _, attribute = path.partition(":")
+            sources.append((path, lambda m=module_name, a=attribute: getattr(import_module(m), a or "register")))
+
+        loaded = 0
+        for source, load in sources:
+            try:
+                self._load(load(), source)
+                loaded += 1
+            except Exception as e:
+                metrics.error("load_plugins", e, f"Error loading tool plugin {source}: {e}")
+        return loaded
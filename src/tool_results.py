@@ -0,0 +1,168 @@
+import csv
+import io
+import re
+
+# =========================Result Status======================
+# Results with these prefixes are errors or config warnings; plain-string
+# results (plugins, executor timeouts) are classified by them
+ERROR_PREFIX = "❌"
+WARNING_PREFIX = "⚠️"
+UNCACHEABLE_PREFIXES = (ERROR_PREFIX, WARNING_PREFIX)
+
+# Emoji, pictographs and markdown emphasis only dress up the UI text
+_DECORATION = re.compile(r"[\u2600-\u27bf\u2b00-\u2bff\U0001f000-\U0001faff\ufe0f]|\*\*|^• ", re.MULTILINE)
+
+
+class ToolResult(str):
+    """
+    A tool's answer: the str value is the user-facing text, so callers that
+    expect a string keep working, and `data` is the structured payload behind
+    it (None for free text). The LLM gets a compact rendering of the payload.
+    """
+
+    def __new__(cls, text, data=None, status=None):
+        result = super().__new__(cls, text)
+        result.data = data
+        result.status = status or _status_from_text(text)
+        return result
+
+    def __reduce__(self):
+        return ToolResult, (str(self), self.data, self.status)
+
+
+def _status_from_text(text):
+    if text.startswith(ERROR_PREFIX):
+        return "error"
+    if text.startswith(WARNING_PREFIX):
+        return "warning"
+    return "success"
+
+
+def status_of(result):
+    """"success", "warning" or "error" for a ToolResult or a plain string result."""
+    if isinstance(result, ToolResult):
+        return result.status
+    if not isinstance(result, str) or not result:
+        return "error"
+    return _status_from_text(result)
+
+
+def is_mock(result):
+    """True when a result, or any item of a batch, is made-up fallback data."""
+    data = getattr(result, "data", None)
+    if not isinstance(data, dict):
+        return False
+    items = data.get("items") or []
+    return bool(data.get("mock")) or any(isinstance(item, dict) and item.get("mock") for item in items)
+
+
+def combine(results, separator="\n"):
+    """
+    One result for a batch: the item texts joined (identical lines, e.g. the
+    same missing-key warning for every item, shown once) and the item payloads
+    listed. Succeeds when any item did.
+    """
+    results = list(results)
+    text = separator.join(dict.fromkeys(results))
+    statuses = [status_of(result) for result in results]
+    items = [_item(result, status) for result, status in zip(results, statuses)]
+    status = "success" if "success" in statuses else (statuses[0] if statuses else "error")
+    return ToolResult(text, {"items": items}, status)
+
+
+def _item(result, status):
+    data = getattr(result, "data", None)
+    if data is not None:
+        return data
+    return {"error" if status == "error" else "text": strip_decoration(result)}
+
+
+def strip_decoration(text):
+    """The text without emoji, bold markers, bullets or surrounding whitespace."""
+    lines = (" ".join(line.split()) for line in _DECORATION.sub("", text).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _value(value):
+    if isinstance(value, float):
+        return f"{value:.10g}"
+    if isinstance(value, list):
+        return "; ".join(map(_value, value))
+    return str(value)
+
+
+def _same(value, argument):
+    if isinstance(value, (int, float)) and isinstance(argument, (int, float)):
+        return float(value) == float(argument)
+    return str(value).strip().lower() == str(argument).strip().lower()
+
+
+def _table(records):
+    """
+    Records sharing the same fields, or None: fields equal in every record are
+    written once, the rest as CSV with a single header row.
+    """
+    if len(records) < 2 or not all(isinstance(record, dict) for record in records):
+        return None
+    fields = list(records[0])
+    if any(list(record) != fields for record in records):
+        return None
+    shared = {f: records[0][f] for f in fields if all(record[f] == records[0][f] for record in records)}
+    columns = [f for f in fields if f not in shared]
+    lines = [compact(shared)] if shared else []
+    if columns:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(["" if record[f] is None else _value(record[f]) for f in columns] for record in records)
+        lines.append(buffer.getvalue().rstrip("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def compact(data, args=None):
+    """
+    Terse text for a payload: "key=value" pairs on one line per record; a list
+    of records with the same fields becomes a CSV table. True flags are written
+    as the bare key, empty values are left out, and so are fields that only
+    repeat a call argument (the model already knows the city it asked about).
+    """
+    if isinstance(data, list):
+        return _table(data) or "\n".join(compact(item) for item in data)
+    if not isinstance(data, dict):
+        return _value(data)
+    args = args or {}
+    pairs, records = [], []
+    for key, value in data.items():
+        if value is None or value is False or value == "" or value == []:
+            continue
+        if key in args and _same(value, args[key]):
+            continue
+        if isinstance(value, list) and isinstance(value[0], dict):
+            records.append(compact(value))
+        elif value is True:
+            pairs.append(key)
+        else:
+            pairs.append(f"{key}={_value(value)}")
+    return "\n".join(filter(None, [" ".join(pairs), *records]))
+
+
+def for_llm(result, args=None):
+    """What the LLM sees for a tool result: the compact payload, else the undecorated text."""
+    data = getattr(result, "data", None)
+    text = compact(data, args) if data is not None else ""
+    return text or strip_decoration(str(result))
+
+
+# =========================Cache Encoding======================
+def dump(result):
+    """JSON-ready form of a result for the shared cache tier."""
+    if isinstance(result, ToolResult):
+        return {"text": str(result), "data": result.data, "status": result.status}
+    return result
+
+
+def load(value):
+    """Inverse of dump."""
+    if isinstance(value, dict) and "text" in value:
+        return ToolResult(value["text"], value.get("data"), value.get("status"))
+    return value
@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the test suite
+"""
+
+import pytest
+import sys
+import os
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Anything that falls back to the default database (storage.DB_PATH) gets a
+# throwaway file, never the repo's chatbot.db; set before storage is imported
+os.environ["CHATBOT_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="chatbot-tests-"), "chatbot.db")
+
+import langgraph_tool_backend as backend
+from fake_llm import FakeStreamingChatModel
+from storage import connect
+from thread_store import IndexedSqliteSaver
+
+
+class OfflineBackend:
+    """
+    The backend graph on a throwaway database, answering from a
+    FakeStreamingChatModel. Calling it swaps in a model with new responses.
+    """
+
+    def __init__(self, monkeypatch, path):
+        self.monkeypatch = monkeypatch
+        self.path = path
+        self.conn = connect(path)
+        self.saver = IndexedSqliteSaver(conn=self.conn)
+        self.set("checkpointer", self.saver)
+        self.set("chatbot", backend.get_graph().compile(checkpointer=self.saver))
+        self.use_responses("Hi! How can I help?")
+
+    def set(self, name, value):
+        # Through the module dict, so lazy objects (chatbot, llm_with_tools, ...) are never built
+        self.monkeypatch.setitem(vars(backend), name, value)
+
+    def use_model(self, model):
+        self.set("llm_with_tools", model)
+        return model
+
+    def use_responses(self, *responses, **options):
+        return self.use_model(FakeStreamingChatModel(responses=list(responses) or ["unused"], **options))
+
+    __call__ = use_responses
+
+
+@pytest.fixture
+def offline_backend(tmp_path, monkeypatch):
+    """Backend graph and fake LLM on a temporary database; no API keys or network needed."""
+    backend_under_test = OfflineBackend(monkeypatch, str(tmp_path / "chatbot.db"))
+    yield backend_under_test
+    backend_under_test.conn.close()
@@ -0,0 +1,167 @@
+"""
+Unit Tests for the async graph path
+Test File: tests/unit/test_async_backend.py
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+import langgraph_tool_backend as backend
+import async_backend
+
+
+@pytest.fixture
+def fake_async_backend(offline_backend, monkeypatch, tmp_path):
+    """Run the async graph offline against a temporary database."""
+    monkeypatch.setattr(async_backend, "DB_PATH", str(tmp_path / "async.db"))
+    return offline_backend
+
+
+def run(coroutine_fn):
+    """Run a test coroutine on a fresh event loop and close its checkpoint connection."""
+    async def main():
+        try:
+            return await coroutine_fn()
+        finally:
+            await async_backend.aclose()
+    return asyncio.run(main())
+
+
+class TestAsyncTurns:
+    """Test suite for arun_turn / astream_turn"""
+
+    def test_arun_turn_with_tool(self, fake_async_backend):
+        """
+        TC_ASYNC_001: A tool call runs through the async tools node and the answer is stored
+        Test Type: Positive
+        """
+        tool_call = {"name": "get_ip_location", "args": {"ip": "8.8.8.8"}, "id": "ip_1"}
+        fake_async_backend(AIMessage(content="", tool_calls=[tool_call]), "It is in Mountain View.")
+
+        async def fake_aget(url, params=None, **kwargs):
+            return type("Response", (), {"text": '{"city": "Mountain View", "country_name": "US"}'})()
+
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(backend.http_client, "aget", fake_aget)
+            state = run(lambda: async_backend.arun_turn("a1", "where is that address hosted"))
+
+        contents = [m.content for m in state["messages"]]
+        assert contents[0] == "where is that address hosted"
+        assert "Mountain View" in contents[2]
+        assert contents[-1] == "It is in Mountain View."
+
+    def test_astream_turn_events(self, fake_async_backend):
+        """
+        TC_ASYNC_002: astream_turn yields the same event types as stream_turn
+        Test Type: Positive
+        """
+        fake_async_backend("Python is a programming language.")
+
+        async def collect():
+            return [event async for event in async_backend.astream_turn("a2", "what is python")]
+
+        events = run(collect)
+        tokens = [e["content"] for e in events if e["type"] == "token"]
+        assert len(tokens) > 1
+        assert "".join(tokens) == "Python is a programming language."
+        assert events[-1]["type"] == "done"
+
+    def test_threads_listed_and_deleted(self, fake_async_backend):
+        """
+        TC_ASYNC_003: Threads written by the async graph are indexed and can be deleted
+        Test Type: Positive
+        """
+        fake_async_backend("Hi!")
+
+        async def scenario():
+            await async_backend.arun_turn("old", "first")
+            await async_backend.arun_turn("new", "second")
+            listed = await async_backend.aget_threads()
+            deleted = await async_backend.adelete_thread("old")
+            return listed, deleted, await async_backend.aget_threads()
+
+        listed, deleted, remaining = run(scenario)
+        assert listed == ["new", "old"]
+        assert deleted is True
+        assert remaining == ["new"]
+
+    def test_message_page_with_tool_call(self, fake_async_backend):
+        """
+        TC_ASYNC_006: The async history page holds the user message and the answer, not the tool traffic
+        Test Type: Positive
+        """
+        tool_call = {"name": "no_such_tool", "args": {}, "id": "bad_1"}
+        fake_async_backend(AIMessage(content="", tool_calls=[tool_call]), "Sorry.")
+
+        async def scenario():
+            await async_backend.arun_turn("a6", "do something")
+            return await async_backend.aget_message_page("a6", limit=5)
+
+        page = run(scenario)
+        assert [(type(m).__name__, m.content) for m in page["messages"]] == [
+            ("HumanMessage", "do something"), ("AIMessage", "Sorry.")
+        ]
+        assert page["cursor"] is None
+
+    def test_search_threads(self, fake_async_backend):
+        """
+        TC_ASYNC_007: Threads written by the async graph can be found by their message text
+        Test Type: Positive
+        """
+        fake_async_backend("Hi!")
+
+        async def scenario():
+            await async_backend.arun_turn("a7", "tell me about volcanoes")
+            await async_backend.arun_turn("a8", "tell me about rivers")
+            return await async_backend.asearch_threads("volcano")
+
+        [hit] = run(scenario)
+        assert hit["thread_id"] == "a7"
+        assert hit["title"] == "tell me about volcanoes"
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_resubmitted_history_does_not_rerun(self, fake_async_backend):
+        """
+        TC_ASYNC_004: Resubmitting stored history returns the stored state without an LLM call
+        Test Type: Negative
+        """
+        model = fake_async_backend("Hi!")
+
+        async def scenario():
+            state = await async_backend.arun_turn("a4", "what is python")
+            return await async_backend.arun_turn("a4", state["messages"])
+
+        state = run(scenario)
+        assert model.call_count == 1
+        assert [m.content for m in state["messages"]] == ["what is python", "Hi!"]
+
+    def test_unknown_tool_gets_error_result(self, fake_async_backend):
+        """
+        TC_ASYNC_005: A call to an unknown tool gets an error result and the turn continues
+        Test Type: Negative
+        """
+        tool_call = {"name": "no_such_tool", "args": {}, "id": "bad_1"}
+        fake_async_backend(AIMessage(content="", tool_calls=[tool_call]), "Sorry.")
+
+        state = run(lambda: async_backend.arun_turn("a5", "do something"))
+
+        assert state["messages"][-1].content == "Sorry."
+        assert len(state["messages"]) == 4
+        assert isinstance(state["messages"][2], ToolMessage)
+        assert state["messages"][2].tool_call_id == "bad_1"
+        assert state["messages"][2].status == "error"
+        assert state["messages"][2].content.startswith("Error: Unknown tool 'no_such_tool'")
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,178 @@
+"""
+Unit Tests for batched stock quotes, bulk currency conversion and batched jokes
+Test File: tests/unit/test_batch_tools.py
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+import threading
+from collections import Counter
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import langgraph_tool_backend as backend
+from resilience import Resilience
+from tool_cache import tool_cache
+
+RATES = {"USD": 1.0, "EUR": 0.9, "GBP": 0.8, "JPY": 150.0}
+PRICES = {"AAPL": 195.5, "MSFT": 380.25, "GOOGL": 142.8, "AMZN": 180.5}
+
+
+class Upstream:
+    """Stand-in for the HTTP client that answers like each provider and counts requests."""
+
+    def __init__(self):
+        self.hits = Counter()
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def respond(self, url, params):
+        with self.lock:
+            self.urls.append(url)
+            if "alphavantage" in url:
+                self.hits[f"quote:{params['symbol']}"] += 1
+                body = {"Global Quote": {"05. price": str(PRICES[params["symbol"]]), "09. change": "1.0"}}
+            elif "openexchangerates" in url:
+                self.hits["rates"] += 1
+                body = {"rates": RATES}
+            else:
+                self.hits["jokes"] += 1
+                body = {"amount": 3, "jokes": [{"joke": f"Joke {i}"} for i in range(3)]}
+        return type("Response", (), {"text": json.dumps(body)})()
+
+    def get(self, url, params=None, **kwargs):
+        return self.respond(url, params)
+
+    async def aget(self, url, params=None, **kwargs):
+        return self.respond(url, params)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    stub = Upstream()
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setenv("EXCHANGE_API_KEY", "test")
+    monkeypatch.setattr(backend.http_client, "get", stub.get)
+    monkeypatch.setattr(backend.http_client, "aget", stub.aget)
+    monkeypatch.setattr(backend, "resilience", Resilience(providers={}))
+    tool_cache.clear()
+    yield stub
+    tool_cache.clear()
+
+
+class TestBatchTools:
+    """Test suite for batch tool variants"""
+
+    def test_stock_prices_in_one_call(self, upstream):
+        """
+        TC_BATCH_001: One tool call quotes every symbol and shares the per-symbol cache
+        Test Type: Positive
+        """
+        backend.get_stock_price.invoke({"symbol": "AAPL"})
+        result = backend.get_stock_prices.invoke({"symbols": ["aapl", "MSFT", "GOOGL", "AMZN", "MSFT"]})
+
+        assert result.splitlines() == [
+            "📈 AAPL: $195.50 (Change: 1.0)",
+            "📈 MSFT: $380.25 (Change: 1.0)",
+            "📈 GOOGL: $142.80 (Change: 1.0)",
+            "📈 AMZN: $180.50 (Change: 1.0)",
+        ]
+        assert upstream.hits == Counter({"quote:AAPL": 1, "quote:MSFT": 1, "quote:GOOGL": 1, "quote:AMZN": 1})
+
+    def test_bulk_conversion_uses_one_rate_table(self, upstream):
+        """
+        TC_BATCH_002: Many-to-many conversion and later single conversions fetch the rates once
+        Test Type: Positive
+        """
+        result = backend.convert_currencies.invoke(
+            {"amount": 100, "from_currencies": ["USD", "EUR"], "to_currencies": ["EUR", "GBP", "JPY"]}
+        )
+        single = backend.convert_currency.invoke({"amount": 10, "from_currency": "GBP", "to_currency": "JPY"})
+
+        assert result.splitlines() == [
+            "💱 100.0 USD = 90.00 EUR",
+            "💱 100.0 USD = 80.00 GBP",
+            "💱 100.0 USD = 15000.00 JPY",
+            "💱 100.0 EUR = 88.89 GBP",
+            "💱 100.0 EUR = 16666.67 JPY",
+        ]
+        assert single == "💱 10.0 GBP = 1875.00 JPY"
+        assert upstream.hits == Counter({"rates": 1})
+
+    def test_jokes_are_one_request(self, upstream):
+        """
+        TC_BATCH_003: Several jokes come from a single upstream request
+        Test Type: Positive
+        """
+        result = backend.get_jokes.invoke({"count": 3, "category": "Pun"})
+
+        assert result == "😂 Joke 0\n\n😂 Joke 1\n\n😂 Joke 2"
+        assert upstream.hits == Counter({"jokes": 1})
+        assert upstream.urls == ["https://v2.jokeapi.dev/joke/Pun?type=single&amount=3"]
+
+    def test_async_batch_variants(self, upstream):
+        """
+        TC_BATCH_004: The async variants batch the same way without blocking the loop
+        Test Type: Positive
+        """
+        async def scenario():
+            return await asyncio.gather(
+                backend.get_stock_prices.ainvoke({"symbols": ["AAPL", "MSFT"]}),
+                backend.convert_currencies.ainvoke(
+                    {"amount": 1, "from_currencies": ["USD"], "to_currencies": ["EUR", "GBP"]}
+                ),
+                backend.convert_currency.ainvoke({"amount": 1, "from_currency": "EUR", "to_currency": "USD"}),
+            )
+
+        quotes, conversions, single = asyncio.run(scenario())
+        assert quotes.count("📈") == 2
+        assert conversions.splitlines() == ["💱 1.0 USD = 0.90 EUR", "💱 1.0 USD = 0.80 GBP"]
+        assert single.startswith("💱 1.0 EUR = 1.11 USD")
+        assert upstream.hits == Counter({"quote:AAPL": 1, "quote:MSFT": 1, "rates": 1})
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_too_many_symbols(self, upstream):
+        """
+        TC_BATCH_005: Oversized or empty batches are refused without calling the provider
+        Test Type: Negative
+        """
+        symbols = [f"S{i}" for i in range(backend.MAX_BATCH_ITEMS + 1)]
+        assert backend.get_stock_prices.invoke({"symbols": symbols}).startswith("❌")
+        assert backend.get_stock_prices.invoke({"symbols": []}).startswith("❌")
+        assert sum(upstream.hits.values()) == 0
+
+    def test_unknown_currency_reported_per_line(self, upstream):
+        """
+        TC_BATCH_006: An unknown currency fails only its own line and is not cached
+        Test Type: Negative
+        """
+        result = backend.convert_currencies.invoke(
+            {"amount": 5, "from_currencies": ["USD"], "to_currencies": ["EUR", "XYZ"]}
+        )
+        single = backend.convert_currency.invoke({"amount": 5, "from_currency": "USD", "to_currency": "XYZ"})
+
+        assert result.splitlines() == ["💱 5.0 USD = 4.50 EUR", "❌ Error converting currency: 'XYZ'"]
+        assert single == "❌ Error converting currency: 'XYZ'"
+        assert tool_cache.get("convert_currency", {"amount": 5, "from_currency": "USD", "to_currency": "XYZ"}) is None
+
+    def test_missing_key_warns_once(self, upstream, monkeypatch):
+        """
+        TC_BATCH_007: Without an API key the batch shows the configuration warning once
+        Test Type: Negative
+        """
+        monkeypatch.delenv("ALPHA_VANTAGE_API_KEY")
+        result = backend.get_stock_prices.invoke({"symbols": ["AAPL", "MSFT"]})
+
+        assert result == "⚠️ ALPHA_VANTAGE_API_KEY not configured. Using mock data."
+        assert sum(upstream.hits.values()) == 0
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+"""
+Unit Tests for the bounded context window
+Test File: tests/unit/test_context_manager.py
+"""
+
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
+
+from context_manager import build_prompt, compact_context, estimate_tokens, select_window
+
+
+def synthetic_turn(turn):
+    """One tool-using turn: question, tool call, bulky tool output, answer."""
+    return [
+        HumanMessage(content=f"Question {turn}: what is the latest technology news today?"),
+        AIMessage(content="", tool_calls=[{"name": "fetch_news", "args": {"topic": "technology"}, "id": f"news_{turn}"}]),
+        ToolMessage(content="📰 Latest Technology News:\n" + "• Headline text " * 150, tool_call_id=f"news_{turn}"),
+        AIMessage(content=f"Here is a summary of today's technology headlines for question {turn}."),
+    ]
+
+
+def run_thread(turns, max_tokens):
+    """Simulate a long thread, compacting before every LLM call like context_node."""
+    messages, summary, summarized_count, prompt_sizes = [], "", 0, []
+    for turn in range(turns):
+        messages.extend(synthetic_turn(turn))
+        summary, summarized_count = compact_context(messages, summary, summarized_count, max_tokens=max_tokens)
+        prompt = build_prompt(messages, summary, summarized_count)
+        prompt_sizes.append(sum(estimate_tokens(m) for m in prompt))
+    return messages, summary, summarized_count, prompt_sizes
+
+
+class TestContextManager:
+    """Test suite for context_manager"""
+
+    def test_prompt_size_bounded_over_500_turns(self):
+        """
+        TC_CTX_001: Prompt tokens stay within budget across a 500-turn thread
+        Test Type: Positive
+        """
+        messages, summary, summarized_count, prompt_sizes = run_thread(500, max_tokens=3000)
+
+        assert len(messages) == 2000, "Full history must be kept for display"
+        assert summarized_count > 0 and summary
+        # The latest turn is always sent in full, so allow it on top of the budget
+        latest_turn = sum(estimate_tokens(m) for m in synthetic_turn(0))
+        assert max(prompt_sizes) <= 3000 + latest_turn
+        assert prompt_sizes[-1] <= prompt_sizes[99] * 1.1
+
+    def test_window_starts_on_user_message(self):
+        """
+        TC_CTX_002: Tool results are never separated from their tool call
+        Test Type: Positive
+        """
+        messages = [m for turn in range(20) for m in synthetic_turn(turn)]
+        start = select_window(messages, budget=1500)
+        assert 0 < start < len(messages)
+        assert isinstance(messages[start], HumanMessage)
+
+    def test_old_tool_outputs_are_trimmed(self):
+        """
+        TC_CTX_003: Bulky tool outputs before the latest turn are shortened in the prompt
+        Test Type: Positive
+        """
+        messages = synthetic_turn(0) + synthetic_turn(1)
+        prompt = build_prompt(messages)
+        assert prompt[2].content.endswith("[trimmed]")
+        assert prompt[6].content == messages[6].content
+
+    def test_summary_is_prepended(self):
+        """
+        TC_CTX_004: The stored summary is sent as a system message before the window
+        Test Type: Positive
+        """
+        messages = [m for turn in range(30) for m in synthetic_turn(turn)]
+        summary, summarized_count = compact_context(messages, max_tokens=2000)
+        prompt = build_prompt(messages, summary, summarized_count)
+        assert isinstance(prompt[0], SystemMessage)
+        assert "User: Question" in prompt[0].content
+        assert f"User: Question {summarized_count // 4 - 1}:" in prompt[0].content
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_short_thread_is_not_compacted(self):
+        """
+        TC_CTX_005: Threads within budget are sent unchanged with no summary
+        Test Type: Negative
+        """
+        messages = [HumanMessage(content="hi"), AIMessage(content="Hello!"), HumanMessage(content="weather in london")]
+        assert compact_context(messages, max_tokens=4000) == ("", 0)
+        assert build_prompt(messages) == messages
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
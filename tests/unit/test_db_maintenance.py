@@ -0,0 +1,115 @@
+"""
+Unit Tests for checkpoint retention and compaction
+Test File: tests/unit/test_db_maintenance.py
+"""
+
+import pytest
+import sys
+import os
+import sqlite3
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import langgraph_tool_backend as backend
+from db_maintenance import run_maintenance
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def db(offline_backend):
+    """Connection to the offline backend's database."""
+    return offline_backend.conn
+
+
+def checkpoint_count(conn, thread_id):
+    return conn.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+
+class TestDbMaintenance:
+    """Test suite for db_maintenance"""
+
+    def test_get_state_works_after_compaction(self, db):
+        """
+        TC_DB_001: Pruning old checkpoints keeps the full conversation loadable
+        Test Type: Positive
+        """
+        for turn in range(20):
+            backend.run_turn("keep", f"hey there {turn}")
+        before = backend.chatbot.get_state(backend.make_config("keep")).values["messages"]
+
+        report = run_maintenance(db, keep_last=2)
+
+        assert checkpoint_count(db, "keep") == 2
+        assert report["checkpoints_deleted"] > 0
+        after = backend.chatbot.get_state(backend.make_config("keep")).values["messages"]
+        assert [m.content for m in after] == [m.content for m in before]
+
+        # The thread keeps working after compaction
+        result = backend.run_turn("keep", "hey again")
+        assert len(result["messages"]) == len(before) + 2
+
+    def test_reports_bytes_reclaimed(self, db):
+        """
+        TC_DB_002: The report shows bytes reclaimed from the database file
+        Test Type: Positive
+        """
+        for turn in range(60):
+            backend.run_turn("big", f"hey there {turn} " + "x" * 500)
+        report = run_maintenance(db, keep_last=1)
+
+        assert report["bytes_reclaimed"] > 0
+        assert report["bytes_after"] < report["bytes_before"]
+
+    def test_idle_threads_expire(self, db):
+        """
+        TC_DB_003: Threads idle past the TTL are deleted, active ones are kept
+        Test Type: Positive
+        """
+        backend.run_turn("idle", "hey there")
+        backend.run_turn("active", "hey there")
+        db.execute("UPDATE thread_metadata SET updated_at = ? WHERE thread_id = 'idle'", (time.time() - 3 * 86400,))
+        db.commit()
+
+        report = run_maintenance(db, keep_last=5, idle_days=1)
+
+        assert report["threads_expired"] == 1
+        assert checkpoint_count(db, "idle") == 0
+        assert checkpoint_count(db, "active") > 0
+
+    def test_old_finished_jobs_pruned(self, db, offline_backend):
+        """
+        TC_DB_005: Finished turn jobs past the retention are deleted; queued and recent ones are kept
+        Test Type: Positive
+        """
+        backend.run_turn("t1", "hey there")
+        queue = JobQueue(offline_backend.path)
+        old, recent, queued = (queue.submit("t1", f"message {n}") for n in range(3))
+        queue.cancel(old)
+        queue.cancel(recent)
+        db.execute("UPDATE turn_jobs SET finished_at = ? WHERE job_id = ?", (time.time() - 10 * 86400, old))
+        db.commit()
+
+        report = run_maintenance(db, keep_last=5, job_retention_days=7)
+
+        assert report["jobs_deleted"] == 1
+        assert queue.get(old) is None
+        assert queue.get(recent)["status"] == "cancelled"
+        assert queue.get(queued)["status"] == "queued"
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_empty_database(self, tmp_path):
+        """
+        TC_DB_004: Maintenance on a database without checkpoints is a no-op
+        Test Type: Negative
+        """
+        conn = sqlite3.connect(str(tmp_path / "empty.db"))
+        assert run_maintenance(conn)["checkpoints_deleted"] == 0
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,128 @@
+"""
+Unit Tests for ending a turn on final tool output
+Test File: tests/unit/test_final_tool_output.py
+"""
+
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import AIMessage
+
+import langgraph_tool_backend as backend
+
+
+def calculator_call(operation="add", second_num=3):
+    return AIMessage(content="", tool_calls=[{
+        "name": "calculator_tool",
+        "args": {"first_num": 2, "second_num": second_num, "operation": operation},
+        "id": "calc_1",
+    }])
+
+
+class TestFinalToolOutput:
+    """Test suite for final-output tools"""
+
+    def test_calculator_result_ends_turn(self, offline_backend):
+        """
+        TC_FINAL_001: A successful calculator result is the answer; the LLM is not called again
+        Test Type: Positive
+        """
+        model = offline_backend(calculator_call(), "restated answer")
+        saved_before = backend.get_llm_savings_stats()["llm_calls_saved"]
+
+        state = backend.run_turn("f1", "add two and three for me")
+
+        assert model.call_count == 1
+        assert state["messages"][-1].content == "2.0 + 3.0 = 5.0"
+        stats = backend.get_llm_savings_stats()
+        assert stats["llm_calls_saved"] == saved_before + 1
+        assert stats["tools"]["calculator_tool"] >= 1
+
+    def test_routed_jokes_need_no_llm(self, offline_backend, monkeypatch):
+        """
+        TC_FINAL_002: Several jokes from the intent router are combined without any LLM call
+        Test Type: Positive
+        """
+        model = offline_backend("unused")
+        monkeypatch.setattr(backend.http_client, "get", lambda url, params=None, **kwargs: type(
+            "Response", (), {"text": '{"amount": 2, "jokes": [{"joke": "A stub joke."}, {"joke": "Another stub joke."}]}'}
+        )())
+
+        state = backend.run_turn("f2", "tell me 2 jokes")
+
+        assert model.call_count == 0
+        assert state["messages"][-1].content == "😂 A stub joke.\n\n😂 Another stub joke."
+
+    def test_final_answer_is_streamed(self, offline_backend):
+        """
+        TC_FINAL_003: The final tool output reaches the UI as a token event
+        Test Type: Positive
+        """
+        offline_backend(calculator_call(), "restated answer")
+        events = list(backend.stream_turn("f3", "add two and three for me"))
+
+        assert [e["type"] for e in events] == ["tool_start", "tool_end", "token", "done"]
+        assert events[2]["content"] == "2.0 + 3.0 = 5.0"
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_tool_error_goes_back_to_llm(self, offline_backend):
+        """
+        TC_FINAL_004: An error result is handed to the LLM to explain
+        Test Type: Negative
+        """
+        model = offline_backend(calculator_call("divide", 0), "You can't divide by zero.")
+        state = backend.run_turn("f4", "divide two by nothing")
+
+        assert model.call_count == 2
+        assert state["messages"][-1].content == "You can't divide by zero."
+
+    def test_tool_not_marked_final(self, offline_backend, monkeypatch):
+        """
+        TC_FINAL_005: Tools outside FINAL_OUTPUT_TOOLS still get an LLM answer
+        Test Type: Negative
+        """
+        monkeypatch.setattr(backend, "FINAL_OUTPUT_TOOLS", {"get_joke"})
+        model = offline_backend(calculator_call(), "The sum is 5.")
+        state = backend.run_turn("f5", "add two and three for me")
+
+        assert model.call_count == 2
+        assert state["messages"][-1].content == "The sum is 5."
+
+    def test_mixed_tools_not_final(self):
+        """
+        TC_FINAL_006: A turn mixing final and non-final tools is not answered directly
+        Test Type: Negative
+        """
+        tool_calls = [
+            {"name": "calculator_tool", "args": {}, "id": "a"},
+            {"name": "search_tool", "args": {}, "id": "b"},
+        ]
+        assert backend.final_answer(tool_calls, ["2 + 3 = 5", "results"]) is None
+
+    def test_mock_weather_goes_to_llm(self, offline_backend, monkeypatch):
+        """
+        TC_FINAL_007: Mock weather from a routed request is not shown as the answer; the LLM gets to qualify it
+        Test Type: Negative
+        """
+        model = offline_backend("I couldn't reach the weather service; this is sample data.")
+        monkeypatch.setenv("WEATHER_API_KEY", "test-key")
+        monkeypatch.setattr(backend.http_client, "get", lambda url, params=None, **kwargs: type(
+            "Response", (), {"text": '{"error": {"message": "No matching location found."}}'}
+        )())
+
+        state = backend.run_turn("f7", "weather in london")
+
+        assert state["messages"][-2].artifact["data"]["mock"] is True
+        assert model.call_count == 1
+        assert state["messages"][-1].content == "I couldn't reach the weather service; this is sample data."
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,95 @@
+"""
+Unit Tests for the shared pooled HTTP client
+Test File: tests/unit/test_http_client.py
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import http_client
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    client_ports = set()
+
+    def do_GET(self):
+        StubHandler.client_ports.add(self.client_address[1])
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubHandler.client_ports = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpClient:
+    """Test suite for http_client"""
+
+    def test_session_is_shared(self):
+        """
+        TC_HTTP_001: All callers get the same pooled session
+        Test Type: Positive
+        """
+        assert http_client.get_session() is http_client.get_session()
+
+    def test_connections_are_reused(self, stub_server):
+        """
+        TC_HTTP_002: Sequential requests to one host reuse a single keep-alive connection
+        Test Type: Positive
+        """
+        session = http_client.create_session()
+        for _ in range(5):
+            assert session.get(stub_server, timeout=http_client.default_timeout()).json() == {"ok": True}
+        assert len(StubHandler.client_ports) == 1
+
+    def test_default_timeouts_are_split(self):
+        """
+        TC_HTTP_003: Connect and read timeouts are configured separately
+        Test Type: Positive
+        """
+        connect, read = http_client.default_timeout()
+        assert connect == http_client.HTTP_CONNECT_TIMEOUT
+        assert read == http_client.HTTP_READ_TIMEOUT
+
+    def test_async_get(self, stub_server):
+        """
+        TC_HTTP_004: The async variant reuses one pooled client per event loop
+        Test Type: Positive
+        """
+        async def fetch_all():
+            responses = await asyncio.gather(*[http_client.aget(stub_server) for _ in range(5)])
+            assert http_client.get_async_client() is http_client.get_async_client()
+            await http_client.get_async_client().aclose()
+            return responses
+
+        responses = asyncio.run(fetch_all())
+        assert all(r.json() == {"ok": True} for r in responses)
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,107 @@
+"""
+Unit Tests for the lazy, fast import of langgraph_tool_backend
+Test File: tests/unit/test_import_time.py
+"""
+
+import pytest
+import subprocess
+import sys
+import os
+
+# Add src directory to path
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, SRC_DIR)
+
+import langgraph_tool_backend as backend
+
+# Cumulative -X importtime budget for the backend module (best of a few runs)
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+HEAVY_MODULES = ["langgraph", "langchain_groq", "langchain_community", "groq", "storage", "thread_store"]
+
+
+def run_python(code, tmp_path, *flags):
+    env = {**os.environ, "GROQ_API_KEY": "x", "CHATBOT_DB_PATH": str(tmp_path / "lazy.db")}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def backend_import_ms(stderr):
+    """Cumulative microseconds of the top-level import line for the backend, in ms."""
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].rstrip() == " langgraph_tool_backend":
+            return int(parts[1]) / 1000
+    raise AssertionError("langgraph_tool_backend not found in -X importtime output")
+
+
+class TestImportTime:
+    """Test suite for import-time behaviour of the backend"""
+
+    def test_import_has_no_heavy_side_effects(self, tmp_path):
+        """
+        TC_IMPORT_001: Importing the backend loads no graph, LLM or database modules and opens no database
+        Test Type: Positive
+        """
+        result = run_python(
+            "import sys, langgraph_tool_backend; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+            tmp_path,
+        )
+        assert result.stdout.strip() == ""
+        assert not (tmp_path / "lazy.db").exists()
+
+    def test_import_time_budget(self, tmp_path):
+        """
+        TC_IMPORT_002: The backend imports within the -X importtime budget
+        Test Type: Positive
+        """
+        timings = [
+            backend_import_ms(run_python("import langgraph_tool_backend", tmp_path, "-X", "importtime").stderr)
+            for _ in range(3)
+        ]
+        assert min(timings) <= IMPORT_TIME_BUDGET_MS, f"import took {min(timings):.0f}ms"
+
+    def test_lazy_objects_built_once(self, tmp_path):
+        """
+        TC_IMPORT_003: Lazy attributes are built on first access and then reused
+        Test Type: Positive
+        """
+        result = run_python(
+            "import langgraph_tool_backend as backend; "
+            "print(backend.chatbot is backend.get_chatbot(), backend.graph is backend.get_graph(), "
+            "backend.chatbot.checkpointer is backend.get_checkpointer())",
+            tmp_path,
+        )
+        assert result.stdout.split() == ["True", "True", "True"]
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_assigned_object_overrides_factory(self, monkeypatch):
+        """
+        TC_IMPORT_004: An assigned module attribute is what the factory returns, and the real one is never built
+        Test Type: Negative
+        """
+        def build_llm():
+            raise AssertionError("the real LLM client was built")
+
+        monkeypatch.setattr(backend, "_build_llm", build_llm)
+        monkeypatch.delitem(vars(backend), "llm", raising=False)
+        fake = object()
+        monkeypatch.setitem(vars(backend), "llm_with_tools", fake)
+        assert backend.get_llm_with_tools() is fake
+        assert backend.llm_with_tools is fake
+
+    def test_unknown_attribute(self):
+        """
+        TC_IMPORT_005: Unknown module attributes still raise AttributeError
+        Test Type: Negative
+        """
+        with pytest.raises(AttributeError):
+            backend.not_a_backend_attribute
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
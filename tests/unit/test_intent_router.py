@@ -0,0 +1,178 @@
+"""
+Unit Tests for the pre-LLM intent router
+Test File: tests/unit/test_intent_router.py
+"""
+
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+import intent_router
+import langgraph_tool_backend as backend
+
+# Labeled messages: the intent the router should pick, or None when the LLM must answer
+CORPUS = [
+    ("hey", "greeting"),
+    ("Hi there!", "greeting"),
+    ("hello", "greeting"),
+    ("good morning", "greeting"),
+    ("hey, how are you?", "greeting"),
+    ("how are you doing today?", "greeting"),
+    ("tell me a joke", "joke"),
+    ("another joke please", "joke"),
+    ("tell me 3 jokes", "joke"),
+    ("tell me 10 jokes", "joke"),
+    ("give me two programming jokes", "joke"),
+    ("joke", "joke"),
+    ("what is 2 plus 3", "arithmetic"),
+    ("12 * 4", "arithmetic"),
+    ("what's 10 divided by 4?", "arithmetic"),
+    ("calculate 7.5 minus 2", "arithmetic"),
+    ("3 times 9", "arithmetic"),
+    ("weather in London", "weather"),
+    ("what's the weather like in New York?", "weather"),
+    ("what is the weather in san francisco today", "weather"),
+    ("AAPL stock price", "stock"),
+    ("what is the price of TSLA", "stock"),
+    ("$msft price", "stock"),
+    ("how is NVDA doing", "stock"),
+    ("Compare AAPL, MSFT, GOOGL, AMZN", "stock"),
+    ("stock prices for TSLA and NVDA", "stock"),
+    ("ACME stock price", "stock"),
+    ("convert 100 USD to EUR", "currency"),
+    ("how much is 50 gbp in inr", "currency"),
+    ("250 eur to jpy", "currency"),
+    # Must go to the LLM
+    ("they said hi to me yesterday", None),
+    ("hey can you summarize this article for me", None),
+    ("what is python", None),
+    ("tell me about the 2024 joke contest", None),
+    ("2024 joke", None),
+    ("tell me 12 jokes", None),
+    ("what is 2 plus 3 times 4", None),
+    ("weather in paris tomorrow", None),
+    ("will it rain next week in berlin", None),
+    ("what is the stock price of apple", None),
+    ("price of aapl", None),
+    ("compare apple and microsoft", None),
+    ("compare AAPL and MSFT over the last five years", None),
+    ("convert 100 lbs to kgs", None),
+    ("why did the euro fall against the dollar", None),
+    ("explain how the weather works", None),
+    ("how are you different from chatgpt", None),
+    ("write a poem about the weather in spring", None),
+    ("weather in paris and london", None),
+    ("weather for me", None),
+    ("weather in the morning", None),
+    ("compare I and A", None),
+    ("how is I doing", None),
+    ("compare US and UK", None),
+    ("TV price", None),
+    ("how is IT doing", None),
+    ("what is OK price", None),
+    ("what is the price of US stock", None),
+]
+
+
+def precision_recall(corpus):
+    true_positive = false_positive = false_negative = 0
+    for text, expected in corpus:
+        predicted, _ = intent_router.classify(text)
+        if predicted is not None and predicted == expected:
+            true_positive += 1
+        elif predicted is not None:
+            false_positive += 1
+        elif expected is not None:
+            false_negative += 1
+    precision = true_positive / (true_positive + false_positive) if true_positive + false_positive else 1.0
+    recall = true_positive / (true_positive + false_negative) if true_positive + false_negative else 1.0
+    return precision, recall
+
+
+class TestIntentRouter:
+    """Test suite for intent_router"""
+
+    def test_corpus_precision_and_recall(self):
+        """
+        TC_ROUTE_001: The router never misroutes the corpus and catches nearly every fast-path intent
+        Test Type: Positive
+        """
+        precision, recall = precision_recall(CORPUS)
+        assert precision == 1.0
+        assert recall >= 0.95
+
+    @pytest.mark.parametrize("text,expected", CORPUS)
+    def test_corpus_entry(self, text, expected):
+        """
+        TC_ROUTE_002: Each corpus entry is routed to its labeled intent
+        Test Type: Positive
+        """
+        assert intent_router.classify(text)[0] == expected
+
+    def test_tool_call_arguments(self):
+        """
+        TC_ROUTE_003: Routed tool calls carry the parsed arguments
+        Test Type: Positive
+        """
+        assert intent_router.route("convert 100 usd to eur").tool_calls[0]["args"] == {
+            "amount": 100.0, "from_currency": "USD", "to_currency": "EUR"
+        }
+        assert intent_router.route("what is 10 divided by 4").tool_calls[0]["args"] == {
+            "first_num": 10.0, "second_num": 4.0, "operation": "divide"
+        }
+        assert intent_router.route("weather in new york").tool_calls[0]["args"] == {"city": "New York"}
+        assert intent_router.route("$tsla price").tool_calls[0]["args"] == {"symbol": "TSLA"}
+
+    def test_multiple_items_are_batched(self):
+        """
+        TC_ROUTE_004: Several jokes or several tickers become one batched tool call
+        Test Type: Positive
+        """
+        calls = intent_router.route("tell me 4 programming jokes").tool_calls
+        assert len(calls) == 1
+        assert calls[0]["name"] == "get_jokes"
+        assert calls[0]["args"] == {"count": 4, "category": "Programming"}
+        calls = intent_router.route("Compare AAPL, MSFT, $googl and AMZN").tool_calls
+        assert len(calls) == 1
+        assert calls[0]["args"] == {"symbols": ["AAPL", "MSFT", "GOOGL", "AMZN"]}
+
+    def test_tool_call_ids_are_unique(self):
+        """
+        TC_ROUTE_007: Every routed tool call gets its own id, so repeated requests in a thread never share one
+        Test Type: Positive
+        """
+        ids = {intent_router.route("weather in london").tool_calls[0]["id"] for _ in range(20)}
+        assert len(ids) == 20
+        assert all(tool_call_id.startswith("fetch_weather_") for tool_call_id in ids)
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_tool_results_are_not_routed(self):
+        """
+        TC_ROUTE_005: A tool result that looks like a greeting goes back to the LLM
+        Test Type: Negative
+        """
+        state = {"messages": [
+            HumanMessage(content="tell me a joke"),
+            ToolMessage(content="hey", tool_call_id="get_joke_call"),
+        ]}
+        assert backend.shortcut_reply(state) is None
+
+    def test_non_text_content_is_not_routed(self):
+        """
+        TC_ROUTE_006: Multimodal (list) content and very long input are left to the LLM
+        Test Type: Negative
+        """
+        assert intent_router.route([{"type": "text", "text": "hey"}]) is None
+        assert intent_router.route("hey " * 100) is None
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
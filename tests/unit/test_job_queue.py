@@ -0,0 +1,272 @@
+"""
+Unit Tests for the background turn job queue
+Test File: tests/unit/test_job_queue.py
+"""
+
+import socket
+import sqlite3
+import subprocess
+import threading
+import time
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import AIMessage
+
+import langgraph_tool_backend as backend
+from job_queue import JobQueue, run_turn_job
+
+
+@pytest.fixture
+def db_path(offline_backend):
+    """The job table shares the offline backend's database file."""
+    offline_backend("Here you go, all done.")
+    return offline_backend.path
+
+
+@pytest.fixture
+def make_queue(db_path):
+    queues = []
+
+    def build(**kwargs):
+        queue = JobQueue(db_path, **{"workers": 2, "poll_interval": 0.02, **kwargs})
+        queues.append(queue)
+        return queue
+
+    yield build
+    for queue in queues:
+        queue.stop()
+
+
+def set_worker(queue, job_id, worker):
+    """Pretend a running job belongs to another worker process."""
+    queue._write("UPDATE turn_jobs SET worker = ? WHERE job_id = ?", (worker, job_id))
+
+
+def contents(thread_id):
+    return [m.content for m in backend.get_message_page(thread_id, limit=1000)["messages"]]
+
+
+class TestJobQueue:
+    """Test suite for JobQueue and the background turn runner"""
+
+    def test_job_runs_turn_into_checkpoint(self, make_queue):
+        """
+        TC_JOB_001: A submitted turn runs on a worker, streams events and saves its answer in the thread
+        Test Type: Positive
+        """
+        queue = make_queue().start()
+
+        job_id = queue.submit("t1", "tell me something about the ocean")
+        job = queue.wait(job_id, timeout=10)
+        events, _ = queue.events(job_id)
+
+        assert job["status"] == "done"
+        assert job["result"] == {"answer": "Here you go, all done.", "tools": []}
+        assert "".join(e["content"] for e in events if e["type"] == "token") == "Here you go, all done."
+        assert contents("t1") == ["tell me something about the ocean", "Here you go, all done."]
+        assert queue.active_jobs("t1") == []
+
+    def test_tools_used_in_result(self, make_queue, offline_backend):
+        """
+        TC_JOB_002: The job result lists the tools the turn called
+        Test Type: Positive
+        """
+        call = {"name": "calculator_tool", "args": {"first_num": 2, "second_num": 3, "operation": "add"}, "id": "c1"}
+        offline_backend(AIMessage(content="", tool_calls=[call]))
+        queue = make_queue().start()
+
+        job = queue.wait(queue.submit("t1", "what do two and three make together"), timeout=10)
+
+        assert job["status"] == "done"
+        assert job["result"]["tools"] == ["calculator_tool"]
+        assert "5" in job["result"]["answer"]
+
+    def test_thread_jobs_run_in_order_one_at_a_time(self, make_queue):
+        """
+        TC_JOB_003: Jobs of one thread run one at a time in submission order; different threads run in parallel
+        Test Type: Positive
+        """
+        lock = threading.Lock()
+        running, overlap, order = {}, {"threads": 0, "same_thread": 0}, []
+
+        def run(job, emit):
+            with lock:
+                running[job["thread_id"]] = running.get(job["thread_id"], 0) + 1
+                overlap["same_thread"] = max(overlap["same_thread"], running[job["thread_id"]])
+                overlap["threads"] = max(overlap["threads"], sum(1 for n in running.values() if n))
+                order.append(job["content"])
+            time.sleep(0.02)
+            with lock:
+                running[job["thread_id"]] -= 1
+            return {"answer": job["content"], "tools": []}
+
+        queue = make_queue(workers=4, run=run)
+        job_ids = [queue.submit(f"t{i % 3}", f"t{i % 3} message {i}") for i in range(12)]
+        assert queue.active_jobs("t0") == job_ids[0::3]
+        queue.start()
+        jobs = [queue.wait(job_id, timeout=10) for job_id in job_ids]
+
+        assert all(job["status"] == "done" for job in jobs)
+        assert overlap["same_thread"] == 1
+        assert overlap["threads"] > 1
+        for thread in ("t0", "t1", "t2"):
+            mine = [content for content in order if content.startswith(thread)]
+            assert mine == sorted(mine, key=lambda content: int(content.split()[-1]))
+
+    def test_lost_job_recovered_without_duplicate(self, make_queue):
+        """
+        TC_JOB_004: A job whose worker died after saving the turn is requeued and does not repeat the message
+        Test Type: Positive
+        """
+        crashed = make_queue()
+        job_id = crashed.submit("t1", "what is the tallest mountain")
+        job = crashed.claim()
+        run_turn_job(job, lambda event: None)  # the turn is saved, then the process "dies"
+        set_worker(crashed, job_id, f"{socket.gethostname()}:{os.getpid()}:earlier-run")
+
+        queue = make_queue().start()
+        recovered = queue.wait(job_id, timeout=10)
+
+        assert recovered["status"] == "done"
+        assert recovered["attempts"] == 2
+        assert recovered["result"]["answer"] == "Here you go, all done."
+        assert contents("t1") == ["what is the tallest mountain", "Here you go, all done."]
+
+    def test_restart_inside_lease_recovers_jobs(self, make_queue):
+        """
+        TC_JOB_009: Restarting right after a crash requeues the dead process's jobs without waiting for the lease
+        Test Type: Positive
+        """
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        crashed = make_queue()
+        job_id = crashed.submit("t1", "first question")
+        crashed.claim()
+        set_worker(crashed, job_id, f"{socket.gethostname()}:{dead.pid}:x")
+        later = crashed.submit("t1", "second question")
+
+        queue = make_queue().start()
+
+        assert queue.wait(job_id, timeout=10)["status"] == "done"
+        assert queue.wait(later, timeout=10)["status"] == "done"
+
+    def test_stale_job_recovered_while_running(self, make_queue):
+        """
+        TC_JOB_010: Workers keep looking for stale jobs, so a lost job never blocks its thread for good
+        Test Type: Positive
+        """
+        queue = make_queue(lease_seconds=1).start()
+        assert queue.wait(queue.submit("t0", "warm up"), timeout=10)["status"] == "done"
+
+        started = time.time() - 5
+        queue._write(
+            "INSERT INTO turn_jobs (job_id, thread_id, message_id, content, status, attempts, worker, created_at, "
+            "started_at, heartbeat_at) VALUES ('lost', 't1', 'm-lost', 'first question', 'running', 1, "
+            "'another-host:1:x', ?, ?, ?)",
+            (started, started, started),
+        )
+        later = queue.submit("t1", "second question")
+
+        assert queue.wait(later, timeout=10)["status"] == "done"
+        assert queue.get("lost")["attempts"] == 2
+        assert contents("t1") == ["first question", "Here you go, all done.", "second question", "Here you go, all done."]
+
+    def test_many_queued_jobs(self, make_queue):
+        """
+        TC_JOB_005: Hundreds of queued turns across many threads all complete, each thread in order
+        Test Type: Positive
+        """
+        queue = make_queue(workers=8)
+        job_ids = [queue.submit(f"load-{i % 20}", f"question number {i} please") for i in range(200)]
+        queue.start()
+
+        jobs = [queue.wait(job_id, timeout=60) for job_id in job_ids]
+
+        assert [job["status"] for job in jobs].count("done") == 200
+        assert queue.stats()["done"] == 200
+        questions = [c for c in contents("load-7") if c.startswith("question")]
+        assert questions == [f"question number {i} please" for i in range(7, 200, 20)]
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_cancelled_job_does_not_run(self, make_queue):
+        """
+        TC_JOB_006: Only queued jobs can be cancelled, and a cancelled job never runs
+        Test Type: Negative
+        """
+        queue = make_queue()
+        cancelled = queue.submit("t1", "never mind this one")
+        kept = queue.submit("t2", "but answer this one")
+
+        assert queue.cancel(cancelled) is True
+        queue.start()
+        assert queue.wait(kept, timeout=10)["status"] == "done"
+        assert queue.cancel(kept) is False
+        assert queue.get(cancelled)["status"] == "cancelled"
+        assert contents("t1") == []
+
+    def test_failing_job_recorded_and_worker_continues(self, make_queue, capsys):
+        """
+        TC_JOB_007: An exception fails only its job, with the error recorded; later jobs still run
+        Test Type: Negative
+        """
+        def run(job, emit):
+            if "boom" in job["content"]:
+                raise RuntimeError("Recursion limit of 50 reached")
+            return {"answer": "ok", "tools": []}
+
+        queue = make_queue(workers=1, run=run).start()
+        failed = queue.wait(queue.submit("t1", "boom"), timeout=10)
+        after = queue.wait(queue.submit("t1", "fine"), timeout=10)
+
+        assert failed["status"] == "error" and "Recursion limit" in failed["error"]
+        assert after["status"] == "done"
+        assert "Error running job" in capsys.readouterr().out
+
+    def test_job_lost_too_often_fails(self, make_queue):
+        """
+        TC_JOB_008: A job whose workers keep dying is failed after max_attempts instead of retried forever
+        Test Type: Negative
+        """
+        queue = make_queue(lease_seconds=0, max_attempts=1)
+        job_id = queue.submit("t1", "hello there again")
+        queue.claim()
+
+        assert queue.recover_stale() == 0
+        job = queue.get(job_id)
+        assert job["status"] == "error"
+        assert job["error"] == "worker lost too many times"
+        assert queue.get("missing") is None
+
+
+    def test_failed_finish_keeps_worker_alive(self, make_queue, capsys):
+        """
+        TC_JOB_011: A job whose outcome cannot be saved is reported, and the same worker keeps running jobs
+        Test Type: Negative
+        """
+        queue = make_queue(workers=1, run=lambda job, emit: {"answer": "ok", "tools": []})
+        finish = queue.finish
+
+        def locked_once(job_id, status, **outcome):
+            if job_id == stuck:
+                raise sqlite3.OperationalError("database is locked")
+            finish(job_id, status, **outcome)
+
+        queue.finish = locked_once
+        stuck = queue.submit("t1", "first question")
+        later = queue.submit("t2", "second question")
+        queue.start()
+
+        assert queue.wait(later, timeout=10)["status"] == "done"
+        assert queue.get(stuck)["status"] == "running"
+        assert "Error recording the outcome of job" in capsys.readouterr().out
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
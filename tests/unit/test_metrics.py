@@ -0,0 +1,204 @@
+"""
+Unit Tests for metrics, timing spans and the JSONL trace
+Test File: tests/unit/test_metrics.py
+"""
+
+import json
+import socket
+import urllib.request
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import langgraph_tool_backend as backend
+import metrics as metrics_module
+from fake_llm import FakeStreamingChatModel
+from metrics import Metrics, TraceWriter, metrics
+
+
+@pytest.fixture
+def registry():
+    return Metrics(enabled=True, trace_path="")
+
+
+@pytest.fixture
+def trace_path(tmp_path, monkeypatch):
+    """Route the global metrics' trace events to a temporary JSONL file."""
+    path = tmp_path / "trace.jsonl"
+    writer = TraceWriter(str(path))
+    monkeypatch.setattr(metrics, "trace", writer)
+    yield path
+    writer.close()
+
+
+def read_trace(path):
+    metrics.trace.close()
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def counter(name, **labels):
+    for sample in metrics.snapshot()["counters"]:
+        if sample["name"] == name and sample["labels"] == {k: str(v) for k, v in labels.items()}:
+            return sample["value"]
+    return 0
+
+
+class TestMetrics:
+    """Test suite for the metrics module and backend instrumentation"""
+
+    def test_prometheus_text(self, registry):
+        """
+        TC_METRICS_001: Counters render as _total samples, histograms as cumulative buckets with sum and count
+        Test Type: Positive
+        """
+        registry.describe("requests", "Requests served")
+        registry.inc("requests", path='/a"b')
+        registry.inc("requests", 2, path='/a"b')
+        registry.observe("latency_seconds", 0.02)
+        registry.observe("latency_seconds", 3.0)
+
+        text = registry.render()
+
+        assert "# HELP chatbot_requests_total Requests served\n# TYPE chatbot_requests_total counter" in text
+        assert 'chatbot_requests_total{path="/a\\"b"} 3' in text
+        assert 'chatbot_latency_seconds_bucket{le="0.01"} 0' in text
+        assert 'chatbot_latency_seconds_bucket{le="0.025"} 1' in text
+        assert 'chatbot_latency_seconds_bucket{le="5.0"} 2' in text
+        assert 'chatbot_latency_seconds_bucket{le="+Inf"} 2' in text
+        assert "chatbot_latency_seconds_sum 3.02" in text
+        assert "chatbot_latency_seconds_count 2" in text
+        assert "# EOF" not in text
+
+    def test_openmetrics_text(self, registry):
+        """
+        TC_METRICS_002: OpenMetrics names counter families without _total and ends with # EOF
+        Test Type: Positive
+        """
+        registry.inc("requests")
+        registry.register_collector(lambda: [("cache_entries", "gauge", {}, 4)])
+
+        text = registry.render(openmetrics=True)
+
+        assert "# TYPE chatbot_requests counter\nchatbot_requests_total 1" in text
+        assert "# TYPE chatbot_cache_entries gauge\nchatbot_cache_entries 4" in text
+        assert text.endswith("# EOF\n")
+
+    def test_span_status(self, registry):
+        """
+        TC_METRICS_003: Spans record their status label: ok, the one set by the caller, or error when raising
+        Test Type: Positive
+        """
+        with registry.span("tool", tool="a"):
+            pass
+        with registry.span("tool", tool="a") as span:
+            span["status"] = "warning"
+        with pytest.raises(ValueError):
+            with registry.span("tool", tool="a"):
+                raise ValueError("boom")
+
+        statuses = {h["labels"]["status"]: h["count"] for h in registry.snapshot()["histograms"]}
+        assert statuses == {"ok": 1, "warning": 1, "error": 1}
+
+    def test_turn_trace(self, trace_path, offline_backend):
+        """
+        TC_METRICS_004: A turn writes node, LLM, tool and DB spans tagged with its turn id, then a turn event
+        Test Type: Positive
+        """
+        call = {"name": "calculator_tool", "args": {"first_num": 2, "second_num": 3, "operation": "add"}, "id": "c1"}
+        offline_backend(AIMessage(content="", tool_calls=[call]))
+
+        backend.run_turn("metrics-thread", "what is 2 plus 3, and why?")
+        events = read_trace(trace_path)
+
+        turn = events[-1]
+        assert turn["event"] == "turn" and turn["iterations"] == 1 and turn["status"] == "ok"
+        kinds = {(e["event"], e.get("node") or e.get("tool") or e.get("op")) for e in events}
+        assert {("node", "chat_node"), ("node", "tools_node"), ("llm_call", None),
+                ("tool", "calculator_tool"), ("db", "checkpoint_write")} <= kinds
+        assert all(e["turn_id"] == turn["turn_id"] and e["thread_id"] == "metrics-thread" for e in events)
+
+    def test_llm_token_counts(self):
+        """
+        TC_METRICS_005: Provider-reported usage is counted as such; without it tokens are estimated
+        Test Type: Positive
+        """
+        before = counter("llm_tokens", direction="input", source="provider")
+        span = {}
+        reported = AIMessage(content="hi", usage_metadata={"input_tokens": 120, "output_tokens": 7, "total_tokens": 127})
+        backend.record_llm_usage([HumanMessage(content="hello")], reported, span)
+        estimated = {}
+        backend.record_llm_usage([HumanMessage(content="x" * 400)], AIMessage(content="ok"), estimated)
+
+        assert counter("llm_tokens", direction="input", source="provider") == before + 120
+        assert span == {"input_tokens": 120, "output_tokens": 7, "tool_calls": 0}
+        assert estimated["input_tokens"] == 104
+
+    def test_scrape_endpoint(self, registry, monkeypatch):
+        """
+        TC_METRICS_006: The scrape endpoint serves Prometheus text, or OpenMetrics when asked for it
+        Test Type: Positive
+        """
+        registry.inc("requests")
+        monkeypatch.setattr(metrics_module, "_server", None)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = metrics_module.start_metrics_server(port, registry=registry)
+        try:
+            url = f"http://127.0.0.1:{port}/metrics"
+            with urllib.request.urlopen(url) as response:
+                assert response.headers["Content-Type"].startswith("text/plain")
+                assert "chatbot_requests_total 1" in response.read().decode()
+            request = urllib.request.Request(url, headers={"Accept": "application/openmetrics-text"})
+            with urllib.request.urlopen(request) as response:
+                assert response.read().decode().endswith("# EOF\n")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_disabled_and_failing_collectors(self, registry):
+        """
+        TC_METRICS_007: A disabled registry records nothing; a failing collector does not break the scrape and is counted
+        Test Type: Negative
+        """
+        disabled = Metrics(enabled=False, trace_path="")
+        with disabled.span("tool"):
+            disabled.inc("requests")
+        with disabled.turn("t") as turn:
+            assert turn is None
+        assert disabled.snapshot() == {"counters": [], "histograms": []}
+
+        registry.inc("requests")
+        registry.register_collector(lambda: 1 / 0)
+        assert "chatbot_requests_total 1" in registry.render()
+        assert 'chatbot_errors_total{type="ZeroDivisionError",where="collector"} 1' in registry.render()
+
+    def test_chat_node_errors_counted(self, offline_backend, capsys):
+        """
+        TC_METRICS_008: An LLM failure is still printed and answered with an apology, and is counted
+        Test Type: Negative
+        """
+        def fail(messages):
+            raise RuntimeError("LLM down")
+
+        offline_backend.use_model(FakeStreamingChatModel(script=fail))
+        before = counter("errors", where="chat_node", type="RuntimeError")
+
+        result = backend.chat_node({"messages": [HumanMessage(content="tell me about the weather in Oslo today")]})
+
+        assert "Sorry" in result["messages"][0].content
+        assert "Error in chat_node: LLM down" in capsys.readouterr().out
+        assert counter("errors", where="chat_node", type="RuntimeError") == before + 1
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
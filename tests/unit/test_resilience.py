@@ -0,0 +1,283 @@
+"""
+Unit Tests for provider rate limits, circuit breakers, retries and hedging
+Test File: tests/unit/test_resilience.py
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import http_client
+import langgraph_tool_backend as backend
+from resilience import (
+    CircuitBreaker, CircuitOpenError, Provider, RateLimitedError, Resilience, TokenBucket, UpstreamError,
+)
+
+
+class FaultHandler(BaseHTTPRequestHandler):
+    """
+    Fault-injecting upstream:
+      /ok                 200
+      /status/<code>      always <code>
+      /flaky/<n>          503 for the first n requests, then 200
+      /slow-first/<secs>  the first request stalls for <secs>, later ones answer at once
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    hits = Counter()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        with FaultHandler.lock:
+            FaultHandler.hits[path] += 1
+            hit = FaultHandler.hits[path]
+        parts = path.strip("/").split("/")
+        status, headers = 200, {}
+        if parts[0] == "status":
+            status = int(parts[1])
+            if status == 429:
+                headers["Retry-After"] = "5"
+        elif parts[0] == "flaky" and hit <= int(parts[1]):
+            status = 503
+        elif parts[0] == "slow-first" and hit == 1:
+            time.sleep(float(parts[1]))
+        body = b'{"ok": true}'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    FaultHandler.hits = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FaultHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def guarded(**settings):
+    """A Resilience instance whose only provider is the local stub server."""
+    layer = Resilience(providers={})
+    provider = layer.add_provider(Provider("stub", hosts=("127.0.0.1",), **settings))
+    return layer, provider
+
+
+def fetch(url):
+    return lambda: http_client.get(url)
+
+
+class TestResilience:
+    """Test suite for resilience"""
+
+    def test_token_bucket(self):
+        """
+        TC_RES_001: The bucket hands out its burst, refuses without waiting, then refills
+        Test Type: Positive
+        """
+        bucket = TokenBucket(rate=50, capacity=2)
+        assert bucket.acquire() and bucket.acquire()
+        start = time.monotonic()
+        assert not bucket.acquire()
+        assert time.monotonic() - start < 0.01
+        time.sleep(0.05)
+        assert bucket.acquire()
+
+    def test_retries_recover_from_transient_errors(self, stub_server):
+        """
+        TC_RES_002: Two 503s are retried and the third attempt succeeds
+        Test Type: Positive
+        """
+        layer, provider = guarded(max_retries=2, retry_budget=2, hedge_after=0)
+        response = layer.call(f"{stub_server}/flaky/2", fetch(f"{stub_server}/flaky/2"))
+
+        assert response.status_code == 200
+        assert FaultHandler.hits["/flaky/2"] == 3
+        assert provider.counters["retries"] == 2
+        assert provider.breaker.state == "closed"
+
+    def test_hedged_request_beats_slow_call(self, stub_server):
+        """
+        TC_RES_003: A stalled request is hedged and the fast duplicate answers
+        Test Type: Positive
+        """
+        layer, provider = guarded(hedge_after=0.1)
+        url = f"{stub_server}/slow-first/1.5"
+
+        start = time.monotonic()
+        response = layer.call(url, fetch(url))
+
+        assert response.status_code == 200
+        assert time.monotonic() - start < 1.0
+        assert provider.counters["hedges"] == 1
+
+    def test_async_call_retries(self, stub_server):
+        """
+        TC_RES_004: The async path retries and hedges through the async client
+        Test Type: Positive
+        """
+        layer, provider = guarded(max_retries=2, retry_budget=2, hedge_after=0.1)
+        flaky, slow = f"{stub_server}/flaky/1", f"{stub_server}/slow-first/1.5"
+
+        async def scenario():
+            first = await layer.acall(flaky, lambda: http_client.aget(flaky))
+            second = await layer.acall(slow, lambda: http_client.aget(slow))
+            return first.status_code, second.status_code
+
+        assert asyncio.run(scenario()) == (200, 200)
+        assert provider.counters["retries"] == 1
+        assert provider.counters["hedges"] == 1
+
+    def test_half_open_trial_closes_breaker(self):
+        """
+        TC_RES_005: After the reset timeout one trial call is allowed and success closes the circuit
+        Test Type: Positive
+        """
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        assert not breaker.allow()
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_sync_retries_leave_calling_thread(self, stub_server):
+        """
+        TC_RES_010: Sync retries are scheduled off the calling thread, which only waits for the outcome
+        Test Type: Positive
+        """
+        layer, provider = guarded(max_retries=2, retry_budget=5, hedge_after=0)
+        url = f"{stub_server}/flaky/2"
+        threads = []
+
+        def tracked():
+            threads.append(threading.current_thread())
+            return http_client.get(url)
+
+        response = layer.call(url, tracked)
+
+        assert response.status_code == 200
+        assert len(threads) == 3
+        assert threading.current_thread() not in threads
+        assert provider.stats()["retries"] == 2
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_breaker_trips_to_fallback(self, stub_server, monkeypatch):
+        """
+        TC_RES_006: A failing provider trips the breaker and tools answer with their fallback without calling it
+        Test Type: Negative
+        """
+        layer, provider = guarded(failure_threshold=2, max_retries=0, hedge_after=0)
+        monkeypatch.setattr(backend, "resilience", layer)
+        request = {
+            "url": f"{stub_server}/status/500",
+            "parse": lambda data: "parsed",
+            "on_error": lambda e: f"fallback: {e}",
+        }
+
+        answers = [backend.run_request(request) for _ in range(5)]
+
+        assert FaultHandler.hits["/status/500"] == 2
+        assert all(answer.startswith("fallback") for answer in answers)
+        assert "circuit open" in answers[-1]
+        assert provider.stats()["state"] == "open"
+        assert provider.stats()["trips"] == 1
+
+    def test_real_tool_degrades_to_mock(self, stub_server, monkeypatch):
+        """
+        TC_RES_011: Weather and stock tools answer with their mock data once retries run out or the breaker opens
+        Test Type: Negative
+        """
+        layer = Resilience(providers={
+            "weatherapi": {"hosts": ("api.weatherapi.com",), "failure_threshold": 2, "max_retries": 0, "hedge_after": 0},
+            "alphavantage": {"hosts": ("www.alphavantage.co",), "max_retries": 1, "retry_budget": 5, "hedge_after": 0},
+        })
+        monkeypatch.setattr(backend, "resilience", layer)
+        monkeypatch.setenv("WEATHER_API_KEY", "test-key")
+        monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test-key")
+        real_get = http_client.get
+        monkeypatch.setattr(http_client, "get", lambda url, params=None, **kwargs: real_get(f"{stub_server}/status/500"))
+        backend.tool_cache.clear()
+
+        weather = [backend.fetch_weather.invoke({"city": "London"}) for _ in range(4)]
+        stock = backend.get_stock_price.invoke({"symbol": "AAPL"})
+
+        assert all(answer.data["mock"] for answer in weather)
+        assert weather[-1].data == {"city": "London", "temp_c": 12, "condition": "Cloudy", "humidity": 75, "mock": True}
+        assert layer.provider("weatherapi").stats()["state"] == "open"
+        assert FaultHandler.hits["/status/500"] == 2 + 2
+        assert stock == "📈 AAPL: $195.50 (mock data)"
+        assert stock.data["mock"] is True
+        assert backend.tool_cache.get("fetch_weather", {"city": "London"}) is None
+
+    def test_rate_limit_fails_fast(self, stub_server):
+        """
+        TC_RES_007: An exhausted budget rejects immediately instead of waiting for tokens
+        Test Type: Negative
+        """
+        layer, provider = guarded(rate=0.01, burst=2, hedge_after=0)
+        url = f"{stub_server}/ok"
+        layer.call(url, fetch(url))
+        layer.call(url, fetch(url))
+
+        start = time.monotonic()
+        with pytest.raises(RateLimitedError):
+            layer.call(url, fetch(url))
+        assert time.monotonic() - start < 0.1
+        assert FaultHandler.hits["/ok"] == 2
+
+    def test_429_pauses_provider(self, stub_server):
+        """
+        TC_RES_008: A 429 with Retry-After stops further calls to the provider for that long
+        Test Type: Negative
+        """
+        layer, provider = guarded(max_retries=3, hedge_after=0)
+        url = f"{stub_server}/status/429"
+        with pytest.raises(UpstreamError):
+            layer.call(url, fetch(url))
+        with pytest.raises(RateLimitedError):
+            layer.call(f"{stub_server}/ok", fetch(f"{stub_server}/ok"))
+        assert FaultHandler.hits["/status/429"] == 1
+        assert FaultHandler.hits["/ok"] == 0
+
+    def test_guarded_tool_errors_count(self):
+        """
+        TC_RES_009: Client libraries guarded by name open the breaker after repeated errors
+        Test Type: Negative
+        """
+        layer = Resilience(providers={"search": {"failure_threshold": 2}})
+
+        def broken_search(query):
+            raise ConnectionError("search backend down")
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                layer.guard("search", broken_search, "python")
+        with pytest.raises(CircuitOpenError):
+            layer.guard("search", broken_search, "python")
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,173 @@
+"""
+Unit Tests for the semantic response cache
+Test File: tests/unit/test_semantic_cache.py
+"""
+
+import pytest
+import sys
+import os
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import AIMessage
+
+import langgraph_tool_backend as backend
+from semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def cached_backend(offline_backend, monkeypatch):
+    """Offline backend with the semantic cache enabled."""
+    monkeypatch.setattr(backend, "semantic_cache", SemanticCache())
+    return offline_backend
+
+
+class TestSemanticCache:
+    """Test suite for SemanticCache"""
+
+    def test_paraphrase_hits(self):
+        """
+        TC_SEM_001: Reworded versions of a cached question are served from the cache
+        Test Type: Positive
+        """
+        cache = SemanticCache()
+        cache.set("tell me a joke about programming", "joke")
+        cache.set("tech news", "news")
+
+        assert cache.get("Tell me a programming joke!")[0] == "joke"
+        assert cache.get("news about tech")[0] == "news"
+        assert cache.stats()["hits"] == 2
+
+    def test_stats_and_eviction(self):
+        """
+        TC_SEM_002: Hit rate is reported and the oldest entries are evicted first
+        Test Type: Positive
+        """
+        cache = SemanticCache(maxsize=2)
+        cache.set("explain recursion", "r")
+        cache.set("explain closures", "c")
+        cache.set("explain generators", "g")
+
+        assert cache.get("explain recursion") is None
+        assert cache.get("explain generators")[0] == "g"
+        stats = cache.stats()
+        assert stats["size"] == 2
+        assert stats["hit_rate"] == 0.5
+
+    def test_llm_reply_reused(self, cached_backend):
+        """
+        TC_SEM_003: A repeated question is answered without calling the LLM
+        Test Type: Positive
+        """
+        model = cached_backend("Python is a programming language.")
+        backend.run_turn("c1", "what is python?")
+        state = backend.run_turn("c2", "whats python")
+
+        assert model.call_count == 1
+        assert state["messages"][-1].content == "Python is a programming language."
+
+    def test_cached_tool_call_gets_fresh_id(self, cached_backend, monkeypatch):
+        """
+        TC_SEM_004: A cached tool-call decision re-runs the tool with a new tool_call_id
+        Test Type: Positive
+        """
+        call = {"name": "fetch_news", "args": {"topic": "technology"}, "id": "news_1"}
+        model = cached_backend()
+        model.script = lambda messages: (
+            "Here are the headlines." if getattr(messages[-1], "tool_call_id", None)
+            else AIMessage(content="", tool_calls=[call])
+        )
+        monkeypatch.setattr(backend, "FINAL_OUTPUT_TOOLS", set())
+
+        backend.run_turn("c3", "tech news")
+        state = backend.run_turn("c4", "tech news please")
+
+        assert model.call_count == 3
+        replayed = [m for m in state["messages"] if getattr(m, "tool_calls", None)][0]
+        assert replayed.tool_calls[0]["args"] == {"topic": "technology"}
+        assert replayed.tool_calls[0]["id"] != "news_1"
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_different_numbers_miss(self):
+        """
+        TC_SEM_005: Questions that differ only in their numbers never share an answer
+        Test Type: Negative
+        """
+        cache = SemanticCache(threshold=0.5)
+        cache.set("what is 25 + 37", "62")
+        assert cache.get("what is 25 + 38") is None
+
+    def test_time_sensitive_and_follow_ups_bypass(self):
+        """
+        TC_SEM_006: Time-sensitive questions and context-dependent follow-ups skip the cache
+        Test Type: Negative
+        """
+        cache = SemanticCache()
+        cache.set("latest tech news", "old news")
+        cache.set("explain it again", "???")
+
+        assert cache.get("latest tech news") is None
+        assert cache.get("explain it again") is None
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["bypassed"] == 2
+
+    def test_questions_about_the_user_bypass(self):
+        """
+        TC_SEM_009: Questions about the user are never shared; "tell me about ..." still is
+        Test Type: Negative
+        """
+        cache = SemanticCache()
+        cache.set("what is my name?", ("Your name is Bob.", []))
+        cache.set("where am I", ("In Paris.", []))
+        cache.set("tell me about jazz", ("Jazz is ...", []))
+
+        assert cache.get("What is my name") is None
+        assert cache.get("where am I") is None
+        assert cache.get("tell me about jazz") is not None
+
+    def test_reply_depending_on_conversation_not_cached(self, cached_backend):
+        """
+        TC_SEM_010: A reply to a later message of a thread is never served in another thread
+        Test Type: Negative
+        """
+        model = cached_backend("Sure, talking like a pirate from now on.", "Arr, recursion be a function calling itself.",
+                               "Recursion is when a function calls itself.")
+        backend.run_turn("c6", "answer like a pirate from now on")
+        backend.run_turn("c6", "explain recursion")
+        state = backend.run_turn("c7", "explain recursion")
+
+        assert model.call_count == 3
+        assert state["messages"][-1].content == "Recursion is when a function calls itself."
+
+    def test_expired_entry_misses(self):
+        """
+        TC_SEM_007: Entries past their TTL are not served
+        Test Type: Negative
+        """
+        cache = SemanticCache()
+        cache.set("explain recursion", "r", ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("explain recursion") is None
+
+    def test_reply_to_tool_results_not_cached(self, cached_backend, monkeypatch):
+        """
+        TC_SEM_008: Answers written from tool output are never stored
+        Test Type: Negative
+        """
+        call = {"name": "fetch_news", "args": {"topic": "ai"}, "id": "news_1"}
+        cached_backend(AIMessage(content="", tool_calls=[call]), "AI headlines.")
+        monkeypatch.setattr(backend, "FINAL_OUTPUT_TOOLS", set())
+
+        backend.run_turn("c5", "ai news")
+
+        assert backend.semantic_cache.stats()["size"] == 1
+        assert backend.semantic_cache.get("ai news")[0][0] == ""
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,184 @@
+"""
+Unit Tests for coalescing identical in-flight tool calls
+Test File: tests/unit/test_single_flight.py
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import http_client
+from single_flight import SingleFlight
+from tool_cache import ToolCache, cached_tool
+
+
+class SlowUpstream(BaseHTTPRequestHandler):
+    """Answers every request after a short delay and counts hits per path."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    hits = Counter()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with SlowUpstream.lock:
+            SlowUpstream.hits[self.path] += 1
+        time.sleep(0.2)
+        body = f'"price for {self.path}"'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    SlowUpstream.hits = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowUpstream)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def stock_tools(base_url, flight):
+    """Sync and async variants of one tool sharing a cache and a flight, like the backend tools."""
+    cache = ToolCache(ttls={"get_stock_price": 30})
+
+    @cached_tool("get_stock_price", cache=cache, flight=flight)
+    def get_price(symbol):
+        return http_client.get(f"{base_url}/{symbol}").json()
+
+    @cached_tool("get_stock_price", cache=cache, flight=flight)
+    async def aget_price(symbol):
+        return (await http_client.aget(f"{base_url}/{symbol}")).json()
+
+    return get_price, aget_price
+
+
+class TestSingleFlight:
+    """Test suite for single_flight"""
+
+    def test_threaded_calls_share_one_request(self, upstream):
+        """
+        TC_FLIGHT_001: 20 threads asking for the same symbol cause one upstream hit
+        Test Type: Positive
+        """
+        flight = SingleFlight()
+        get_price, _ = stock_tools(upstream, flight)
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            results = list(pool.map(lambda _: get_price("TSLA"), range(20)))
+
+        assert SlowUpstream.hits["/TSLA"] == 1
+        assert set(results) == {"price for /TSLA"}
+        assert flight.stats()["coalesced"] == 19
+
+    def test_async_calls_share_one_request(self, upstream):
+        """
+        TC_FLIGHT_002: Concurrent coroutines asking for the same symbol cause one upstream hit
+        Test Type: Positive
+        """
+        _, aget_price = stock_tools(upstream, SingleFlight())
+
+        async def burst():
+            return await asyncio.gather(*(aget_price("TSLA") for _ in range(20)))
+
+        results = asyncio.run(burst())
+        assert SlowUpstream.hits["/TSLA"] == 1
+        assert set(results) == {"price for /TSLA"}
+
+    def test_threaded_and_async_share_flight(self, upstream):
+        """
+        TC_FLIGHT_003: A threaded leader's result is shared with async waiters
+        Test Type: Positive
+        """
+        get_price, aget_price = stock_tools(upstream, SingleFlight())
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            threaded = [pool.submit(get_price, "NVDA") for _ in range(5)]
+            time.sleep(0.05)
+
+            async def burst():
+                return await asyncio.gather(*(aget_price("NVDA") for _ in range(5)))
+
+            async_results = asyncio.run(burst())
+            threaded_results = [future.result() for future in threaded]
+
+        assert SlowUpstream.hits["/NVDA"] == 1
+        assert set(async_results + threaded_results) == {"price for /NVDA"}
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_errors_reach_every_waiter(self):
+        """
+        TC_FLIGHT_004: When the shared call fails, every waiter gets the exception
+        Test Type: Negative
+        """
+        flight = SingleFlight()
+        calls = Counter()
+
+        def failing():
+            calls["upstream"] += 1
+            time.sleep(0.1)
+            raise ConnectionError("provider down")
+
+        def caller(_):
+            try:
+                flight.do("key", failing)
+            except ConnectionError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            outcomes = list(pool.map(caller, range(10)))
+
+        assert calls["upstream"] == 1
+        assert outcomes == ["provider down"] * 10
+        assert flight.stats()["in_flight"] == 0
+
+    def test_different_arguments_not_coalesced(self, upstream):
+        """
+        TC_FLIGHT_005: Calls with different arguments each reach the upstream
+        Test Type: Negative
+        """
+        get_price, _ = stock_tools(upstream, SingleFlight())
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(get_price, ["TSLA", "AAPL", "TSLA", "AAPL"]))
+
+        assert SlowUpstream.hits["/TSLA"] == 1
+        assert SlowUpstream.hits["/AAPL"] == 1
+
+    def test_finished_flight_is_not_reused(self):
+        """
+        TC_FLIGHT_006: Once a call completes, the next call for the key runs again
+        Test Type: Negative
+        """
+        flight = SingleFlight()
+        calls = Counter()
+
+        def count():
+            calls["upstream"] += 1
+            return calls["upstream"]
+
+        assert flight.do("key", count) == 1
+        assert flight.do("key", count) == 2
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
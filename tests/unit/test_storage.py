@@ -0,0 +1,87 @@
+"""
+Unit Tests for the pooled SQLite storage layer
+Test File: tests/unit/test_storage.py
+"""
+
+import pytest
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import langgraph_tool_backend as backend
+from storage import ConnectionPool, PooledSqliteSaver
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "chatbot.db"))
+    yield pool
+    pool.close_all()
+
+
+class TestStorage:
+    """Test suite for ConnectionPool and PooledSqliteSaver"""
+
+    def test_pragmas_applied(self, pool):
+        """
+        TC_STORE_001: Connections use WAL, NORMAL sync, busy_timeout and mmap
+        Test Type: Positive
+        """
+        conn = pool.connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] > 0
+
+    def test_connection_per_thread(self, pool):
+        """
+        TC_STORE_002: Each thread gets its own connection, reused within the thread
+        Test Type: Positive
+        """
+        main_conn = pool.connection()
+        assert pool.connection() is main_conn
+        other = []
+        worker = threading.Thread(target=lambda: other.append(pool.connection()))
+        worker.start()
+        worker.join()
+        assert other[0] is not main_conn
+
+    def test_dead_thread_connections_are_closed(self, pool):
+        """
+        TC_STORE_003: Connections of exited threads are reaped
+        Test Type: Positive
+        """
+        for _ in range(5):
+            worker = threading.Thread(target=pool.connection)
+            worker.start()
+            worker.join()
+        pool.connection()
+        assert len(pool) <= 2
+
+    def test_concurrent_sessions(self, pool, offline_backend):
+        """
+        TC_STORE_004: Many threads write turns at once without lock errors
+        Test Type: Positive
+        """
+        offline_backend.set("chatbot", backend.get_graph().compile(checkpointer=PooledSqliteSaver(pool)))
+
+        def session(user):
+            for turn in range(5):
+                backend.run_turn(f"user-{user}", f"hey there {turn}")
+            return len(backend.chatbot.get_state(backend.make_config(f"user-{user}")).values["messages"])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            counts = list(executor.map(session, range(8)))
+
+        assert counts == [10] * 8
+        assert len(backend.chatbot.checkpointer.list_threads()) == 8
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,84 @@
+"""
+Unit Tests for streaming turns
+Test File: tests/unit/test_streaming.py
+"""
+
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import langgraph_tool_backend as backend
+from fake_llm import ToolCallingScript
+
+
+class TestStreamTurn:
+    """Test suite for stream_turn"""
+
+    def test_tokens_stream_before_done(self, offline_backend):
+        """
+        TC_STREAM_001: Answer text arrives as several token events before the final state
+        Test Type: Positive
+        """
+        offline_backend("Python is a programming language.")
+        events = list(backend.stream_turn("s1", "what is python"))
+
+        tokens = [e["content"] for e in events if e["type"] == "token"]
+        assert len(tokens) > 1
+        assert "".join(tokens) == "Python is a programming language."
+        assert events[-1]["type"] == "done"
+        assert events[-1]["state"]["messages"][-1].content == "Python is a programming language."
+
+    def test_tool_events(self, offline_backend):
+        """
+        TC_STREAM_002: Tool calls produce tool_start and tool_end events in order
+        Test Type: Positive
+        """
+        tool_call = {"name": "calculator_tool", "args": {"first_num": 2, "second_num": 3, "operation": "add"}, "id": "calc_1"}
+        offline_backend(AIMessage(content="", tool_calls=[tool_call]), "2 + 3 = 5")
+        events = [e for e in backend.stream_turn("s2", "add two and three for me") if e["type"] != "token"]
+
+        assert [e["type"] for e in events] == ["tool_start", "tool_end", "done"]
+        assert events[0]["name"] == "calculator_tool"
+        assert events[1]["tool_call_id"] == "calc_1"
+        assert "5" in events[1]["content"]
+
+    def test_tool_calling_script(self):
+        """
+        TC_STREAM_004: The scripted model calls a tool per matching request and answers from the tool results
+        Test Type: Positive
+        """
+        script = ToolCallingScript([(r"weather in (\w+)", "fetch_weather", lambda m: {"city": m[1]})])
+
+        call = script([HumanMessage(content="weather in Paris and weather in Oslo")])
+        answer = script([HumanMessage(content="weather in Paris"), call,
+                         ToolMessage(content="temp_c=14", tool_call_id=call.tool_calls[0]["id"])])
+
+        assert [c["args"] for c in call.tool_calls] == [{"city": "Paris"}, {"city": "Oslo"}]
+        assert answer == "Here is what I found: temp_c=14"
+        assert script([HumanMessage(content="tell me a story")]) == script.reply
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_resubmitted_message_only_yields_done(self, offline_backend):
+        """
+        TC_STREAM_003: A message that is already stored does not start a new run
+        Test Type: Negative
+        """
+        model = offline_backend("Hi!")
+        list(backend.stream_turn("s3", "what is python"))
+        stored = backend.chatbot.get_state(backend.make_config("s3")).values["messages"]
+
+        events = list(backend.stream_turn("s3", stored[:1]))
+        assert [e["type"] for e in events] == ["done"]
+        assert model.call_count == 1
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,319 @@
+"""
+Unit Tests for the indexed thread listing
+Test File: tests/unit/test_thread_store.py
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import sqlite3
+from typing import TypedDict, Annotated
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.message import add_messages
+
+import langgraph_tool_backend as backend
+from thread_store import IndexedAsyncSqliteSaver, IndexedSqliteSaver, message_index_statements, search_query
+
+
+class EchoState(TypedDict):
+    messages: Annotated[list[BaseMessage], add_messages]
+
+
+def echo_node(state: EchoState) -> dict:
+    return {"messages": [AIMessage(content=f"echo: {state['messages'][-1].content}")]}
+
+
+@pytest.fixture
+def saver():
+    return IndexedSqliteSaver(conn=sqlite3.connect(":memory:", check_same_thread=False))
+
+
+def echo_graph():
+    graph = StateGraph(EchoState)
+    graph.add_node("echo", echo_node)
+    graph.add_edge(START, "echo")
+    graph.add_edge("echo", END)
+    return graph
+
+
+@pytest.fixture
+def echo_bot(saver):
+    return echo_graph().compile(checkpointer=saver)
+
+
+def send(bot, thread_id, text):
+    bot.invoke({"messages": [HumanMessage(content=text)]}, {"configurable": {"thread_id": thread_id}})
+
+
+def contents(page):
+    return [m["content"] for m in page["messages"]]
+
+
+class TestIndexedSqliteSaver:
+    """Test suite for IndexedSqliteSaver"""
+
+    def test_metadata_updated_on_write(self, saver, echo_bot):
+        """
+        TC_THREAD_001: Writing a turn records title and message count
+        Test Type: Positive
+        """
+        send(echo_bot, "t1", "weather in london")
+        send(echo_bot, "t1", "and in tokyo?")
+
+        [thread] = saver.list_threads()
+        assert thread["thread_id"] == "t1"
+        assert thread["title"] == "weather in london"
+        assert thread["message_count"] == 4
+        assert thread["updated_at"] >= thread["created_at"]
+
+    def test_threads_ordered_by_recency_and_paged(self, saver, echo_bot):
+        """
+        TC_THREAD_002: Listing is newest first and supports LIMIT/OFFSET
+        Test Type: Positive
+        """
+        for thread_id in ["a", "b", "c"]:
+            send(echo_bot, thread_id, "hello")
+        send(echo_bot, "a", "back again")
+
+        assert [t["thread_id"] for t in saver.list_threads()] == ["a", "c", "b"]
+        assert [t["thread_id"] for t in saver.list_threads(limit=2)] == ["a", "c"]
+        assert [t["thread_id"] for t in saver.list_threads(limit=2, offset=2)] == ["b"]
+
+    def test_delete_removes_metadata(self, saver, echo_bot):
+        """
+        TC_THREAD_003: Deleting a thread removes it from the listing
+        Test Type: Positive
+        """
+        send(echo_bot, "t1", "hello")
+        saver.delete_thread("t1")
+        assert saver.list_threads() == []
+
+    def test_backfill_existing_checkpoints(self, tmp_path):
+        """
+        TC_THREAD_004: Threads written by a plain SqliteSaver are indexed on first use
+        Test Type: Positive
+        """
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        db_path = str(tmp_path / "chatbot.db")
+        graph = StateGraph(EchoState)
+        graph.add_node("echo", echo_node)
+        graph.add_edge(START, "echo")
+        graph.add_edge("echo", END)
+        plain = graph.compile(checkpointer=SqliteSaver(sqlite3.connect(db_path, check_same_thread=False)))
+        send(plain, "old", "hello")
+
+        saver = IndexedSqliteSaver(conn=sqlite3.connect(db_path, check_same_thread=False))
+        assert [t["thread_id"] for t in saver.list_threads()] == ["old"]
+
+    def test_message_pages(self, saver, echo_bot):
+        """
+        TC_THREAD_006: History is read newest page first, each page oldest first, following the cursor
+        Test Type: Positive
+        """
+        for i in range(5):
+            send(echo_bot, "t1", f"m{i}")
+
+        newest = saver.message_page("t1", limit=4)
+        assert contents(newest) == ["m3", "echo: m3", "m4", "echo: m4"]
+        assert [m["role"] for m in newest["messages"]] == ["user", "assistant", "user", "assistant"]
+        middle = saver.message_page("t1", limit=4, before=newest["cursor"])
+        assert contents(middle) == ["m1", "echo: m1", "m2", "echo: m2"]
+        oldest = saver.message_page("t1", limit=4, before=middle["cursor"])
+        assert contents(oldest) == ["m0", "echo: m0"]
+        assert oldest["cursor"] is None
+
+    def test_only_displayed_messages_indexed(self):
+        """
+        TC_THREAD_007: Tool calls and tool results are left out of the history index
+        Test Type: Positive
+        """
+        call = {"name": "calculator_tool", "args": {}, "id": "c1"}
+        messages = [
+            HumanMessage(content="2+3?"),
+            AIMessage(content="", tool_calls=[call]),
+            ToolMessage(content="5", tool_call_id="c1"),
+            AIMessage(content="5", tool_call_id="legacy"),
+            AIMessage(content=[{"type": "text", "text": "It is 5."}]),
+        ]
+
+        [(sql, rows)] = message_index_statements("t", messages, None)
+        assert rows == [("t", 0, "user", "2+3?"), ("t", 4, "assistant", "It is 5.")]
+        # Only messages after the last indexed one are looked at
+        assert message_index_statements("t", messages, 4) == []
+
+    def test_message_page_backfilled_and_deleted(self, tmp_path):
+        """
+        TC_THREAD_008: Threads saved before the index existed are indexed on first read; deleting drops them
+        Test Type: Positive
+        """
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        db_path = str(tmp_path / "chatbot.db")
+        graph = StateGraph(EchoState)
+        graph.add_node("echo", echo_node)
+        graph.add_edge(START, "echo")
+        graph.add_edge("echo", END)
+        plain = graph.compile(checkpointer=SqliteSaver(sqlite3.connect(db_path, check_same_thread=False)))
+        send(plain, "old", "hello")
+
+        saver = IndexedSqliteSaver(conn=sqlite3.connect(db_path, check_same_thread=False))
+        assert contents(saver.message_page("old")) == ["hello", "echo: hello"]
+        saver.delete_thread("old")
+        assert saver.conn.execute("SELECT COUNT(*) FROM thread_messages").fetchone()[0] == 0
+
+    def test_backend_message_page(self, saver, echo_bot, monkeypatch):
+        """
+        TC_THREAD_009: The backend page API returns chat messages and the thread version moves with each turn
+        Test Type: Positive
+        """
+        monkeypatch.setitem(vars(backend), "checkpointer", saver)
+        send(echo_bot, "t1", "hello")
+        version = backend.get_thread_version("t1")
+        send(echo_bot, "t1", "again")
+
+        page = backend.get_message_page("t1", limit=3)
+        assert [type(m).__name__ for m in page["messages"]] == ["AIMessage", "HumanMessage", "AIMessage"]
+        assert page["messages"][-1].content == "echo: again"
+        assert page["cursor"] is not None
+        assert backend.get_thread_version("t1") > version
+
+    def test_search_threads(self, saver, echo_bot):
+        """
+        TC_THREAD_012: Search matches word prefixes across user and assistant text, one result per thread
+        Test Type: Positive
+        """
+        send(echo_bot, "weather", "weather in london")
+        send(echo_bot, "weather", "and tomorrow in london?")
+        send(echo_bot, "stocks", "AAPL stock price")
+        send(echo_bot, "travel", "flights to Zürich")
+
+        [hit] = saver.search_threads("lond weath")
+        assert hit["thread_id"] == "weather"
+        assert hit["title"] == "weather in london"
+        assert "**london**" in hit["snippet"]
+        assert len(saver.search_threads("echo")) == 3
+        assert len(saver.search_threads("london")) == 1
+        assert saver.search_threads("zurich")[0]["thread_id"] == "travel"
+
+    def test_search_index_follows_deletes(self, saver, echo_bot, monkeypatch):
+        """
+        TC_THREAD_013: Deleted threads drop out of search; the backend API returns the same hits
+        Test Type: Positive
+        """
+        monkeypatch.setitem(vars(backend), "checkpointer", saver)
+        send(echo_bot, "a", "python tutorial")
+        send(echo_bot, "b", "python decorators")
+
+        assert {h["thread_id"] for h in backend.search_threads("python")} == {"a", "b"}
+        saver.delete_thread("a")
+        assert [h["thread_id"] for h in backend.search_threads("python")] == ["b"]
+
+    def test_existing_threads_indexed_for_search(self, tmp_path):
+        """
+        TC_THREAD_014: Threads saved before the search index existed are searchable and titled once it is created
+        Test Type: Positive
+        """
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        db_path = str(tmp_path / "chatbot.db")
+        graph = StateGraph(EchoState)
+        graph.add_node("echo", echo_node)
+        graph.add_edge(START, "echo")
+        graph.add_edge("echo", END)
+        plain = graph.compile(checkpointer=SqliteSaver(sqlite3.connect(db_path, check_same_thread=False)))
+        send(plain, "old", "nasa picture of the day")
+
+        saver = IndexedSqliteSaver(conn=sqlite3.connect(db_path, check_same_thread=False))
+        [hit] = saver.search_threads("nasa")
+        assert hit["thread_id"] == "old"
+        assert hit["title"] == "nasa picture of the day"
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_empty_database(self, saver):
+        """
+        TC_THREAD_005: Listing an empty database returns no threads
+        Test Type: Negative
+        """
+        assert saver.list_threads(limit=15) == []
+
+    def test_unknown_thread_page(self, saver, monkeypatch):
+        """
+        TC_THREAD_010: An unknown thread has an empty page, no cursor and no version
+        Test Type: Negative
+        """
+        monkeypatch.setitem(vars(backend), "checkpointer", saver)
+        assert saver.message_page("missing") == {"messages": [], "cursor": None}
+        assert backend.get_message_page("missing") == {"messages": [], "cursor": None}
+        assert backend.get_thread_version("missing") is None
+
+    def test_removed_messages_reindexed(self):
+        """
+        TC_THREAD_011: When messages were removed from a thread its index is rebuilt
+        Test Type: Negative
+        """
+        statements = message_index_statements("t", [HumanMessage(content="only")], 3)
+        assert statements[0] == ("DELETE FROM thread_messages WHERE thread_id = ?", [("t",)])
+        assert statements[1][1] == [("t", 0, "user", "only")]
+
+    def test_search_query_syntax_is_escaped(self, saver, echo_bot):
+        """
+        TC_THREAD_015: FTS5 operators and quotes in a search are treated as plain words; no words, no results
+        Test Type: Negative
+        """
+        send(echo_bot, "t1", "weather in london")
+
+        assert search_query('london" OR (x') == '"london"* "OR"* "x"*'
+        assert saver.search_threads('london" OR (x') == []
+        assert saver.search_threads("NEAR(london") == []
+        assert saver.search_threads("  ?! ") == []
+        assert saver.search_threads("paris") == []
+
+
+    def test_failed_index_write_keeps_no_checkpoint(self, saver, echo_bot, tmp_path, monkeypatch):
+        """
+        TC_THREAD_016: A checkpoint whose index rows cannot be written is not saved either, sync and async
+        Test Type: Negative
+        """
+        send(echo_bot, "t1", "first question")
+
+        def broken_index(*args):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(saver, "_index_messages", broken_index)
+        with pytest.raises(sqlite3.OperationalError):
+            send(echo_bot, "t1", "second question")
+        latest = saver.get_tuple({"configurable": {"thread_id": "t1"}})
+        assert [m.content for m in latest.checkpoint["channel_values"]["messages"]] == \
+            ["first question", "echo: first question"]
+        assert contents(saver.message_page("t1")) == ["first question", "echo: first question"]
+
+        async def write_async():
+            import aiosqlite
+
+            async with aiosqlite.connect(str(tmp_path / "async.db")) as conn:
+                async_saver = IndexedAsyncSqliteSaver(conn)
+                monkeypatch.setattr(async_saver, "_aindex_messages", broken_index_async)
+                bot = echo_graph().compile(checkpointer=async_saver)
+                with pytest.raises(sqlite3.OperationalError):
+                    await bot.ainvoke({"messages": [HumanMessage(content="hi")]}, {"configurable": {"thread_id": "a1"}})
+                latest = await async_saver.aget_tuple({"configurable": {"thread_id": "a1"}})
+                return latest.checkpoint["channel_values"].get("messages")
+
+        async def broken_index_async(*args):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        # Only the input checkpoint, which has no messages to index, was saved
+        assert asyncio.run(write_async()) is None
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,185 @@
+"""
+Unit Tests for the tool response cache
+Test File: tests/unit/test_tool_cache.py
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import langgraph_tool_backend as backend
+from resilience import Resilience
+from tool_cache import SqliteCacheTier, TTLCache, ToolCache, cached_tool, make_key, tool_cache
+from tool_results import ToolResult, combine
+
+
+class TestToolCache:
+    """Test suite for TTLCache, ToolCache and cached_tool"""
+
+    def test_identical_calls_hit_cache(self):
+        """
+        TC_CACHE_001: A repeated call with equivalent arguments is served from cache
+        Test Type: Positive
+        """
+        cache = ToolCache(ttls={"fetch_weather": 60})
+        calls = []
+
+        @cached_tool("fetch_weather", cache=cache)
+        def fetch_weather(city: str) -> str:
+            calls.append(city)
+            return f"🌤️ {city.title()}: 20°C"
+
+        assert fetch_weather("London") == fetch_weather("  london ")
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["tools"]["fetch_weather"] == {"hits": 1, "misses": 1}
+
+    def test_key_normalizes_arguments(self):
+        """
+        TC_CACHE_002: Keys ignore case, whitespace and int/float differences
+        Test Type: Positive
+        """
+        assert make_key("convert_currency", {"amount": 100, "from_currency": "usd", "to_currency": "EUR"}) == \
+            make_key("convert_currency", {"to_currency": "eur", "amount": 100.0, "from_currency": " USD"})
+
+    def test_entries_expire_after_ttl(self):
+        """
+        TC_CACHE_003: Entries are not served once their TTL has passed
+        Test Type: Positive
+        """
+        cache = TTLCache(maxsize=10)
+        cache.set("k", "v", ttl=0.05)
+        assert cache.get("k") == "v"
+        time.sleep(0.06)
+        assert cache.get("k") is None
+
+    def test_lru_size_bound(self):
+        """
+        TC_CACHE_004: The least recently used entry is evicted when full
+        Test Type: Positive
+        """
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.get("a")
+        cache.set("c", 3, 60)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_sqlite_tier_is_shared(self, tmp_path):
+        """
+        TC_CACHE_005: A second cache instance sees results through the SQLite tier
+        Test Type: Positive
+        """
+        db_path = str(tmp_path / "cache.db")
+        first = ToolCache(db_path=db_path, ttls={"get_nasa_apod": 60})
+        second = ToolCache(db_path=db_path, ttls={"get_nasa_apod": 60})
+        first.set("get_nasa_apod", {}, "🌌 Pillars of Creation")
+        assert second.get("get_nasa_apod", {}) == "🌌 Pillars of Creation"
+
+    def test_async_tool_shares_cache_with_sync(self):
+        """
+        TC_CACHE_008: Sync and async variants of a tool share cache entries
+        Test Type: Positive
+        """
+        cache = ToolCache(ttls={"fetch_news": 60})
+
+        @cached_tool("fetch_news", cache=cache)
+        def fetch_news(topic: str) -> str:
+            return f"📰 {topic} (sync)"
+
+        @cached_tool("fetch_news", cache=cache)
+        async def afetch_news(topic: str) -> str:
+            return f"📰 {topic} (async)"
+
+        assert fetch_news("technology") == "📰 technology (sync)"
+        assert asyncio.run(afetch_news("Technology")) == "📰 technology (sync)"
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_errors_are_not_cached(self):
+        """
+        TC_CACHE_006: Error and warning results always go back upstream
+        Test Type: Negative
+        """
+        cache = ToolCache(ttls={"get_stock_price": 60})
+        cache.set("get_stock_price", {"symbol": "AAPL"}, "❌ Error fetching stock price: timeout")
+        cache.set("get_stock_price", {"symbol": "MSFT"}, "⚠️ ALPHA_VANTAGE_API_KEY not configured.")
+        assert cache.get("get_stock_price", {"symbol": "AAPL"}) is None
+        assert cache.get("get_stock_price", {"symbol": "MSFT"}) is None
+
+    def test_mock_fallbacks_are_not_cached(self, monkeypatch):
+        """
+        TC_CACHE_009: Mock data served while an upstream fails is not kept once the upstream recovers
+        Test Type: Negative
+        """
+        cache = ToolCache(ttls={"get_nasa_apod": 60, "get_stock_prices": 60})
+        apod = ToolResult("🌌 **Pillars of Creation**", {"title": "Pillars of Creation", "mock": True})
+        quote = ToolResult("📈 AAPL: $195.50 (mock data)", {"symbol": "AAPL", "price": 195.5, "mock": True})
+        cache.set("get_nasa_apod", {}, apod)
+        cache.set("get_stock_prices", {"symbols": ["AAPL"]}, combine([quote]))
+        assert cache.get("get_nasa_apod", {}) is None
+        assert cache.get("get_stock_prices", {"symbols": ["AAPL"]}) is None
+
+        responses = [{"error": {"message": "upstream down"}},
+                     {"current": {"temp_c": 9, "condition": {"text": "Rain"}, "humidity": 90}}]
+        monkeypatch.setenv("WEATHER_API_KEY", "test")
+        monkeypatch.setattr(backend.http_client, "get", lambda url, params=None, **kwargs: type(
+            "Response", (), {"text": json.dumps(responses.pop(0))})())
+        monkeypatch.setattr(backend, "resilience", Resilience(providers={}))
+        tool_cache.clear()
+        try:
+            assert "20°C, Clear" in backend.fetch_weather.invoke({"city": "Oslo"})
+            assert "9°C, Rain" in backend.fetch_weather.invoke({"city": "Oslo"})
+        finally:
+            tool_cache.clear()
+
+    def test_shared_hit_keeps_remaining_ttl(self, tmp_path):
+        """
+        TC_CACHE_010: An entry copied from the SQLite tier into memory expires when the shared entry does
+        Test Type: Negative
+        """
+        db_path = str(tmp_path / "cache.db")
+        first = ToolCache(db_path=db_path, ttls={"get_stock_price": 0.3})
+        second = ToolCache(db_path=db_path, ttls={"get_stock_price": 0.3})
+        first.set("get_stock_price", {"symbol": "AAPL"}, "📈 AAPL: $195.50")
+        time.sleep(0.2)
+        assert second.get("get_stock_price", {"symbol": "AAPL"}) == "📈 AAPL: $195.50"
+        time.sleep(0.15)
+        assert second.get("get_stock_price", {"symbol": "AAPL"}) is None
+
+    def test_expired_shared_rows_pruned(self, tmp_path):
+        """
+        TC_CACHE_011: Expired rows of the SQLite tier are deleted as new entries are written
+        Test Type: Negative
+        """
+        tier = SqliteCacheTier(str(tmp_path / "cache.db"), prune_every=3)
+        tier.set("old-1", "stale", -1)
+        tier.set("old-2", "stale", -1)
+        tier.set("fresh", "📈 AAPL: $195.50", 60)
+        keys = [row[0] for row in tier._conn().execute("SELECT key FROM tool_cache")]
+        assert keys == ["fresh"]
+        assert tier.get("fresh")[0] == "📈 AAPL: $195.50"
+
+    def test_tool_without_ttl_is_not_cached(self):
+        """
+        TC_CACHE_007: Tools without a freshness policy are never cached
+        Test Type: Negative
+        """
+        cache = ToolCache(ttls={})
+        cache.set("get_joke", {"category": "Any"}, "😂 joke")
+        assert cache.get("get_joke", {"category": "Any"}) is None
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
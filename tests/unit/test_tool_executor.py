@@ -0,0 +1,160 @@
+"""
+Unit Tests for concurrent tool execution
+Test File: tests/unit/test_tool_executor.py
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from tool_executor import ToolExecutor
+
+
+def make_calls(name, count):
+    return [{"name": name, "args": {"i": i}, "id": f"{name}_{i}"} for i in range(count)]
+
+
+class TestToolExecutor:
+    """Test suite for ToolExecutor"""
+
+    def test_results_keep_tool_call_order(self):
+        """
+        TC_EXEC_001: Results come back in the original tool_call order
+        Test Type: Positive
+        """
+        executor = ToolExecutor(max_workers=4)
+        calls = make_calls("slow", 4)
+
+        # Later calls finish first
+        def invoke(call):
+            time.sleep(0.05 * (4 - call["args"]["i"]))
+            return call["id"]
+
+        assert executor.run(calls, invoke) == ["slow_0", "slow_1", "slow_2", "slow_3"]
+
+    def test_calls_run_concurrently(self):
+        """
+        TC_EXEC_002: Wall-clock time is close to the slowest call, not the sum
+        Test Type: Positive
+        """
+        executor = ToolExecutor(max_workers=5, default_per_tool_limit=5)
+        calls = make_calls("slow", 5)
+
+        start = time.perf_counter()
+        executor.run(calls, lambda call: time.sleep(0.2))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.6, f"Expected concurrent execution but took {elapsed:.2f}s"
+
+    def test_per_tool_concurrency_cap(self):
+        """
+        TC_EXEC_003: No more than the configured number of calls per tool run at once
+        Test Type: Positive
+        """
+        executor = ToolExecutor(max_workers=8, per_tool_limits={"capped": 2})
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def invoke(call):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+        executor.run(make_calls("capped", 6), invoke)
+        assert max(peak) <= 2
+
+    def test_async_calls_run_concurrently_in_order(self):
+        """
+        TC_EXEC_006: The async path overlaps calls and keeps tool_call order
+        Test Type: Positive
+        """
+        executor = ToolExecutor(default_per_tool_limit=5)
+        calls = make_calls("slow", 5)
+
+        async def ainvoke(call):
+            await asyncio.sleep(0.05 * (5 - call["args"]["i"]))
+            return call["id"]
+
+        start = time.perf_counter()
+        results = asyncio.run(executor.arun(calls, ainvoke))
+        elapsed = time.perf_counter() - start
+
+        assert results == [f"slow_{i}" for i in range(5)]
+        assert elapsed < 0.4
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_turn_deadline(self):
+        """
+        TC_EXEC_004: Calls that miss the per-turn deadline return a timeout error
+        Test Type: Negative
+        """
+        executor = ToolExecutor(max_workers=2, turn_deadline=0.1)
+        calls = make_calls("fast", 1) + make_calls("hung", 1)
+
+        def invoke(call):
+            if call["name"] == "hung":
+                time.sleep(0.5)
+            return "ok"
+
+        results = executor.run(calls, invoke)
+        assert results[0] == "ok"
+        assert "timed out" in results[1]
+
+    def test_per_tool_timeout(self):
+        """
+        TC_EXEC_006: A tool with its own timeout is abandoned before the turn deadline, sync and async
+        Test Type: Negative
+        """
+        executor = ToolExecutor(max_workers=2, turn_deadline=5, per_tool_timeouts={"hung": 0.1})
+        calls = make_calls("fast", 1) + make_calls("hung", 1)
+
+        def invoke(call):
+            if call["name"] == "hung":
+                time.sleep(0.5)
+            return "ok"
+
+        async def ainvoke(call):
+            if call["name"] == "hung":
+                await asyncio.sleep(0.5)
+            return "ok"
+
+        start = time.perf_counter()
+        results = executor.run(calls, invoke)
+        async_results = asyncio.run(executor.arun(calls, ainvoke))
+        assert time.perf_counter() - start < 0.45
+        for outcome in (results, async_results):
+            assert outcome[0] == "ok"
+            assert outcome[1] == "❌ Error: hung timed out after 0.1s"
+
+    def test_exception_is_reported_in_its_slot(self):
+        """
+        TC_EXEC_005: A failing tool does not affect the other results
+        Test Type: Negative
+        """
+        executor = ToolExecutor()
+
+        def invoke(call):
+            if call["args"]["i"] == 1:
+                raise ValueError("boom")
+            return "ok"
+
+        results = executor.run(make_calls("flaky", 3), invoke)
+        assert results[0] == "ok" and results[2] == "ok"
+        assert "boom" in results[1]
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
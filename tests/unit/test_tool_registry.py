@@ -0,0 +1,181 @@
+"""
+Unit Tests for the tool registry
+Test File: tests/unit/test_tool_registry.py
+"""
+
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+import langgraph_tool_backend as backend
+import tool_registry
+from metrics import metrics
+from tool_registry import ToolRegistry
+
+
+@tool
+def echo_tool(text: str) -> str:
+    """Echo the text back."""
+    return text
+
+
+@tool
+def shout_tool(text: str) -> str:
+    """Echo the text back in capitals."""
+    return text.upper()
+
+
+PLUGIN_SOURCE = '''
+from langchain_core.tools import tool
+
+
+@tool
+def plugin_tool(city: str) -> str:
+    """Plugin tool used by the registry tests."""
+    return f"plugin answer for {city}"
+
+
+def register(registry):
+    registry.register(plugin_tool, icon="🧩", display_name="Plugin", cost_class="metered")
+'''
+
+
+def plugin_errors():
+    return sum(sample["value"] for sample in metrics.snapshot()["counters"]
+               if sample["name"] == "errors" and sample["labels"].get("where") == "load_plugins")
+
+
+class FakeEntryPoint:
+    def __init__(self, name, obj):
+        self.name = name
+        self.obj = obj
+
+    def load(self):
+        if isinstance(self.obj, Exception):
+            raise self.obj
+        return self.obj
+
+
+class TestToolRegistry:
+    """Test suite for ToolRegistry"""
+
+    def test_register_and_dispatch_by_name(self):
+        """
+        TC_REG_001: Registered tools are found by name and listed in registration order with their metadata
+        Test Type: Positive
+        """
+        registry = ToolRegistry(enabled=())
+        registry.register(echo_tool, icon="🔁", display_name="Echo", cache_ttl=60, cost_class="local")
+        registry.register(shout_tool)
+
+        assert registry.tool("echo_tool") is echo_tool
+        assert registry.names() == ["echo_tool", "shout_tool"]
+        assert registry.icon("echo_tool") == "🔁"
+        assert registry.display_name("shout_tool") == "shout_tool"
+        assert registry.describe()["echo_tool"]["cache_ttl"] == 60
+
+    def test_enabled_subset(self):
+        """
+        TC_REG_002: A deployment can enable a subset; only it is listed and dispatchable
+        Test Type: Positive
+        """
+        registry = ToolRegistry(enabled={"shout_tool"})
+        registry.register(echo_tool, icon="🔁")
+        registry.register(shout_tool)
+
+        assert registry.tools() == [shout_tool]
+        assert registry.get("echo_tool") is None
+        assert registry.icon("echo_tool") == "🔁"
+
+    def test_plugins_from_module_and_entry_points(self, tmp_path, monkeypatch):
+        """
+        TC_REG_003: Plugins register through TOOL_PLUGINS-style module paths and installed entry points
+        Test Type: Positive
+        """
+        (tmp_path / "registry_test_plugin.py").write_text(PLUGIN_SOURCE)
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.setattr(tool_registry, "entry_points", lambda group: [FakeEntryPoint("echo", echo_tool)])
+
+        registry = ToolRegistry(enabled=())
+        loaded = registry.load_plugins(modules="registry_test_plugin")
+
+        assert loaded == 2
+        assert registry.names() == ["echo_tool", "plugin_tool"]
+        assert registry.get("plugin_tool").cost_class == "metered"
+        assert registry.tool("plugin_tool").invoke({"city": "Oslo"}) == "plugin answer for Oslo"
+
+    def test_backend_registry_drives_settings(self):
+        """
+        TC_REG_004: Built-in tools carry their metadata and it reaches the cache and executor
+        Test Type: Positive
+        """
+        assert backend.tools == backend.tool_registry.tools()
+        assert backend.tool_registry.tool("get_stock_price") is backend.get_stock_price
+        assert backend.tool_cache.ttls["get_stock_price"] == 30
+        assert backend.tool_executor.per_tool_limits["search_tool"] == 2
+        assert backend.tool_executor.per_tool_timeouts["search_tool"] == 10
+        assert backend.get_tool_catalog()["fetch_weather"]["icon"] == "🌤️"
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_unknown_tool_call_gets_error(self):
+        """
+        TC_REG_005: A call to an unknown tool gets an error result for its tool_call_id instead of being dropped
+        Test Type: Negative
+        """
+        tool_call = {"name": "no_such_tool", "args": {}, "id": "bad_1"}
+        state = {"messages": [AIMessage(content="", tool_calls=[tool_call])]}
+
+        messages = backend.custom_tools_node(state)["messages"]
+
+        assert len(messages) == 1
+        assert isinstance(messages[0], ToolMessage)
+        assert messages[0].tool_call_id == "bad_1"
+        assert messages[0].status == "error"
+        assert messages[0].content.startswith("Error: Unknown tool 'no_such_tool'. Available tools: ")
+
+    def test_router_skips_disabled_tools(self, monkeypatch):
+        """
+        TC_REG_006: A routed intent whose tool is disabled goes to the LLM instead
+        Test Type: Negative
+        """
+        state = {"messages": [HumanMessage(content="weather in London")]}
+        assert backend.shortcut_reply(state) is not None
+
+        monkeypatch.setattr(backend, "tool_registry", ToolRegistry(enabled={"calculator_tool"}))
+        backend.tool_registry.register(backend.calculator_tool)
+        assert backend.shortcut_reply(state) is None
+
+    def test_invalid_registrations(self, monkeypatch, capsys):
+        """
+        TC_REG_007: Duplicate names and unknown cost classes are refused; broken plugins are skipped
+        Test Type: Negative
+        """
+        registry = ToolRegistry(enabled=())
+        registry.register(echo_tool)
+        with pytest.raises(ValueError):
+            registry.register(echo_tool)
+        with pytest.raises(ValueError):
+            registry.register(shout_tool, cost_class="cheap")
+
+        monkeypatch.setattr(tool_registry, "entry_points", lambda group: [
+            FakeEntryPoint("broken", ImportError("missing dependency")),
+            FakeEntryPoint("not_a_tool", 42),
+        ])
+        errors_before = plugin_errors()
+        assert registry.load_plugins(modules="") == 0
+        assert registry.names() == ["echo_tool"]
+        assert plugin_errors() == errors_before + 2
+        assert "Error loading tool plugin broken: missing dependency" in capsys.readouterr().out
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,152 @@
+"""
+Unit Tests for structured tool results and ToolMessage emission
+Test File: tests/unit/test_tool_results.py
+"""
+
+import pickle
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import langgraph_tool_backend as backend
+from context_manager import build_prompt
+from tool_cache import ToolCache
+from tool_results import ToolResult, combine, for_llm, status_of
+
+
+def conversion(to, result):
+    return ToolResult(f"💱 100 USD = {result:.2f} {to}", {"amount": 100, "from": "USD", "to": to, "result": result})
+
+
+class TestToolResults:
+    """Test suite for tool_results and the tools node"""
+
+    def test_result_is_text_with_payload(self):
+        """
+        TC_RESULT_001: A ToolResult compares as its UI text, carries its payload and survives pickling
+        Test Type: Positive
+        """
+        result = backend.calculator_tool.invoke({"first_num": 2, "second_num": 3, "operation": "add"})
+
+        assert result == "2.0 + 3.0 = 5.0"
+        assert result.data == {"result": 5.0}
+        assert result.status == "success"
+        copy = pickle.loads(pickle.dumps(result))
+        assert copy == result and copy.data == result.data
+
+    def test_compact_rendering_for_llm(self):
+        """
+        TC_RESULT_002: The LLM gets key=value pairs without decoration or echoed arguments; batches become a table
+        Test Type: Positive
+        """
+        weather = ToolResult("🌤️ London: 12°C, Cloudy, Humidity: 75%",
+                             {"city": "London", "temp_c": 12, "condition": "Cloudy", "humidity": 75, "mock": True})
+        batch = combine([conversion("EUR", 92.0), conversion("GBP", 79.0)])
+
+        assert for_llm(weather, {"city": "london"}) == "temp_c=12 condition=Cloudy humidity=75 mock"
+        assert for_llm(batch) == "amount=100 from=USD\nto,result\nEUR,92\nGBP,79"
+        assert str(batch) == "💱 100 USD = 92.00 EUR\n💱 100 USD = 79.00 GBP"
+        assert for_llm("🔍 **Python** is a language") == "Python is a language"
+
+    def test_tools_node_emits_tool_messages(self):
+        """
+        TC_RESULT_003: Tool results are ToolMessages with the compact content and the UI text in the artifact
+        Test Type: Positive
+        """
+        tool_call = {"name": "calculator_tool", "args": {"first_num": 6, "second_num": 7, "operation": "multiply"},
+                     "id": "calc_1"}
+        state = {"messages": [AIMessage(content="", tool_calls=[tool_call])]}
+
+        message = backend.custom_tools_node(state)["messages"][0]
+
+        assert isinstance(message, ToolMessage)
+        assert (message.tool_call_id, message.name, message.status) == ("calc_1", "calculator_tool", "success")
+        assert message.content == "result=42"
+        assert backend.tool_display(message) == "6.0 × 7.0 = 42.0"
+        assert backend.route_after_tools({"messages": [message]}) == "context_node"
+
+    def test_shared_cache_keeps_payload(self, tmp_path):
+        """
+        TC_RESULT_004: The SQLite cache tier stores the payload and returns a ToolResult
+        Test Type: Positive
+        """
+        cache = ToolCache(db_path=str(tmp_path / "cache.db"), ttls={"convert_currency": 60})
+        cache.set("convert_currency", {"to": "EUR"}, conversion("EUR", 92.0))
+        cache.memory.clear()
+
+        cached = cache.get("convert_currency", {"to": "EUR"})
+        assert isinstance(cached, ToolResult)
+        assert cached == "💱 100 USD = 92.00 EUR"
+        assert cached.data["result"] == 92.0
+
+    def test_legacy_tool_results_sent_as_tool_messages(self):
+        """
+        TC_RESULT_005: Stored AIMessage(tool_call_id) results from older threads reach the LLM as ToolMessages
+        Test Type: Positive
+        """
+        call = {"name": "get_joke", "args": {}, "id": "joke_1"}
+        messages = [HumanMessage(content="joke"), AIMessage(content="", tool_calls=[call]),
+                    AIMessage(content="😂 A joke", tool_call_id="joke_1")]
+
+        prompt = build_prompt(messages)
+
+        assert isinstance(prompt[2], ToolMessage)
+        assert prompt[2].tool_call_id == "joke_1"
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_error_results(self):
+        """
+        TC_RESULT_006: Errors become error ToolMessages, are not cached and do not end the turn
+        Test Type: Negative
+        """
+        tool_call = {"name": "calculator_tool", "args": {"first_num": 1, "second_num": 0, "operation": "divide"},
+                     "id": "calc_2"}
+        result = backend._invoke_tool_call(tool_call)
+        message = backend.tool_message(tool_call, result)
+        cache = ToolCache(ttls={"calculator_tool": 60})
+        cache.set("calculator_tool", tool_call["args"], result)
+
+        assert message.status == "error"
+        assert message.content == "Error: Division by zero is not allowed."
+        assert cache.get("calculator_tool", tool_call["args"]) is None
+        assert backend.final_answer([tool_call], [result]) is None
+
+    def test_missing_result_still_answers_tool_call(self):
+        """
+        TC_RESULT_008: A tool that returns nothing still gets an error ToolMessage for its tool_call_id
+        Test Type: Negative
+        """
+        tool_calls = [
+            {"name": "calculator_tool", "args": {"first_num": 2, "second_num": 3, "operation": "add"}, "id": "calc_1"},
+            {"name": "empty_plugin", "args": {}, "id": "plugin_1"},
+        ]
+        messages = backend.tool_messages(tool_calls, ["2.0 + 3.0 = 5.0", None])["messages"]
+
+        assert [message.tool_call_id for message in messages] == ["calc_1", "plugin_1"]
+        assert messages[1].status == "error"
+        assert messages[1].content == "Error: empty_plugin returned no result."
+
+    def test_plain_string_results(self):
+        """
+        TC_RESULT_007: Plain-string results (plugins, executor timeouts) are classified by their prefix
+        Test Type: Negative
+        """
+        assert status_of("❌ Error: get_joke timed out after 5s") == "error"
+        assert status_of("⚠️ NEWS_API_KEY not configured. Using mock data.") == "warning"
+        assert status_of("") == "error"
+        assert status_of(None) == "error"
+        # A payload whose fields all repeat the arguments falls back to the text
+        assert for_llm(ToolResult("📈 AAPL", {"symbol": "AAPL"}), {"symbol": "aapl"}) == "AAPL"
+        assert combine(["❌ Error: a", "❌ Error: a"]) == "❌ Error: a"
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Unit Tests for delta-only turn submission
+Test File: tests/unit/test_turn_submission.py
+"""
+
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from langchain_core.messages import HumanMessage, AIMessage
+
+import langgraph_tool_backend as backend
+
+
+def latest_checkpoint_size(conn, thread_id):
+    row = conn.execute(
+        "SELECT length(checkpoint) FROM checkpoints WHERE thread_id = ? ORDER BY checkpoint_id DESC LIMIT 1",
+        (thread_id,),
+    ).fetchone()
+    return row[0]
+
+
+class TestRunTurn:
+    """Test suite for run_turn and filter_new_messages"""
+
+    def test_checkpoint_grows_linearly(self, offline_backend):
+        """
+        TC_TURN_001: Checkpoint size grows linearly with the number of turns
+        Test Type: Positive
+        """
+        sizes = []
+        for turn in range(40):
+            backend.run_turn("linear", f"hey there {turn:02d}")
+            sizes.append(latest_checkpoint_size(offline_backend.conn, "linear"))
+
+        state = backend.chatbot.get_state(backend.make_config("linear"))
+        assert len(state.values["messages"]) == 80
+
+        first_half_growth = sizes[19] - sizes[0]
+        second_half_growth = sizes[39] - sizes[20]
+        assert second_half_growth <= first_half_growth * 1.2, \
+            f"Checkpoint growth is super-linear: {first_half_growth} then {second_half_growth} bytes"
+
+    def test_resubmitted_history_is_not_duplicated(self, offline_backend):
+        """
+        TC_TURN_002: Sending rebuilt client history only appends the new message
+        Test Type: Positive
+        """
+        backend.run_turn("dedupe", "hey there")
+        client_history = [
+            HumanMessage(content="hey there"),
+            AIMessage(content="Hey there! I'm ready to help. What's on your mind?"),
+            HumanMessage(content="how are you"),
+        ]
+        result = backend.run_turn("dedupe", client_history)
+
+        contents = [m.content for m in result["messages"]]
+        assert contents.count("hey there") == 1
+        assert contents.count("how are you") == 1
+        assert len(result["messages"]) == 4
+
+    def test_filter_matches_by_id(self):
+        """
+        TC_TURN_003: Messages whose id is already stored are dropped
+        Test Type: Positive
+        """
+        existing = [HumanMessage(content="hi", id="m1"), AIMessage(content="hello", id="m2")]
+        incoming = [HumanMessage(content="hi", id="m1"), HumanMessage(content="weather in london", id="m3")]
+        assert [m.id for m in backend.filter_new_messages(existing, incoming)] == ["m3"]
+
+    # ==================== NEGATIVE TEST CASES ====================
+
+    def test_retry_of_stored_turn_does_not_invoke(self, offline_backend):
+        """
+        TC_TURN_004: Retrying an already-stored message leaves the thread unchanged
+        Test Type: Negative
+        """
+        message = HumanMessage(content="hey there", id="retry-1")
+        backend.run_turn("retry", message)
+        result = backend.run_turn("retry", message)
+        assert len(result["messages"]) == 2
+
+    def test_repeated_text_is_a_new_turn(self, offline_backend):
+        """
+        TC_TURN_005: A new message with the same text as an earlier one is still sent
+        Test Type: Negative
+        """
+        existing = [HumanMessage(content="hey there", id="m1"), AIMessage(content="Hey!", id="m2")]
+        assert [m.content for m in backend.new_turn_messages(HumanMessage(content="hey there"), existing)] == ["hey there"]
+        partial_history = [AIMessage(content="Hey!"), HumanMessage(content="hey there")]
+        assert len(backend.filter_new_messages(existing, partial_history)) == 2
+
+        backend.run_turn("repeat", "hey there")
+        result = backend.run_turn("repeat", HumanMessage(content="hey there"))
+        assert [m.content for m in result["messages"]].count("hey there") == 2
+
+
+# ==================== RUN TESTS ====================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])